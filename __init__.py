@@ -2,7 +2,6 @@
 '''''
 @author: zobov
 '''
-import websocket
 try:
     import thread
 except ImportError:
@@ -10,12 +9,18 @@ except ImportError:
 import time
 import json
 import logging
-import requests
-from threading import Lock, Thread
-from logging.handlers import RotatingFileHandler
-from logging import Formatter
+import importlib
+from concurrent.futures import Future
+from urllib.parse import quote
+from threading import Lock, Thread, get_ident
 from enum import Enum, IntEnum
-import pyVideoSDK.utils, pyVideoSDK.methods
+import pyVideoSDK.utils
+from pyVideoSDK.filters import compile_filter, Prefix
+from pyVideoSDK.handlers import HandlerRegistry, Subscription
+from pyVideoSDK.pending import PendingRequests, RequestTimeoutError, RequestFailedError
+from pyVideoSDK.cache import QueryCache, completed_future
+from pyVideoSDK.roster import Roster
+from pyVideoSDK.settings import SettingsMirror
 
 __status__  = "Development"
 __authors__ = ["Andrey Zobov", "Pavel Titov"]
@@ -34,20 +39,22 @@ DEFAULT_ROOM_PORT = 80
 QUEUE_INTERVAL = 0.05
 
 logger = logging.getLogger('videosdk')
-logger.setLevel(logging.DEBUG)
+logger.addHandler(logging.NullHandler())
 
-rotation_handler = logging.handlers.RotatingFileHandler(
-    filename='videosdk.log',
-    maxBytes=1024 ** 2 * 10,  # 10 MB
-    backupCount=3
-)
-rotation_handler.setFormatter(Formatter("%(asctime)-15s [%(levelname)s] %(funcName)s: %(message)s"))
+# websocket, requests and these submodules are imported on first use,
+# so that "import pyVideoSDK" stays cheap and has no side effects
+LAZY_MODULES = ("consts", "methods", "logs", "abook", "contacts", "chats", "snapshot", "frames", "decode", "mjpeg", "ring", "transfers", "slides", "invites", "abooksync", "moderation", "ptz", "fleet", "datastore")
+LAZY_ATTRIBUTES = {"enable_logging": "logs", "disable_logging": "logs"}
 
-#console_handler = logging.StreamHandler()
-#console_handler.setFormatter(Formatter("%(asctime)-15s [%(levelname)s] %(funcName)s: %(message)s"))
 
-logger.addHandler(rotation_handler)
-#logger.addHandler(console_handler)
+def __getattr__(name: str):
+    if name in LAZY_MODULES:
+        return importlib.import_module(f'{__name__}.{name}')
+    if name in LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(f'{__name__}.{LAZY_ATTRIBUTES[name]}'), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 class SessionStatus(IntEnum):
@@ -99,6 +106,13 @@ def check_schema(schema: dict, data: dict, exclude_from_comparison: list = []) -
     return True
 
 
+# Filters of the built-in processing, compiled once
+IS_APP_STATE_EVENT = compile_filter({"event": "appStateChanged", "appState": None})
+IS_APP_STATE_RESPONSE = compile_filter({"appState": None, "method": "getAppState", "result": None})
+IS_AUTH_RESPONSE = compile_filter({"method": "auth", "result": None})
+IS_SETTINGS_CHANGED_EVENT = compile_filter({"event": "settingsChanged", "name": None, "value": None})
+
+
 class VideoSDK:
     def __init__(self, debug):
         self.debug = debug
@@ -114,21 +128,31 @@ class VideoSDK:
 
         self.systemInfo = {}
         self.settings = {}
+        self.settings_mirror = SettingsMirror()
         self.monitors_info = {}
 
         self.websocket = None
         self.current_conference = None
+        self.roster = Roster()
 
-        self.api_handlers = []
+        self.handlers = HandlerRegistry()
         self.command_queue = []
+        self.pending = PendingRequests()
+        self.cache = QueryCache(pending = self.pending)
+        self.socket_thread_id = None
         self.thread_queue = Thread(target = self.__process_queue, daemon = True)
         self.thread_queue.start()
 
     def __del__(self):
         pass
 
-    def __add_handler__(self, handle: dict, function: object):
-        self.api_handlers.append([handle, function])
+    def __add_handler__(self, handle: dict, function: object) -> Subscription:
+        return self.handlers.add(handle, function)
+
+    @property
+    def api_handlers(self) -> tuple:
+        """Registered handlers (Subscription objects) in the registration order"""
+        return self.handlers.snapshot()
 
     # Send directly to websocket
     def __send_to_websocket(self, command: dict):
@@ -136,15 +160,36 @@ class VideoSDK:
 
     def __process_queue(self):
         while True:
+            failed = None
             self.lock.acquire()
             try:
-                if len(self.command_queue) > 0 & self.isConnected():
+                if len(self.command_queue) > 0 and self.isConnected():
                     # Extract a first from the queue
                     command = self.command_queue.pop(0)
-                    # Send it to websocket
-                    self.__send_to_websocket(command)
+                    # Send it to websocket; a batch (see commands()) goes in one go,
+                    # together with the batches queued right after it
+                    if isinstance(command, list):
+                        while self.command_queue and isinstance(self.command_queue[0], list):
+                            command.extend(self.command_queue.pop(0))
+                    else:
+                        command = [command]
+                    for i, item in enumerate(command):
+                        try:
+                            self.__send_to_websocket(item)
+                        except Exception as e:
+                            # The command fails, the rest of the batch waits for the next tick
+                            logger.error('Cannot send "%s": %s', item.get("method"), e)
+                            failed = (item, e)
+                            if i + 1 < len(command):
+                                self.command_queue.insert(0, command[i + 1:])
+                            break
             finally:
                 self.lock.release()
+            # Outside the lock: the callbacks of the Future may queue new commands
+            if failed is not None:
+                self.pending.fail(*failed)
+            # Requests without a response
+            self.pending.expire()
             # Waiting...
             time.sleep(QUEUE_INTERVAL)
 
@@ -157,12 +202,17 @@ class VideoSDK:
         self.__process_auth(response)
         self.__process_error(response)
         self.__process_method(response)
-
-        for item in self.api_handlers:
-            if check_schema(item[0], response):
-                func_handler = item[1]
-                # Call the Handler function
-                func_handler(response)
+        self.__process_settings(response)
+        try:
+            # Invalidate the cached responses before anybody sees the change
+            self.cache.process(response)
+            self.roster.process(response)
+            # Call the Handler functions
+            self.handlers.dispatch(response)
+        finally:
+            # Complete the request it is a response to, after the handlers
+            # (address book, chats, ...) have seen it
+            self.pending.resolve(response)
 
     # 1) Event: appStateChanged
     # 2) Request for getAppState
@@ -174,46 +224,49 @@ class VideoSDK:
                 self.app_state_list = self.app_state_list[0:10]
 
         # New status event
-        if check_schema({"event": "appStateChanged", "appState": None}, response):
+        if IS_APP_STATE_EVENT(response):
             new_state = response["appState"]
-            self.app_state = new_state
+            previous_state, self.app_state = self.app_state, new_state
             # queue
             add_state_to_list(self.app_state)
             # update a conference's info
-            self.__update_conference_info()
+            self.__update_conference_info(previous_state)
             # To log
-            logger.info(f'Application state is {self.app_state}: {APPLICATION_STATE[self.app_state]["hint"]}')
+            logger.info('Application state is %s: %s', self.app_state, APPLICATION_STATE[self.app_state]["hint"])
         # Response
-        elif check_schema({"appState": None, "method": "getAppState", "result": None}, response):
+        elif IS_APP_STATE_RESPONSE(response):
             new_state = response["appState"]
-            self.app_state = new_state
+            previous_state, self.app_state = self.app_state, new_state
             # update a conference's info
-            self.__update_conference_info()
+            self.__update_conference_info(previous_state)
             # To log
-            logger.info(f'Application state is {self.app_state}: {APPLICATION_STATE[self.app_state]["hint"]}')     
+            logger.info('Application state is %s: %s', self.app_state, APPLICATION_STATE[self.app_state]["hint"])     
 
     # {"requestId":"","method":"auth","previleges":2,"token":"***","tokenForHttpServer":"***","result":true}
     def __process_auth(self, response) -> bool:
         # CHECK SCHEMA
-        if check_schema({"method": "auth", "result": None}, response):
+        if IS_AUTH_RESPONSE(response):
             if response["result"]:
                 self.auth_token = response["tokenForHttpServer"]
                 self.__set_session_status(SessionStatus.normal)
                 # requests Info
                 self.__request_info()
             else:
-                logger.error(f'Auth error: {response}')
+                logger.error('Auth error: %s', response)
                 self.close_session()
                 self.caughtConnectionError()  # any connection errors
 
+    def __process_settings(self, response) -> bool:
+        if IS_SETTINGS_CHANGED_EVENT(response):
+            self.settings_mirror.changed(response["name"], response["value"])
+
     def __process_error(self, response) -> bool:
         # CHECK SCHEMA
-        if check_schema({"error": None}, response):
-            s = f'VideoSDK error: {response["error"]}'
-            logger.warning(s)
+        if "error" in response:
+            logger.warning('VideoSDK error: %s', response["error"])
 
     def __process_method(self, response) -> bool:
-        result = check_schema({"method": None}, response) and not check_schema({"event": None}, response)
+        result = "method" in response and "event" not in response
         if result:
             method_name = response["method"]
             # Info
@@ -221,6 +274,8 @@ class VideoSDK:
                 self.systemInfo = response
             elif "getSettings".lower() == method_name.lower():
                 self.settings = response
+                if response.get("result") is not False:
+                    self.settings_mirror.load(response.get("settings"))
             elif "getMonitorsInfo".lower() == method_name.lower():
                 self.monitors_info = response
             elif "getConferences".lower() == method_name.lower():
@@ -233,17 +288,19 @@ class VideoSDK:
         try:
             self.__process_message(message)
         except Exception as e:
-            logger.error(f'Socket data processing error. {e.__class__}: {str(e)}')
+            logger.error('Socket data processing error. %s: %s', e.__class__, e)
 
     def __WS_error(self, ws, error):
-        logger.error(f'WebSocket connection error: {error}')
+        logger.error('WebSocket connection error: %s', error)
 
     def __WS_close(self, ws, *args):
         self.__set_session_status(SessionStatus.close)
         self.auth_token = ""
+        self.cache.clear()
+        self.pending.fail_all(ConnectionError(f'{PRODUCT_NAME} connection to {self.url} is closed'))
 
     def __WS_open(self, ws):
-        logger.info(f'{PRODUCT_NAME} connection to {self.url} open successfully')
+        logger.info('%s connection to %s open successfully', PRODUCT_NAME, self.url)
         self.__set_session_status(SessionStatus.connected)
         time.sleep(0.1)
         self.__auth(self.pin)
@@ -257,12 +314,14 @@ class VideoSDK:
     # =======================================
 
     def __run_socket(self):
+        # Handlers run on this thread: code which waits for a response can tell it must not block here
+        self.socket_thread_id = get_ident()
         self.websocket.run_forever()
 
     def __set_session_status(self, status):
         self.session_status = status
         if self.debug:
-            logger.info(f'Session status: {self.session_status.name}')
+            logger.info('Session status: %s', status.name)
 
     def __auth(self, pin: str):
         if pin:
@@ -285,12 +344,21 @@ class VideoSDK:
         command = {"method": "getMonitorsInfo"}
         self.__send_to_websocket(command)
         
-    def __update_conference_info(self):
-        # clear current conference info
-        self.current_conference = None
-        # update info
+    def __update_conference_info(self, previous_state: int):
         if self.app_state == 5:
-            self.__get_conferences()
+            # Entering a conference: the info and the roster are requested once,
+            # then the roster follows the conference events
+            if previous_state != 5:
+                self.current_conference = None
+                self.roster.clear()
+                self.__get_conferences()
+                self.command({"method": "getConferenceParticipants"})
+            elif self.current_conference is None:
+                self.__get_conferences()
+        elif previous_state == 5 or self.current_conference is not None:
+            # clear current conference info
+            self.current_conference = None
+            self.roster.clear()
 
     def __get_conferences(self):
         """Request the list of conferences."""
@@ -317,7 +385,8 @@ class VideoSDK:
         Parameters:
 
         filter: dict
-            Filer
+            Filter. It is compiled once, see pyVideoSDK.filters for the supported values:
+            None, str, a set of values, Prefix(str) or a callable
 
         Example::
 
@@ -328,15 +397,19 @@ class VideoSDK:
             def on_state_change(response):
                 print(f'AppState = {response["appState"]}')
 
+            @room.handler({"event": {"contactsAdded", "contactsDeleted"}, "contacts": None})
+            def on_abook_change(response):
+                ...
+
         """
-        logger.info(f'Add processing handler: {filter}')
+        logger.debug('Add processing handler: %s', filter)
         def decorator(f):
             self.__add_handler__(filter, f)
             return f
 
         return decorator
 
-    def add_handler(self, filter: dict, method: object):
+    def add_handler(self, filter: dict, method: object) -> Subscription:
         """
         Register a class member method as an event handler
 
@@ -347,8 +420,10 @@ class VideoSDK:
 
             method: object
                 Class member function
+
+        Returns a Subscription: subscription.cancel() removes the handler
         """
-        self.__add_handler__(filter, method)
+        return self.__add_handler__(filter, method)
     
     def del_handler(self, method: object):
         """
@@ -357,17 +432,15 @@ class VideoSDK:
         Parameters:
 
             method: object
-                The previous registered class member function
+                The previous registered class member function or a Subscription
         """
-        i = 0
-        while i < len(self.api_handlers):
-            if self.api_handlers[i][1] == method:
-                self.api_handlers.pop(i)
-            else:
-                i += 1
+        if isinstance(method, Subscription):
+            method.cancel()
+        else:
+            self.handlers.remove_function(method)
 
     # Add new command to queue
-    def command(self, command: dict):
+    def command(self, command: dict) -> Future:
         """
         Send a command through WebSocket
 
@@ -376,16 +449,63 @@ class VideoSDK:
         command : dict
             The command
 
+        Returns a Future with the response to the command. A read-only request
+        (getAbook, getSettings, ...) identical to one already in flight is not
+        sent again: both callers get the same Future and the same response,
+        which must not be modified. With the cache enabled (see pyVideoSDK.cache)
+        the response may come from it.
+
         Example::
 
             command({"method": "call", "peerId": "user1@some.server"})
 
+            abook = command({"method": "getAbook"}).result(timeout = 5)
+
         """
-        self.lock.acquire()
-        try:
-            self.command_queue.append(command)
-        finally:
-            self.lock.release()
+        future = self.cache.get(command)
+        if future is not None:
+            return future
+
+        future, command = self.pending.start(command)
+        if command is not None:
+            self.cache.track(command, future)
+            self.lock.acquire()
+            try:
+                self.command_queue.append(command)
+            finally:
+                self.lock.release()
+
+        return future
+
+    def commands(self, commands: list) -> list:
+        """
+        Send several commands back-to-back in one tick of the queue instead of
+        one command per QUEUE_INTERVAL
+
+        Returns the list of Futures, in the order of the commands.
+
+        Example::
+
+            futures = commands([{"method": "turnRemoteMic", "peerId": peerId, "on": False} for peerId in peerIds])
+        """
+        futures, batch = [], []
+        for command in commands:
+            future = self.cache.get(command)
+            if future is None:
+                future, command = self.pending.start(command)
+                if command is not None:
+                    self.cache.track(command, future)
+                    batch.append(command)
+            futures.append(future)
+
+        if batch:
+            self.lock.acquire()
+            try:
+                self.command_queue.append(batch)
+            finally:
+                self.lock.release()
+
+        return futures
 
     def run(self):
         print("\nPress Ctrl+c for exit.\n")
@@ -424,10 +544,13 @@ class VideoSDK:
         self.in_stopping = False
         self.auth_token = ""
 
+        import websocket
+        from pyVideoSDK import logs, methods
+
         self.wsPort = utils.getWebsocketPort(ip, port, logger)
         self.http_port = utils.getHttpPort(ip, port, logger)
         
-        websocket.enableTrace(self.debug)
+        logs.trace_websocket(self.debug)
         self.url = f'ws://{self.ip}:{self.wsPort}'
         self.websocket = websocket.WebSocketApp(self.url,
                                                  on_open=self.__WS_open,
@@ -477,9 +600,51 @@ class VideoSDK:
     def isConnected(self) -> bool:
         return self.session_status in [SessionStatus.connected, SessionStatus.normal]
     
+    def apply_settings(self, desired: dict) -> Future:
+        """
+        Bring the application settings to `desired`: only the keys which differ
+        from the current values (getSettings + settingsChanged) are sent by setSettings
+
+        Parameters:
+
+            desired: dict
+                {name: value}
+
+        Returns a Future with the setSettings response, or with None if nothing had to be sent
+
+        Example::
+
+            room.apply_settings({"audioPlayLevel": 0.55, "enableAutologin": True})
+        """
+        changes = self.settings_mirror.diff(desired)
+        if not changes:
+            return completed_future(None)
+
+        logger.debug('Settings to change: %s', changes)
+        future = self.command({"method": "setSettings", "settings": changes})
+
+        def confirm(future: Future):
+            succeeded = not future.cancelled() and future.exception() is None and future.result().get("result") is not False
+            self.settings_mirror.confirm(changes, succeeded)
+
+        future.add_done_callback(confirm)
+        return future
+
     def getSelfViewURL(self) -> str:
         return f'http://{self.ip}:{self.http_port}/frames/?peerId=%23self%3A0&token={self.auth_token}'
 
+    def getFrameURL(self, peerId: str) -> str:
+        """URL of the newest frame of a conference participant (TrueConf ID or callId)"""
+        return f'http://{self.ip}:{self.http_port}/frames/?peerId={quote(peerId, safe="")}&token={self.auth_token}'
+
+    def getFileURL(self, fileId) -> str:
+        """URL of a file on the HTTP server"""
+        return f'http://{self.ip}:{self.http_port}/files/{quote(str(fileId), safe="")}/?token={self.auth_token}'
+
+    def getUploadURL(self) -> str:
+        """URL to upload a file to the HTTP server (POST, multipart/form-data)"""
+        return f'http://{self.ip}:{self.http_port}/files/?token={self.auth_token}'
+
 # ========================================================================================
 def open_session(ip: str, port: int = 80, pin: str = None, debug: bool = False): 
     """
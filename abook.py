@@ -0,0 +1,319 @@
+# coding=utf8
+'''''
+Local address book index.
+
+Seeded from getAbook / abReceivedAfterLogin and kept up to date by the
+contact, group and status events, so that lookups and type-ahead search
+never go to the network.
+
+Example::
+
+    room = pyVideoSDK.open_session(ip = "127.0.0.1", port = 80, pin = "123")
+    abook = pyVideoSDK.abook.AddressBook(room)
+    abook.wait(timeout = 5)
+
+    abook.get("user1@some.server")
+    abook.search("iva", limit = 20)
+'''
+import bisect
+from threading import Event, Lock
+
+
+def peer_id_of(item) -> str:
+    """Contacts come either as {"peerId": ...} or as a plain peerId"""
+    if isinstance(item, dict):
+        return item.get("peerId")
+    return item
+
+
+def statuses_of(users_statuses) -> list:
+    """usersStatuses: {peerId: status} or [{"peerId": ..., "status": ...}]"""
+    if isinstance(users_statuses, dict):
+        return list(users_statuses.items())
+    return [(item.get("peerId"), item.get("status")) for item in users_statuses or () if isinstance(item, dict)]
+
+
+def when_answered(future, function: object):
+    """
+    function(response) once the request is answered. A cache hit completes the
+    Future without calling the handlers, so a state seeded by a request must
+    not rely on them
+    """
+    def answered(future):
+        if not future.cancelled() and future.exception() is None:
+            function(future.result())
+
+    future.add_done_callback(answered)
+
+
+class AddressBook:
+    def __init__(self, videosdk=None, request: bool = True):
+        self.lock = Lock()
+        self.ready = Event()
+        self.groups_ready = Event()
+        self.__contacts = {}  # peerId (lower case): contact dict
+        self.__groups = {}    # groupId: group dict
+        self.__members = {}   # groupId: {peerId (lower case)}
+        self.__names = None   # sorted [(word of the display name, peerId)], built on the first search, then kept up to date
+        self.__listeners = []
+        self.__subscriptions = []
+        self.__seen = {}      # "abook" / "groups": the response loaded last, see __on_response
+        if videosdk is not None:
+            self.attach(videosdk, request)
+
+    def __len__(self):
+        return len(self.__contacts)
+
+    def __contains__(self, peerId: str):
+        return peerId.lower() in self.__contacts
+
+    def __iter__(self):
+        return iter(list(self.__contacts.values()))
+
+    # =======================================
+    # Events
+    # =======================================
+    def attach(self, videosdk, request: bool = True):
+        """Follow the events of the session. request - ask for the current address book and groups"""
+        add = videosdk.add_handler
+        self.__subscriptions = [
+            add({"method": "getAbook", "abook": None}, lambda r: self.__on_response(r, "abook", self.load)),
+            add({"event": "abReceivedAfterLogin", "abook": None}, lambda r: self.load(r["abook"])),
+            add({"method": "getGroups", "groups": None}, lambda r: self.__on_response(r, "groups", self.load_groups)),
+            add({"event": {"contactsAdded", "contactsRenamed"}, "contacts": None}, lambda r: self.update(r["contacts"])),
+            add({"event": "contactsDeleted", "contacts": None}, lambda r: self.remove(r["contacts"])),
+            add({"event": "usersStatusesChanged", "usersStatuses": None}, lambda r: self.set_statuses(r["usersStatuses"])),
+            add({"event": {"groupsAdded", "groupsRenamed"}, "groups": None}, lambda r: self.update_groups(r["groups"])),
+            add({"event": "groupsRemoved", "groups": None}, lambda r: self.remove_groups(r["groups"])),
+            add({"event": "usersAddedToGroups", "addedUsers": None}, lambda r: self.set_membership(r["addedUsers"], True)),
+            add({"event": "usersRemovedFromGroups", "removedUsers": None}, lambda r: self.set_membership(r["removedUsers"], False)),
+        ]
+        if request:
+            when_answered(videosdk.command({"method": "getAbook"}),
+                          lambda r: self.__on_response(r, "abook", self.load, True))
+            when_answered(videosdk.command({"method": "getGroups"}),
+                          lambda r: self.__on_response(r, "groups", self.load_groups, True))
+
+    def __on_response(self, response: dict, key: str, function: object, last: bool = False):
+        """
+        The response to the own request comes to the handler and then to its
+        Future (or only to the Future on a cache hit): load it once.
+        last - the Future: the response is not expected again
+        """
+        if key not in response:
+            return
+        seen = self.__seen.get(key)
+        self.__seen[key] = None if last else response
+        if seen is not response:
+            function(response[key])
+
+    def detach(self):
+        for subscription in self.__subscriptions:
+            subscription.cancel()
+        self.__subscriptions = []
+
+    def add_listener(self, function: object):
+        """function(event: str, peerIds: list) is called after each change: "load", "update", "remove", "status", "groups" """
+        self.__listeners.append(function)
+
+    def __notify(self, event: str, peer_ids: list):
+        for function in self.__listeners:
+            function(event, peer_ids)
+
+    # =======================================
+    # Changes
+    # =======================================
+    def load(self, abook: list):
+        """Replace the whole address book"""
+        contacts = {}
+        for contact in abook or ():
+            peer_id = peer_id_of(contact)
+            if peer_id:
+                contacts[peer_id.lower()] = dict(contact) if isinstance(contact, dict) else {"peerId": peer_id}
+        with self.lock:
+            self.__contacts = contacts
+            self.__members = {}
+            for key, contact in contacts.items():
+                for group_id in contact.get("groups") or ():
+                    self.__members.setdefault(group_id, set()).add(key)
+            self.__names = None
+        self.ready.set()
+        self.__notify("load", [c["peerId"] for c in contacts.values()])
+
+    def update(self, contacts: list):
+        """Add new contacts or change the existing ones (contactsAdded, contactsRenamed)"""
+        changed = []
+        with self.lock:
+            for item in contacts or ():
+                peer_id = peer_id_of(item)
+                if not peer_id:
+                    continue
+                key = peer_id.lower()
+                contact = self.__contacts.get(key)
+                if contact is None:
+                    contact = self.__contacts[key] = {"peerId": peer_id}
+                else:
+                    self.__unindex(key, contact)
+                if isinstance(item, dict):
+                    contact.update(item)
+                self.__index(key, contact)
+                changed.append(peer_id)
+        self.__notify("update", changed)
+
+    def remove(self, contacts: list):
+        removed = []
+        with self.lock:
+            for item in contacts or ():
+                peer_id = peer_id_of(item)
+                if not peer_id:
+                    continue
+                contact = self.__contacts.pop(peer_id.lower(), None)
+                if contact is not None:
+                    self.__unindex(peer_id.lower(), contact)
+                    for members in self.__members.values():
+                        members.discard(peer_id.lower())
+                    removed.append(peer_id)
+        self.__notify("remove", removed)
+
+    def set_statuses(self, users_statuses):
+        """Statuses do not change the name index"""
+        changed = []
+        with self.lock:
+            for peer_id, status in statuses_of(users_statuses):
+                contact = self.__contacts.get(str(peer_id).lower())
+                if contact is not None:
+                    contact["status"] = status
+                    changed.append(peer_id)
+        self.__notify("status", changed)
+
+    def load_groups(self, groups: list):
+        with self.lock:
+            self.__groups = {g["groupId"]: dict(g) for g in groups or () if isinstance(g, dict) and "groupId" in g}
+        self.groups_ready.set()
+        self.__notify("groups", [])
+
+    def update_groups(self, groups: list):
+        with self.lock:
+            for group in groups or ():
+                if isinstance(group, dict) and "groupId" in group:
+                    self.__groups.setdefault(group["groupId"], {}).update(group)
+        self.__notify("groups", [])
+
+    def remove_groups(self, groups: list):
+        with self.lock:
+            for group in groups or ():
+                group_id = group.get("groupId") if isinstance(group, dict) else group
+                self.__groups.pop(group_id, None)
+                self.__members.pop(group_id, None)
+        self.__notify("groups", [])
+
+    def set_membership(self, users: list, added: bool):
+        """usersAddedToGroups / usersRemovedFromGroups: [{"groupId": ..., "peerId": ...}]"""
+        changed = []
+        with self.lock:
+            for item in users or ():
+                if not isinstance(item, dict):
+                    continue
+                group_id, peer_id = item.get("groupId"), item.get("peerId")
+                if group_id is None or not peer_id:
+                    continue
+                key = peer_id.lower()
+                members = self.__members.setdefault(group_id, set())
+                if added:
+                    members.add(key)
+                else:
+                    members.discard(key)
+                contact = self.__contacts.get(key)
+                if contact is not None:
+                    groups = [g for g in contact.get("groups") or () if g != group_id]
+                    if added:
+                        groups.append(group_id)
+                    contact["groups"] = groups
+                changed.append(peer_id)
+        self.__notify("groups", changed)
+
+    # =======================================
+    # Lookup
+    # =======================================
+    def wait(self, timeout: float = None) -> bool:
+        """Wait for the address book to be loaded"""
+        return self.ready.wait(timeout)
+
+    def get(self, peerId: str) -> dict:
+        """Contact by TrueConf ID or None. O(1)"""
+        return self.__contacts.get(peerId.lower())
+
+    def display_name(self, peerId: str) -> str:
+        contact = self.get(peerId)
+        return contact.get("peerDn") if contact else None
+
+    def status(self, peerId: str) -> int:
+        contact = self.get(peerId)
+        return contact.get("status") if contact else None
+
+    def groups(self) -> list:
+        return list(self.__groups.values())
+
+    def group_members(self, groupId) -> list:
+        contacts = self.__contacts
+        return [contacts[key] for key in list(self.__members.get(groupId, ())) if key in contacts]
+
+    @staticmethod
+    def __words(key: str, contact: dict) -> set:
+        words = set(str(contact.get("peerDn") or "").lower().split())
+        words.add(key)
+        return words
+
+    def __index(self, key: str, contact: dict):
+        """Add the contact to the name index, if it is built. Under the lock"""
+        names = self.__names
+        if names is not None:
+            for word in self.__words(key, contact):
+                bisect.insort(names, (word, key))
+
+    def __unindex(self, key: str, contact: dict):
+        names = self.__names
+        if names is not None:
+            for word in self.__words(key, contact):
+                i = bisect.bisect_left(names, (word, key))
+                if i < len(names) and names[i] == (word, key):
+                    del names[i]
+
+    def __name_index(self) -> list:
+        """Sorted [(word of the display name, peerId)], built on the first search. Under the lock"""
+        if self.__names is None:
+            index = []
+            for key, contact in self.__contacts.items():
+                index.extend((word, key) for word in self.__words(key, contact))
+            index.sort()
+            self.__names = index
+        return self.__names
+
+    def search(self, text: str, limit: int = None, substring: bool = False) -> list:
+        """
+        Contacts whose display name has a word starting with `text` or whose TrueConf ID starts with it.
+        substring = True (or several words in `text`) - `text` anywhere in the display name or the TrueConf ID
+        """
+        words = text.lower().split()
+        text = " ".join(words)
+        contacts = self.__contacts
+        found = {}
+        if substring or len(words) > 1:
+            for key, contact in list(contacts.items()):
+                if text in key or text in str(contact.get("peerDn") or "").lower():
+                    found[key] = contact
+                    if limit is not None and len(found) >= limit:
+                        break
+        else:
+            with self.lock:
+                names = self.__name_index()
+                i = bisect.bisect_left(names, (text, ""))
+                while i < len(names) and names[i][0].startswith(text):
+                    key = names[i][1]
+                    if key in contacts and key not in found:
+                        found[key] = contacts[key]
+                        if limit is not None and len(found) >= limit:
+                            break
+                    i += 1
+
+        return list(found.values())
@@ -0,0 +1,330 @@
+# coding=utf8
+'''''
+Bulk synchronization of the address book and the groups.
+
+The desired contacts (and their groups, by name) are compared with the
+current state of an AddressBook, and only the differences are sent, in
+pipelined batches (VideoSDK.commands): first the new groups, then the
+contacts, then the group membership. Each change is confirmed by its event
+(groupsAdded, contactsAdded, contactsRenamed, contactsDeleted,
+usersAddedToGroups, usersRemovedFromGroups).
+
+export_jsonl() writes the address book one contact per line; load_jsonl()
+reads such a file back as the desired state.
+
+Example::
+
+    abook = pyVideoSDK.abook.AddressBook(room)
+    sync = pyVideoSDK.abooksync.AbookSync(room, abook)
+    plan = sync.diff(pyVideoSDK.abooksync.load_jsonl("department.jsonl"))
+    print(plan.summary())
+    report = sync.apply(plan, progress = print).result()
+'''
+import json
+import time
+from concurrent.futures import Future
+from threading import Condition, Thread
+
+from pyVideoSDK.abook import AddressBook, peer_id_of
+
+BATCH_SIZE = 100
+# Seconds to wait for the event confirming a change
+CONFIRM_TIMEOUT = 30
+
+# Operation statuses
+QUEUED, SENT, DONE, FAILED, TIMEOUT = "queued", "sent", "done", "failed", "timeout"
+FINAL_STATUSES = (DONE, FAILED, TIMEOUT)
+
+
+def group_name(group: dict) -> str:
+    return group.get("name") or group.get("groupName") or ""
+
+
+def _contact_ids(contacts) -> list:
+    return [peer_id_of(c) for c in contacts or () if peer_id_of(c)]
+
+
+class Operation:
+    __slots__ = ("command", "key", "status", "error")
+
+    def __init__(self, command: dict, key: tuple):
+        self.command = command
+        self.key = key  # the confirming event's key, see AbookSync.__on_*
+        self.status = QUEUED
+        self.error = None
+
+    def __repr__(self):
+        return f'Operation({self.command["method"]}, {self.status})'
+
+
+class SyncPlan:
+    """Changes bringing the address book to the desired state"""
+
+    def __init__(self):
+        self.create_groups = []     # names
+        self.add_contacts = []      # (peerId, peerDn)
+        self.rename_contacts = []   # (peerId, peerDn)
+        self.remove_contacts = []   # peerIds
+        self.add_members = []       # (group name, peerId)
+        self.remove_members = []    # (groupId, peerId)
+
+    def __len__(self):
+        return sum(map(len, (self.create_groups, self.add_contacts, self.rename_contacts,
+                             self.remove_contacts, self.add_members, self.remove_members)))
+
+    def summary(self) -> dict:
+        return {name: len(value) for name, value in vars(self).items()}
+
+
+class SyncReport:
+    def __init__(self):
+        self.operations = []
+        self.started = time.monotonic()
+        self.finished = None
+
+    def counts(self) -> dict:
+        counts = dict.fromkeys((QUEUED, SENT, DONE, FAILED, TIMEOUT), 0)
+        for operation in self.operations:
+            counts[operation.status] += 1
+        return counts
+
+    def failed(self) -> list:
+        return [o for o in self.operations if o.status in (FAILED, TIMEOUT)]
+
+    @property
+    def rate(self) -> float:
+        """Confirmed operations per second"""
+        elapsed = (self.finished or time.monotonic()) - self.started
+        done = sum(1 for o in self.operations if o.status == DONE)
+        return done / elapsed if elapsed > 0 else 0
+
+    def __repr__(self):
+        return f'SyncReport({self.counts()}, {self.rate:.1f}/s)'
+
+
+class AbookSync:
+    def __init__(self, videosdk, abook: AddressBook = None, batch_size: int = BATCH_SIZE, timeout: float = CONFIRM_TIMEOUT):
+        """abook - AddressBook following the session; by default a new one"""
+        self.videosdk = videosdk
+        self.abook = abook or AddressBook(videosdk)
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.__changed = Condition()
+        self.__waiting = {}  # key: Operation
+
+    def diff(self, contacts, remove: bool = False, timeout: float = CONFIRM_TIMEOUT) -> SyncPlan:
+        """
+        contacts - desired contacts: {"peerId": ..., "peerDn": ..., "groups": [group names]} or peerIds
+        remove - also remove the contacts and the group members not in `contacts`
+        """
+        if not (self.abook.wait(timeout) and self.abook.groups_ready.wait(timeout)):
+            raise TimeoutError('The address book or the groups are not loaded')
+
+        plan = SyncPlan()
+        groups = {group_name(g).lower(): g for g in self.abook.groups()}
+        members = {g["groupId"]: {c["peerId"].lower() for c in self.abook.group_members(g["groupId"])}
+                   for g in groups.values()}
+        desired_members = set()
+        seen = set()
+        for contact in contacts:
+            if not isinstance(contact, dict):
+                contact = {"peerId": contact}
+            peer_id = contact["peerId"]
+            key = peer_id.lower()
+            seen.add(key)
+            current = self.abook.get(peer_id)
+            name = contact.get("peerDn")
+            if current is None:
+                plan.add_contacts.append((peer_id, name or ""))
+            elif name and current.get("peerDn") != name:
+                plan.rename_contacts.append((peer_id, name))
+
+            for group in contact.get("groups") or ():
+                existing = groups.get(group.lower())
+                if existing is None and group.lower() not in (g.lower() for g in plan.create_groups):
+                    plan.create_groups.append(group)
+                desired_members.add((group.lower(), key))
+                if existing is None or key not in members[existing["groupId"]]:
+                    plan.add_members.append((group, peer_id))
+
+        if remove:
+            plan.remove_contacts = [c["peerId"] for c in self.abook if c["peerId"].lower() not in seen]
+            removed = {peer_id.lower() for peer_id in plan.remove_contacts}
+            for name, group in groups.items():
+                for key in members[group["groupId"]]:
+                    if (name, key) not in desired_members and key not in removed:
+                        plan.remove_members.append((group["groupId"], self.abook.get(key)["peerId"]))
+
+        return plan
+
+    def apply(self, plan: SyncPlan, progress=None) -> Future:
+        """
+        Send the changes. Returns a Future with the SyncReport
+
+        progress - function(report: SyncReport), called after every batch and confirmation
+        """
+        future = Future()
+        Thread(target=self.__apply, args=(plan, progress, future), name="AbookSync", daemon=True).start()
+        return future
+
+    # =======================================
+    def __apply(self, plan: SyncPlan, progress, future: Future):
+        report = SyncReport()
+        add = self.videosdk.add_handler
+        subscriptions = [
+            add({"event": "groupsAdded", "groups": None}, self.__on_groups),
+            add({"event": "contactsAdded", "contacts": None}, lambda r: self.__confirm(("contact", p) for p in _contact_ids(r["contacts"]))),
+            add({"event": "contactsRenamed", "contacts": None}, lambda r: self.__confirm(("renamed", p) for p in _contact_ids(r["contacts"]))),
+            add({"event": "contactsDeleted", "contacts": None}, lambda r: self.__confirm(("deleted", p) for p in _contact_ids(r["contacts"]))),
+            add({"event": "usersAddedToGroups", "addedUsers": None}, lambda r: self.__on_members(r["addedUsers"], "member")),
+            add({"event": "usersRemovedFromGroups", "removedUsers": None}, lambda r: self.__on_members(r["removedUsers"], "nonmember")),
+        ]
+        try:
+            self.__run(report, progress, [Operation({"method": "createGroup", "name": name}, ("group", name))
+                                          for name in plan.create_groups])
+            self.__run(report, progress,
+                       [Operation({"method": "addToAbook", "peerId": p, "peerDn": n}, ("contact", p)) for p, n in plan.add_contacts]
+                       + [Operation({"method": "renameInAbook", "peerId": p, "peerDn": n}, ("renamed", p)) for p, n in plan.rename_contacts]
+                       + [Operation({"method": "removeFromAbook", "peerId": p}, ("deleted", p)) for p in plan.remove_contacts])
+
+            group_ids = {group_name(g).lower(): g["groupId"] for g in self.abook.groups()}
+            operations = [Operation({"method": "removeFromGroup", "groupId": g, "peerId": p}, ("nonmember", g, p))
+                          for g, p in plan.remove_members]
+            for name, peer_id in plan.add_members:
+                group_id = group_ids.get(name.lower())
+                operation = Operation({"method": "addToGroup", "groupId": group_id, "peerId": peer_id}, ("member", group_id, peer_id))
+                if group_id is None:
+                    operation.status, operation.error = FAILED, f'No group "{name}"'
+                    report.operations.append(operation)
+                else:
+                    operations.append(operation)
+            self.__run(report, progress, operations)
+        except Exception as e:
+            future.set_exception(e)
+            return
+        finally:
+            for subscription in subscriptions:
+                subscription.cancel()
+        report.finished = time.monotonic()
+        future.set_result(report)
+
+    def __run(self, report: SyncReport, progress, operations: list):
+        """Send the operations in batches keeping at most batch_size of them unconfirmed"""
+        report.operations.extend(operations)
+        queue = list(operations)
+        waiting = []
+        while True:
+            batch = None
+            with self.__changed:
+                now = time.monotonic()
+                for operation, deadline in waiting:
+                    if operation.status not in FINAL_STATUSES and now >= deadline:
+                        operation.status = TIMEOUT
+                        self.__forget(operation)
+                waiting = [(o, d) for o, d in waiting if o.status not in FINAL_STATUSES]
+                if not queue and not waiting:
+                    break
+
+                free = self.batch_size - len(waiting)
+                if queue and free > 0:
+                    batch, queue = queue[:free], queue[free:]
+                    self.__expect(batch)
+                    waiting.extend((operation, now + self.timeout) for operation in batch)
+                else:
+                    self.__changed.wait(max(min(d for _, d in waiting) - now, 0))
+            if batch:
+                # Outside the condition: commands() takes VideoSDK.lock, never nested in it
+                self.__send(batch)
+            if progress is not None:
+                progress(report)
+
+    def __expect(self, batch: list):
+        """Called with self.__changed held: the confirming events may come as soon as the batch is sent"""
+        for operation in batch:
+            operation.status = SENT
+            self.__waiting[self.__normalized(operation.key)] = operation
+
+    def __send(self, batch: list):
+        futures = self.videosdk.commands([operation.command for operation in batch])
+        for operation, future in zip(batch, futures):
+            future.add_done_callback(lambda f, operation=operation: self.__on_response(operation, f))
+
+    @staticmethod
+    def __normalized(key: tuple) -> tuple:
+        return tuple(k.lower() if isinstance(k, str) else k for k in key)
+
+    def __forget(self, operation: Operation):
+        key = self.__normalized(operation.key)
+        if self.__waiting.get(key) is operation:
+            del self.__waiting[key]
+
+    def __on_response(self, operation: Operation, future: Future):
+        if future.cancelled():
+            error = "Cancelled"
+        elif future.exception() is not None:
+            error = str(future.exception())
+        elif future.result().get("result") is False:
+            error = future.result().get("error") or f'{operation.command["method"]} failed'
+        else:
+            return
+        with self.__changed:
+            if operation.status not in FINAL_STATUSES:
+                operation.status, operation.error = FAILED, error
+                self.__forget(operation)
+                self.__changed.notify_all()
+
+    def __confirm(self, keys):
+        with self.__changed:
+            for key in keys:
+                operation = self.__waiting.pop(self.__normalized(key), None)
+                if operation is not None and operation.status not in FINAL_STATUSES:
+                    operation.status = DONE
+            self.__changed.notify_all()
+
+    def __on_groups(self, response: dict):
+        self.__confirm(("group", group_name(g)) for g in response["groups"] or () if isinstance(g, dict))
+
+    def __on_members(self, users: list, kind: str):
+        self.__confirm((kind, u.get("groupId"), u.get("peerId")) for u in users or ()
+                       if isinstance(u, dict) and u.get("peerId"))
+
+
+# =======================================
+# JSONL
+# =======================================
+def export_jsonl(abook: AddressBook, file, with_groups: bool = True) -> int:
+    """
+    Write the contacts one per line (file - path or text file object). The
+    group ids of a contact are written as "groups" names, so that the file can
+    be given to AbookSync.diff(). Returns the number of contacts
+    """
+    names = {g["groupId"]: group_name(g) for g in abook.groups()} if with_groups else {}
+    own = isinstance(file, str)
+    f = open(file, "w", encoding="utf8") if own else file
+    count = 0
+    try:
+        for contact in abook:
+            line = {"peerId": contact["peerId"], "peerDn": contact.get("peerDn")}
+            if with_groups:
+                line["groups"] = [names[g] for g in contact.get("groups") or () if g in names]
+            f.write(json.dumps(line, ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    finally:
+        if own:
+            f.close()
+    return count
+
+
+def load_jsonl(file):
+    """Contacts from a JSONL file (path or text file object), one by one"""
+    own = isinstance(file, str)
+    f = open(file, encoding="utf8") if own else file
+    try:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+    finally:
+        if own:
+            f.close()
@@ -0,0 +1,200 @@
+# coding=utf8
+'''''
+Cache of the read-only requests (getAbook, getHardware, ...).
+
+Each cached method has a TTL and a list of triggers: events, or responses to
+the commands which change the data, that invalidate it. The cache is bounded
+(LRU) and is off by default: a cache hit completes the Future returned by
+VideoSDK.command() without any websocket message, so the handlers registered
+for the response are not called.
+
+Example::
+
+    room.cache.enable()
+    abook = room.methods.getAbook().result(timeout = 5)
+'''
+import json
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from threading import Lock
+
+DEFAULT_MAX_ENTRIES = 256
+
+# Any of them clears the whole cache
+RESET_TRIGGERS = ("login", "logout", "serverConnected", "serverDisconnected", "authorizationNeeded")
+RESET_TRIGGERS_LOWER = frozenset(t.lower() for t in RESET_TRIGGERS)
+
+FILE_TRIGGERS = ("fileStatus", "fileAccepted", "fileRejected", "fileSent", "fileConferenceSent", "fileTransferCleared",
+                 "fileTransferFileDeleted", "receivedFileRequest", "fileTransferAvailable",
+                 "acceptFile", "rejectFile", "sendFile", "sendConferenceFile", "clearFileTransfer", "deleteFileTransferFile")
+
+# method: (TTL in seconds, events and commands invalidating it)
+CACHE_POLICY = {
+    "getAbook": (300, ("abReceivedAfterLogin", "contactsAdded", "contactsDeleted", "contactsRenamed", "usersStatusesChanged",
+                       "addToAbook", "removeFromAbook", "renameInAbook")),
+    "getGroups": (300, ("groupsAdded", "groupsRemoved", "groupsRenamed", "usersAddedToGroups", "usersRemovedFromGroups",
+                        "createGroup", "removeGroup", "renameGroup", "addToGroup", "removeFromGroup")),
+    "getBanList": (300, ("contactBlocked", "contactUnblocked", "block", "unblock")),
+    "getHardware": (60, ("hardwareChanged", "appSndDevChanged", "updateCameraInfo",
+                         "setAudioCapturer", "setAudioRenderer", "setVideoCapturer", "setAppSndDev")),
+    "getModes": (60, ("hardwareChanged", "deviceModesDone", "updateCameraInfo", "setModes", "setVideoCapturer")),
+    "getLicenseType": (600, ("licenseStatusChanged", "licenseActivation", "activateLicense")),
+    "getFileList": (30, FILE_TRIGGERS),
+    "getFileUploads": (30, FILE_TRIGGERS + ("fileUploadingProgress",)),
+    "getFileRequests": (30, FILE_TRIGGERS),
+    "getSettings": (60, ("settingsChanged", "setSettings")),
+    "getMonitorsInfo": (300, ("monitorsInfoUpdated",)),
+    "getAllUserContainersNames": (300, ("dataSaved", "dataDeleted", "saveData", "deleteData")),
+    "getBackground": (300, ("backgroundImageChanged", "setBackground", "setDefaultBackground")),
+    "getLogo": (300, ("logoImageChanged", "customLogoUsageChanged", "setLogo", "setDefaultLogo")),
+    "getCrop": (300, ("cropChanged", "setCrop")),
+    "getBroadcastSelfie": (300, ("broadcastSelfieChanged", "setBroadcastSelfie")),
+    "getHttpServerSettings": (300, ("httpServerSettingChanged", "setHttpServerSettings")),
+    "getHttpServerState": (300, ("httpServerStateChanged", "startHttpServer", "stopHttpServer")),
+    "getNDIState": (300, ("NDIStateChanged", "setNDIState")),
+    "getCreatedNDIDevices": (300, ("NDIDeviceCreated", "NDIDeviceDeleted", "createNDIDevice", "deleteNDIDevice")),
+    "getPtzControls": (300, ("ptzControlsChanged", "hardwareChanged")),
+    "getProperties": (300, ("propertiesUpdated",)),
+    "getTariffRestrictions": (300, ("tariffRestrictionsChanged",)),
+    "getVideoMatrix": (60, ("videoMatrixChanged", "changeVideoMatrixType", "appStateChanged")),
+    "getOutputSelfVideoRotateAngle": (300, ("outputSelfVideoRotateAngleChanged", "setOutputSelfVideoRotateAngle")),
+    "getCurrentUserProfileUrl": (300, ("currentUserProfileUrlChanged",)),
+}
+
+
+def request_key(command: dict) -> str:
+    return json.dumps({k: v for k, v in command.items() if k != "requestId"}, sort_keys=True)
+
+
+def completed_future(result) -> Future:
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+class QueryCache:
+    def __init__(self, policy: dict = CACHE_POLICY, max_entries: int = DEFAULT_MAX_ENTRIES, pending=None):
+        """pending - PendingRequests whose in-flight requests of an invalidated method must not be shared any more"""
+        self.lock = Lock()
+        self.pending = pending
+        self.enabled = False
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.__ttl = {}         # method (lower case): TTL
+        self.__triggers = {}    # event or command (lower case): [method (lower case)]
+        self.__generation = {}  # method (lower case): number of invalidations
+        self.__entries = OrderedDict()  # key: (method, expires, response), the most recently used last
+        for method, (ttl, triggers) in policy.items():
+            self.set_policy(method, ttl, triggers)
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def enable(self, enabled: bool = True):
+        self.enabled = enabled
+        if not enabled:
+            self.clear()
+
+    def set_policy(self, method: str, ttl: float, triggers: tuple = ()):
+        """Cache the method for `ttl` seconds; any of `triggers` (event or command names) invalidates it"""
+        method = method.lower()
+        with self.lock:
+            self.__ttl[method] = ttl
+            self.__generation.setdefault(method, 0)
+            for trigger in triggers:
+                methods = self.__triggers.setdefault(trigger.lower(), [])
+                if method not in methods:
+                    methods.append(method)
+
+    def get(self, command: dict) -> Future:
+        """A completed Future with the cached response or None"""
+        if not self.enabled:
+            return None
+        method = str(command.get("method", "")).lower()
+        if method not in self.__ttl or "requestId" in command:
+            return None
+
+        key = request_key(command)
+        with self.lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self.__entries.move_to_end(key)
+                self.hits += 1
+                return completed_future(entry[2])
+            if entry is not None:
+                del self.__entries[key]
+            self.misses += 1
+
+        return None
+
+    def track(self, command: dict, future: Future):
+        """Store the response of the request unless the method was invalidated while it was in flight"""
+        if not self.enabled:
+            return
+        method = str(command.get("method", "")).lower()
+        ttl = self.__ttl.get(method)
+        if ttl is None:
+            return
+
+        key = request_key(command)
+        generation = self.__generation[method]
+
+        def store(future: Future):
+            if future.cancelled() or future.exception() is not None:
+                return
+            response = future.result()
+            if response.get("result", True) is False:
+                return
+            with self.lock:
+                if self.__generation[method] != generation:
+                    return
+                self.__entries[key] = (method, time.monotonic() + ttl, response)
+                self.__entries.move_to_end(key)
+                while len(self.__entries) > self.max_entries:
+                    self.__entries.popitem(last=False)
+
+        future.add_done_callback(store)
+
+    def invalidate(self, method: str = None):
+        """Drop the cached responses of the method, or everything"""
+        if method is None:
+            self.clear()
+            return
+        method = method.lower()
+        with self.lock:
+            self.__generation[method] = self.__generation.get(method, 0) + 1
+            for key in [k for k, entry in self.__entries.items() if entry[0] == method]:
+                del self.__entries[key]
+        if self.pending is not None:
+            self.pending.detach(method)
+
+    def clear(self):
+        with self.lock:
+            for method in self.__generation:
+                self.__generation[method] += 1
+            self.__entries.clear()
+        if self.pending is not None:
+            self.pending.detach()
+
+    def process(self, response: dict):
+        """
+        Invalidate by an incoming event or command response. Runs with the
+        cache off too: the requests in flight were answered before the change
+        """
+        if "event" in response:
+            trigger = response["event"]
+        elif "method" in response:
+            trigger = response["method"]
+        else:
+            return
+        if not isinstance(trigger, str):
+            return
+
+        trigger = trigger.lower()
+        if trigger in RESET_TRIGGERS_LOWER:
+            self.clear()
+            return
+        for method in self.__triggers.get(trigger, ()):
+            self.invalidate(method)
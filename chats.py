@@ -0,0 +1,174 @@
+# coding=utf8
+'''''
+Chat message store.
+
+For every chat the store keeps the newest messages as one contiguous
+sequence (oldest first), merged from the incomingChatMessage /
+incomingGroupChatMessage events and the getChatLastMessages pages.
+A range already in the store is served locally; otherwise only the
+missing part is requested. The store is bounded per chat and the least
+recently used chats are evicted.
+
+Example::
+
+    chats = pyVideoSDK.chats.ChatStore(room)
+    # 50 newest messages, then the 50 before them
+    page = chats.get("user1@some.server", 0, 50).result(timeout = 5)
+    page = chats.get("user1@some.server", 50, 50).result(timeout = 5)
+'''
+import itertools
+from collections import OrderedDict
+from concurrent.futures import Future
+from threading import Lock
+from pyVideoSDK.cache import completed_future
+from pyVideoSDK.pending import RequestFailedError
+
+DEFAULT_MAX_MESSAGES = 1000
+DEFAULT_MAX_CHATS = 100
+
+
+def _identity(message: dict) -> tuple:
+    return (message.get("time"), message.get("peerId"), message.get("message"))
+
+
+class _Chat:
+    __slots__ = ("messages", "complete", "version")
+
+    def __init__(self, version: int):
+        self.messages = []      # the newest messages of the chat, oldest first
+        self.complete = False   # the whole history is in `messages`
+        self.version = version  # unique in the store: a chat cleared or evicted and created again never matches
+
+
+class ChatStore:
+    def __init__(self, videosdk, max_messages: int = DEFAULT_MAX_MESSAGES, max_chats: int = DEFAULT_MAX_CHATS):
+        self.videosdk = videosdk
+        self.lock = Lock()
+        self.max_messages = max_messages
+        self.max_chats = max_chats
+        self.__chats = OrderedDict()  # chat id (lower case): _Chat, the most recently used last
+        self.__versions = itertools.count(1)
+        add = videosdk.add_handler
+        self.__subscriptions = [
+            add({"event": "incomingChatMessage", "peerId": None, "message": None}, lambda r: self.append(r["peerId"], r)),
+            add({"event": "incomingGroupChatMessage", "confId": None, "message": None}, lambda r: self.append(r["confId"], r)),
+            add({"event": "cmdChatClear", "id": None}, lambda r: self.forget(r["id"])),
+            add({"event": "chatMessageSent", "peerId": None}, lambda r: self.forget(r["peerId"])),
+            add({"event": "groupChatMessageSent"}, lambda r: self.forget(videosdk.roster.confId)),
+        ]
+
+    def close(self):
+        for subscription in self.__subscriptions:
+            subscription.cancel()
+        self.__subscriptions = []
+
+    def __chat(self, chat_id: str) -> _Chat:
+        key = chat_id.lower()
+        chat = self.__chats.get(key)
+        if chat is None:
+            chat = self.__chats[key] = _Chat(next(self.__versions))
+            while len(self.__chats) > self.max_chats:
+                self.__chats.popitem(last=False)
+        else:
+            self.__chats.move_to_end(key)
+        return chat
+
+    def __trim(self, chat: _Chat):
+        if len(chat.messages) > self.max_messages:
+            del chat.messages[:len(chat.messages) - self.max_messages]
+            chat.complete = False
+
+    # =======================================
+    # Events
+    # =======================================
+    def append(self, chat_id: str, message: dict):
+        """A live message: the newest of the chat"""
+        if not isinstance(chat_id, str):
+            return
+        with self.lock:
+            chat = self.__chat(chat_id)
+            chat.messages.append(message)
+            self.__trim(chat)
+
+    def forget(self, chat_id: str):
+        """Drop the chat: it was cleared, or we sent a message that comes back in a different form"""
+        if not isinstance(chat_id, str):
+            return
+        with self.lock:
+            self.__chats.pop(chat_id.lower(), None)
+
+    # =======================================
+    # Pages
+    # =======================================
+    def cached(self, chat_id: str) -> int:
+        """Number of the newest messages of the chat in the store"""
+        chat = self.__chats.get(chat_id.lower())
+        return len(chat.messages) if chat else 0
+
+    def get(self, chat_id: str, beginNumber: int, count: int) -> Future:
+        """
+        Messages [beginNumber, beginNumber + count) counted from the newest one (0),
+        oldest first, as getChatLastMessages. A Future with the list of messages.
+        """
+        with self.lock:
+            chat = self.__chat(chat_id)
+            have = len(chat.messages)
+            if beginNumber + count <= have or chat.complete:
+                return completed_future(self.__slice(chat, beginNumber, count))
+            version = chat.version
+            # Only the part older than the stored messages is requested: the stored sequence stays contiguous
+            missing = beginNumber + count - have
+
+        result = Future()
+        request = self.videosdk.command({"method": "getChatLastMessages", "id": chat_id, "beginNumber": have, "count": missing})
+
+        def merge(request: Future):
+            if request.cancelled() or request.exception() is not None:
+                result.set_exception(request.exception() if not request.cancelled() else RequestFailedError('Request cancelled'))
+                return
+            response = request.result()
+            page = response.get("messages")
+            if response.get("result") is False or not isinstance(page, list):
+                result.set_exception(RequestFailedError('getChatLastMessages failed', response))
+                return
+            with self.lock:
+                chat = self.__chat(chat_id)
+                if chat.version == version:
+                    self.__merge(chat, page, missing)
+                    messages = self.__slice(chat, beginNumber, count)
+                else:
+                    messages = None
+            if messages is None:
+                # The chat was cleared in flight
+                self.get(chat_id, beginNumber, count).add_done_callback(lambda f: _chain(f, result))
+            else:
+                result.set_result(messages)
+
+        request.add_done_callback(merge)
+        return result
+
+    def __merge(self, chat: _Chat, page: list, requested: int):
+        page = [m for m in page if isinstance(m, dict)]
+        received = len(page)
+        if page and all("time" in m for m in page):
+            page.sort(key=lambda m: m["time"])
+        # Live messages which came while the request was in flight shifted the
+        # page: drop the ones which are already stored
+        stored = set(_identity(m) for m in chat.messages[:len(page)])
+        page = [m for m in page if _identity(m) not in stored]
+        chat.messages[:0] = page
+        if received < requested:
+            chat.complete = True
+        self.__trim(chat)
+
+    @staticmethod
+    def __slice(chat: _Chat, begin: int, count: int) -> list:
+        end = len(chat.messages) - begin
+        return chat.messages[max(end - count, 0):max(end, 0)]
+
+
+def _chain(source: Future, target: Future):
+    if source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
@@ -0,0 +1,239 @@
+# coding=utf8
+'''''
+Compact contact and presence table.
+
+The address book is kept in parallel arrays instead of a dict per contact:
+interned peerIds, display names as indexes into a string pool and statuses
+as a signed byte array. usersStatusesChanged is applied in place. The table
+is a read-only Mapping peerId -> contact for the code written for getAbook dicts.
+
+Example::
+
+    contacts = pyVideoSDK.contacts.ContactTable(room)
+    contacts["user1@some.server"]["status"]
+    contacts.status("user1@some.server")
+'''
+import sys
+from array import array
+from collections.abc import Mapping
+from threading import Lock
+from pyVideoSDK.abook import peer_id_of, statuses_of, when_answered
+
+STATUS_UNKNOWN = -1
+FIELDS = ("peerId", "peerDn", "status")
+
+
+def _status_code(status) -> int:
+    try:
+        status = int(status)
+    except (TypeError, ValueError):
+        return STATUS_UNKNOWN
+    return status if -128 <= status <= 127 else STATUS_UNKNOWN
+
+
+class ContactView(Mapping):
+    """
+    Read-only view of one row of the table. The row is reused after the
+    contact is removed: the view then raises KeyError instead of showing another contact
+    """
+
+    __slots__ = ("_table", "_row", "_generation")
+
+    def __init__(self, table, row: int, generation: int):
+        self._table = table
+        self._row = row
+        self._generation = generation
+
+    def __getitem__(self, key):
+        table, row = self._table, self._row
+        try:
+            if key == "peerId":
+                value = table.peer_id_at(row)
+            elif key == "peerDn":
+                value = table.name_at(row)
+            elif key == "status":
+                value = table.status_at(row)
+            else:
+                raise KeyError(key)
+            # Checked after the read: the row may be reused meanwhile
+            current = table.generation_at(row) == self._generation
+        except IndexError:
+            current = False
+        if not current:
+            raise KeyError(f'{key}: the contact is no longer in the table')
+        return value
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self):
+        return len(FIELDS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class ContactTable(Mapping):
+    def __init__(self, videosdk=None, request: bool = True):
+        self.lock = Lock()
+        self.__index = {}                 # peerId (lower case): row
+        self.__peer_ids = []              # row: interned peerId, None - free row
+        self.__names = array('L')         # row: index in the name pool
+        self.__statuses = array('b')      # row: status code
+        self.__generations = array('Q')   # row: number of its occupant, never reused (see ContactView)
+        self.__next_generation = 1
+        self.__free = []                  # free rows
+        self.__name_pool = [""]           # the same display names are stored once
+        self.__name_ids = {"": 0}
+        self.__subscriptions = []
+        self.__seen = None                # the getAbook response loaded last, see AddressBook.__on_response
+        if videosdk is not None:
+            self.attach(videosdk, request)
+
+    # =======================================
+    # Mapping
+    # =======================================
+    def __getitem__(self, peerId: str) -> ContactView:
+        with self.lock:
+            row = self.__index[peerId.lower()]
+            return ContactView(self, row, self.__generations[row])
+
+    def __contains__(self, peerId):
+        return isinstance(peerId, str) and peerId.lower() in self.__index
+
+    def __iter__(self):
+        peer_ids = self.__peer_ids
+        return iter([peer_ids[row] for row in list(self.__index.values())])
+
+    def __len__(self):
+        return len(self.__index)
+
+    def peer_id_at(self, row: int) -> str:
+        return self.__peer_ids[row]
+
+    def name_at(self, row: int) -> str:
+        return self.__name_pool[self.__names[row]]
+
+    def status_at(self, row: int) -> int:
+        return self.__statuses[row]
+
+    def generation_at(self, row: int) -> int:
+        return self.__generations[row]
+
+    def status(self, peerId: str) -> int:
+        """Status of the contact or None. No objects are created"""
+        row = self.__index.get(peerId.lower())
+        return None if row is None else self.__statuses[row]
+
+    def display_name(self, peerId: str) -> str:
+        row = self.__index.get(peerId.lower())
+        return None if row is None else self.__name_pool[self.__names[row]]
+
+    def rows_with_status(self, status: int) -> list:
+        """peerIds of the contacts with the status (for example, all online)"""
+        peer_ids, statuses = self.__peer_ids, self.__statuses
+        return [peer_ids[row] for row in list(self.__index.values()) if statuses[row] == status]
+
+    # =======================================
+    # Events
+    # =======================================
+    def attach(self, videosdk, request: bool = True):
+        add = videosdk.add_handler
+        self.__subscriptions = [
+            add({"method": "getAbook", "abook": None}, self.__on_abook),
+            add({"event": "abReceivedAfterLogin", "abook": None}, lambda r: self.load(r["abook"])),
+            add({"event": {"contactsAdded", "contactsRenamed"}, "contacts": None}, lambda r: self.update(r["contacts"])),
+            add({"event": "contactsDeleted", "contacts": None}, lambda r: self.remove(r["contacts"])),
+            add({"event": "usersStatusesChanged", "usersStatuses": None}, lambda r: self.set_statuses(r["usersStatuses"])),
+        ]
+        if request:
+            when_answered(videosdk.command({"method": "getAbook"}), lambda r: self.__on_abook(r, True))
+
+    def __on_abook(self, response: dict, last: bool = False):
+        """Load the response once: it comes to the handler and then to the Future of the own request"""
+        if "abook" not in response:
+            return
+        seen, self.__seen = self.__seen, None if last else response
+        if seen is not response:
+            self.load(response["abook"])
+
+    def detach(self):
+        for subscription in self.__subscriptions:
+            subscription.cancel()
+        self.__subscriptions = []
+
+    # =======================================
+    # Changes
+    # =======================================
+    def __name_id(self, name) -> int:
+        name = "" if name is None else str(name)
+        name_id = self.__name_ids.get(name)
+        if name_id is None:
+            name_id = self.__name_ids[name] = len(self.__name_pool)
+            self.__name_pool.append(name)
+        return name_id
+
+    def __set_row(self, item):
+        peer_id = peer_id_of(item)
+        if not peer_id:
+            return
+        key = peer_id.lower()
+        row = self.__index.get(key)
+        if row is None:
+            if self.__free:
+                row = self.__free.pop()
+                self.__peer_ids[row] = sys.intern(peer_id)
+                self.__names[row] = 0
+                self.__statuses[row] = STATUS_UNKNOWN
+                self.__generations[row] = self.__next_generation
+            else:
+                row = len(self.__peer_ids)
+                self.__peer_ids.append(sys.intern(peer_id))
+                self.__names.append(0)
+                self.__statuses.append(STATUS_UNKNOWN)
+                self.__generations.append(self.__next_generation)
+            self.__next_generation += 1
+            self.__index[sys.intern(key)] = row
+        if isinstance(item, dict):
+            if "peerDn" in item:
+                self.__names[row] = self.__name_id(item["peerDn"])
+            if "status" in item:
+                self.__statuses[row] = _status_code(item["status"])
+
+    def load(self, abook: list):
+        """Rebuild the table from a getAbook response. The name pool is rebuilt too"""
+        with self.lock:
+            self.__index = {}
+            self.__peer_ids = []
+            self.__names = array('L')
+            self.__statuses = array('b')
+            self.__generations = array('Q')
+            self.__free = []
+            self.__name_pool = [""]
+            self.__name_ids = {"": 0}
+            for item in abook or ():
+                self.__set_row(item)
+
+    def update(self, contacts: list):
+        with self.lock:
+            for item in contacts or ():
+                self.__set_row(item)
+
+    def remove(self, contacts: list):
+        with self.lock:
+            for item in contacts or ():
+                peer_id = peer_id_of(item)
+                row = self.__index.pop(peer_id.lower(), None) if peer_id else None
+                if row is not None:
+                    self.__peer_ids[row] = None
+                    self.__generations[row] = 0
+                    self.__free.append(row)
+
+    def set_statuses(self, users_statuses):
+        """In place, nothing is allocated per contact"""
+        with self.lock:
+            index, statuses = self.__index, self.__statuses
+            for peer_id, status in statuses_of(users_statuses):
+                row = index.get(str(peer_id).lower())
+                if row is not None:
+                    statuses[row] = _status_code(status)
@@ -0,0 +1,321 @@
+# coding=utf8
+'''''
+Dict-like store over the user data containers (saveData / loadData / deleteData).
+
+Reads are served from memory: the cache is filled by loadData (all the
+containers named by getAllUserContainersNames at once with preload()) and
+kept fresh by the dataSaved and dataDeleted events. Writes are held back and
+flushed every `flush_interval` seconds in one batch (VideoSDK.commands), so a
+burst of writes to a container becomes one saveData with the last value.
+Reads see the pending writes.
+
+A read which is not in the cache waits for loadData: do not make it from a
+handler, which runs on the websocket thread that has to deliver the answer
+(RuntimeError). Preload the containers instead.
+
+Example::
+
+    store = pyVideoSDK.datastore.DataStore(room, flush_interval = 2, codec = pyVideoSDK.datastore.JSON_CODEC)
+    store.preload()
+    store["layout"] = {"mode": "grid", "tiles": 9}
+    mode = store["layout"]["mode"]      # no request
+    del store["old"]
+    store.close()                       # flushes
+'''
+import json
+import logging
+from collections.abc import MutableMapping
+from concurrent.futures import Future
+from threading import Event, Lock, Thread, get_ident
+
+from pyVideoSDK.cache import completed_future
+
+FLUSH_INTERVAL = 1
+REQUEST_TIMEOUT = 5
+# (encode, decode) of the values: containers hold strings
+STR_CODEC = (str, str)
+JSON_CODEC = (lambda value: json.dumps(value, ensure_ascii=False), json.loads)
+
+_DELETED = object()
+
+logger = logging.getLogger('videosdk')
+
+
+class DataStore(MutableMapping):
+    def __init__(self, videosdk, flush_interval: float = FLUSH_INTERVAL, flags: str = "",
+                 codec: tuple = STR_CODEC, timeout: float = REQUEST_TIMEOUT):
+        """
+        flags - saveData "flags"
+        codec - (encode, decode) between the values and the container strings
+        timeout - seconds to wait for loadData on a cache miss
+        """
+        self.videosdk = videosdk
+        self.flush_interval = flush_interval
+        self.flags = flags
+        self.encode, self.decode = codec
+        self.timeout = timeout
+        self.lock = Lock()
+        self.hits = self.misses = 0
+        self.saved = 0
+        self.coalesced = 0  # writes replaced by a newer one before the flush
+        self.errors = []    # (containerName, error) of the failed writes
+        self.__cache = {}    # containerName: value
+        self.__names = None  # container names, None until getAllUserContainersNames
+        self.__dirty = {}    # containerName: (value, encoded value) or _DELETED, not sent yet
+        self.__writing = {}  # containerName: ((value, encoded value) or _DELETED, Future), sent, not answered
+        self.__stop = Event()
+        add = videosdk.add_handler
+        self.__subscriptions = [
+            add({"event": "dataSaved", "containerName": None}, self.__on_saved),
+            add({"event": "dataDeleted", "containerName": None}, self.__on_deleted),
+        ]
+        self.__thread = Thread(target=self.__run, name="DataStore", daemon=True)
+        self.__thread.start()
+
+    # =======================================
+    # Reads
+    # =======================================
+    def __getitem__(self, name: str):
+        value = self.__local(name)
+        if value is _DELETED:
+            raise KeyError(name)
+        if value is not None:
+            self.hits += 1
+            return value[0]
+
+        self.misses += 1
+        response = self.__wait(self.videosdk.command({"method": "loadData", "containerName": name}))
+        if response.get("result") is False or response.get("data") is None:
+            raise KeyError(name)
+        value = self.decode(response["data"])
+        with self.lock:
+            if name not in self.__dirty and name not in self.__writing:
+                self.__cache[name] = value
+        return value
+
+    def __local(self, name: str):
+        """(value,), _DELETED or None if it is not known locally"""
+        with self.lock:
+            if name in self.__dirty:
+                change = self.__dirty[name]
+            elif name in self.__writing:
+                change = self.__writing[name][0]
+            elif name in self.__cache:
+                return (self.__cache[name],)
+            elif self.__names is not None and name not in self.__names:
+                return _DELETED
+            else:
+                return None
+        return change if change is _DELETED else (change[0],)
+
+    def __wait(self, future: Future) -> dict:
+        if get_ident() == getattr(self.videosdk, "socket_thread_id", None):
+            raise RuntimeError('DataStore cannot wait for a response on the websocket thread: preload() the containers')
+        return future.result(self.timeout)
+
+    def __contains__(self, name):
+        try:
+            self[name]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def keys(self) -> list:
+        """Container names: getAllUserContainersNames (asked once) with the pending changes"""
+        if self.__names is None:
+            self.__wait(self.refresh_names())
+        with self.lock:
+            names = set(self.__names or ()) | set(self.__cache)
+            for changes in (self.__writing, self.__dirty):
+                for name, value in changes.items():
+                    value = value[0] if changes is self.__writing else value
+                    if value is _DELETED:
+                        names.discard(name)
+                    else:
+                        names.add(name)
+        return sorted(names)
+
+    def refresh_names(self) -> Future:
+        future = self.videosdk.command({"method": "getAllUserContainersNames"})
+
+        def loaded(future: Future):
+            if not future.cancelled() and future.exception() is None and future.result().get("result") is not False:
+                with self.lock:
+                    self.__names = set(future.result().get("containersNames") or ())
+
+        future.add_done_callback(loaded)
+        return future
+
+    def preload(self, names: list = None) -> list:
+        """Fill the cache with one batch of loadData (all the containers by default). Returns the futures"""
+        if names is None:
+            self.__wait(self.refresh_names())
+            names = list(self.__names or ())
+        futures = self.videosdk.commands([{"method": "loadData", "containerName": name} for name in names])
+        for name, future in zip(names, futures):
+            future.add_done_callback(lambda f, name=name: self.__on_loaded(name, f))
+        return futures
+
+    def __on_loaded(self, name: str, future: Future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        response = future.result()
+        if response.get("result") is False or response.get("data") is None:
+            return
+        try:
+            value = self.decode(response["data"])
+        except ValueError:
+            return
+        with self.lock:
+            if name not in self.__dirty and name not in self.__writing:
+                self.__cache[name] = value
+
+    # =======================================
+    # Writes
+    # =======================================
+    def __setitem__(self, name: str, value):
+        # Encoded at once: a value the codec cannot take fails here, not in the flush thread
+        value = (value, self.encode(value))
+        with self.lock:
+            if name in self.__dirty:
+                self.coalesced += 1
+            self.__dirty[name] = value
+
+    def __delitem__(self, name: str):
+        with self.lock:
+            if name in self.__dirty:
+                self.coalesced += 1
+            self.__dirty[name] = _DELETED
+
+    def flush(self) -> Future:
+        """Send the pending writes now. Returns a Future completed when all of them are answered"""
+        with self.lock:
+            dirty, self.__dirty = self.__dirty, {}
+        if not dirty:
+            return completed_future(None)
+
+        names = list(dirty)
+        commands = []
+        for name in names:
+            if dirty[name] is _DELETED:
+                commands.append({"method": "deleteData", "containerName": name})
+            else:
+                commands.append({"method": "saveData", "containerName": name,
+                                 "data": dirty[name][1], "flags": self.flags})
+        # Into __writing before sending, so that a fast answer finds it
+        futures = [Future() for _ in names]
+        with self.lock:
+            for name, future in zip(names, futures):
+                self.__writing[name] = (dirty[name], future)
+        done = Future()
+        remaining = [len(names)]
+
+        def answered(name: str, value, own: Future, response: Future):
+            self.__on_written(name, value, own, response)
+            own.set_result(None)
+            with self.lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                done.set_result(None)
+
+        try:
+            responses = self.videosdk.commands(commands)
+        except Exception:
+            # Not sent: the changes wait for the next flush unless newer ones came
+            with self.lock:
+                for name, own in zip(names, futures):
+                    if self.__writing.get(name, (None, None))[1] is own:
+                        del self.__writing[name]
+                    self.__dirty.setdefault(name, dirty[name])
+            raise
+
+        for name, own, response in zip(names, futures, responses):
+            response.add_done_callback(lambda f, name=name, own=own: answered(name, dirty[name], own, f))
+
+        return done
+
+    def __on_written(self, name: str, value, own: Future, response: Future):
+        if response.cancelled():
+            error = "Cancelled"
+        elif response.exception() is not None:
+            error = str(response.exception())
+        elif response.result().get("result") is False:
+            error = response.result().get("error") or "Failed"
+        else:
+            error = None
+
+        with self.lock:
+            if self.__writing.get(name, (None, None))[1] is own:
+                del self.__writing[name]
+            if error is not None:
+                self.errors.append((name, error))
+                # Unknown now: read it again
+                self.__cache.pop(name, None)
+                return
+            self.saved += 1
+            if value is _DELETED:
+                self.__cache.pop(name, None)
+                if self.__names is not None:
+                    self.__names.discard(name)
+            else:
+                self.__cache[name] = value[0]
+                if self.__names is not None:
+                    self.__names.add(name)
+
+    # =======================================
+    # Events
+    # =======================================
+    def __on_saved(self, response: dict):
+        name = response["containerName"]
+        with self.lock:
+            if self.__names is not None:
+                self.__names.add(name)
+            if name in self.__dirty or name in self.__writing:
+                return  # ours is newer
+            if response.get("data") is None:
+                self.__cache.pop(name, None)
+                return
+        try:
+            value = self.decode(response["data"])
+        except ValueError:
+            value = _DELETED
+        with self.lock:
+            if value is _DELETED:
+                self.__cache.pop(name, None)
+            elif name not in self.__dirty and name not in self.__writing:
+                self.__cache[name] = value
+
+    def __on_deleted(self, response: dict):
+        name = response["containerName"]
+        with self.lock:
+            if name in self.__dirty or name in self.__writing:
+                return
+            self.__cache.pop(name, None)
+            if self.__names is not None:
+                self.__names.discard(name)
+
+    # =======================================
+    def __run(self):
+        while not self.__stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('DataStore flush failed')
+
+    def close(self, timeout: float = REQUEST_TIMEOUT):
+        """Flush, wait for the answers and stop following the events"""
+        self.__stop.set()
+        self.__thread.join()
+        try:
+            self.flush().result(timeout)
+        finally:
+            for subscription in self.__subscriptions:
+                subscription.cancel()
+            self.__subscriptions = []
@@ -0,0 +1,223 @@
+# coding=utf8
+'''''
+Decoding of the frames into reusable NumPy buffers.
+
+Needs numpy and one of the JPEG decoders:
+    simplejpeg  - decodes straight into the pooled buffer, downscales in the
+                  DCT domain and converts the colors in the same pass (no
+                  per-frame allocations);
+    cv2         - reduced-size decoding, then the color conversion into the pooled buffer;
+    PIL         - draft-mode decoding, then a copy into the pooled buffer.
+
+Every peer has its own pool of `pool_size` buffers used round-robin. A
+DecodedFrame is a read-only view of a pooled buffer: it stays valid until
+`pool_size - 1` newer frames of the same peer are decoded.
+
+Example::
+
+    grabber = pyVideoSDK.frames.FrameGrabber(room)
+    decoder = pyVideoSDK.decode.FrameDecoder(grabber, min_size = (320, 180), colorspace = "GRAY")
+    grabber.start()
+    image = decoder.wait(timeout = 2).array
+'''
+import time
+from io import BytesIO
+from threading import Condition
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import simplejpeg
+except ImportError:
+    simplejpeg = None
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+COLORSPACES = {"RGB": 3, "BGR": 3, "GRAY": 1}
+DEFAULT_POOL_SIZE = 4
+
+
+def available_backend() -> str:
+    if np is None:
+        return None
+    if simplejpeg is not None:
+        return "simplejpeg"
+    if cv2 is not None:
+        return "cv2"
+    if Image is not None:
+        return "PIL"
+    return None
+
+
+class DecodedFrame:
+    __slots__ = ("peerId", "seq", "array", "timestamp")
+
+    def __init__(self, peerId: str, seq: int, array, timestamp: float):
+        self.peerId = peerId
+        self.seq = seq
+        self.array = array
+        self.timestamp = timestamp
+
+    def __repr__(self):
+        return f'DecodedFrame({self.peerId!r}, seq={self.seq}, shape={self.array.shape})'
+
+
+class BufferPool:
+    """Round-robin pool of flat uint8 buffers, grown only when a frame does not fit"""
+
+    def __init__(self, size: int):
+        self.buffers = [None] * size
+        self.next = 0
+
+    def take(self, nbytes: int):
+        i = self.next
+        self.next = (i + 1) % len(self.buffers)
+        buffer = self.buffers[i]
+        if buffer is None or buffer.nbytes < nbytes:
+            buffer = self.buffers[i] = np.empty(nbytes, dtype=np.uint8)
+        return buffer
+
+
+class FrameDecoder:
+    def __init__(self, source=None, min_size: tuple = None, colorspace: str = "RGB",
+                 pool_size: int = DEFAULT_POOL_SIZE, fast: bool = True, backend: str = None):
+        """
+        source - FrameGrabber or MultiFrameFetcher: every new frame is decoded.
+                 None - call decode() yourself
+        min_size - (width, height): the frame is downscaled (1/2, 1/4, 1/8) as long as
+                   it stays at least that large. None - full size
+        colorspace - "RGB", "BGR" or "GRAY"
+        fast - faster, slightly less accurate IDCT and upsampling
+        """
+        backend = backend or available_backend()
+        if backend is None:
+            raise ImportError('Frame decoding needs numpy and one of simplejpeg, opencv-python or Pillow')
+        if colorspace not in COLORSPACES:
+            raise ValueError(f'Unsupported colorspace: {colorspace}')
+
+        self.backend = backend
+        self.min_size = min_size or (0, 0)
+        self.colorspace = colorspace
+        self.channels = COLORSPACES[colorspace]
+        self.pool_size = pool_size
+        self.fast = fast
+        self.decoded = 0
+        self.errors = 0
+        self.__pools = {}   # peerId: BufferPool
+        self.__latest = {}  # peerId: DecodedFrame
+        self.__listeners = []
+        self.__changed = Condition()
+        self.__decode = getattr(self, f'_FrameDecoder__decode_{backend.lower()}')
+        if source is not None:
+            source.add_listener(self.decode)
+
+    def add_listener(self, function: object):
+        """function(frame: DecodedFrame)"""
+        self.__listeners.append(function)
+
+    def latest(self, peerId: str = None) -> DecodedFrame:
+        """Newest decoded frame of the peer (of any peer if None)"""
+        if peerId is None:
+            return max(self.__latest.values(), key=lambda f: f.timestamp, default=None)
+        return self.__latest.get(peerId)
+
+    def wait(self, peerId: str = None, after_seq: int = 0, timeout: float = None) -> DecodedFrame:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.__changed:
+            while True:
+                frame = self.latest(peerId)
+                if frame is not None and frame.seq > after_seq:
+                    return frame
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self.__changed.wait(remaining)
+
+    def decode(self, frame) -> DecodedFrame:
+        """Decode a frames.Frame. Returns None if the data can not be decoded"""
+        pool = self.__pools.get(frame.peerId)
+        if pool is None:
+            pool = self.__pools[frame.peerId] = BufferPool(self.pool_size)
+        try:
+            array = self.__decode(frame.data, pool)
+        except Exception:
+            self.errors += 1
+            return None
+
+        array.flags.writeable = False
+        decoded = DecodedFrame(frame.peerId, frame.seq, array, frame.timestamp)
+        self.decoded += 1
+        with self.__changed:
+            self.__latest[frame.peerId] = decoded
+            self.__changed.notify_all()
+        for function in self.__listeners:
+            function(decoded)
+
+        return decoded
+
+    def __shape(self, height: int, width: int) -> tuple:
+        return (height, width) if self.channels == 1 else (height, width, self.channels)
+
+    def __reduction(self, width: int, height: int) -> int:
+        """The largest of 1, 2, 4, 8 keeping the frame at least min_size"""
+        min_width, min_height = self.min_size
+        factor = 8
+        while factor > 1 and (width // factor < min_width or height // factor < min_height):
+            factor //= 2
+        return factor
+
+    # =======================================
+    # Backends
+    # =======================================
+    def __decode_simplejpeg(self, data: bytes, pool: BufferPool):
+        min_width, min_height = self.min_size
+        height, width, _, _ = simplejpeg.decode_jpeg_header(data, min_height=min_height, min_width=min_width)
+        buffer = pool.take(height * width * self.channels)
+        return simplejpeg.decode_jpeg(data, colorspace=self.colorspace, fastdct=self.fast, fastupsample=self.fast,
+                                      min_height=min_height, min_width=min_width, buffer=buffer)
+
+    def __decode_cv2(self, data: bytes, pool: BufferPool):
+        encoded = np.frombuffer(data, dtype=np.uint8)
+        reduced = {1: cv2.IMREAD_COLOR, 2: cv2.IMREAD_REDUCED_COLOR_2, 4: cv2.IMREAD_REDUCED_COLOR_4, 8: cv2.IMREAD_REDUCED_COLOR_8}
+        if self.min_size != (0, 0):
+            # The header is not parsed by cv2: decode once at full size to learn it, then keep the factor
+            factor = getattr(pool, "factor", None)
+            if factor is None:
+                image = cv2.imdecode(encoded, cv2.IMREAD_COLOR)
+                factor = pool.factor = self.__reduction(image.shape[1], image.shape[0])
+        else:
+            factor = 1
+        image = cv2.imdecode(encoded, reduced[factor])
+        if image is None:
+            raise ValueError('Not an image')
+        height, width = image.shape[:2]
+        out = pool.take(height * width * self.channels)[:height * width * self.channels].reshape(self.__shape(height, width))
+        if self.colorspace == "BGR":
+            np.copyto(out, image)
+        else:
+            cv2.cvtColor(image, cv2.COLOR_BGR2RGB if self.colorspace == "RGB" else cv2.COLOR_BGR2GRAY, dst=out)
+        return out
+
+    def __decode_pil(self, data: bytes, pool: BufferPool):
+        image = Image.open(BytesIO(data))
+        mode = "L" if self.colorspace == "GRAY" else "RGB"
+        if self.min_size != (0, 0):
+            image.draft(mode, self.min_size)
+        image = image.convert(mode)
+        width, height = image.size
+        out = pool.take(height * width * self.channels)[:height * width * self.channels].reshape(self.__shape(height, width))
+        np.copyto(out, np.asarray(image))
+        if self.colorspace == "BGR":
+            out[...] = out[..., ::-1]
+        return out
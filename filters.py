@@ -0,0 +1,88 @@
+# coding=utf8
+'''''
+Handler filters compiled into predicates.
+
+A filter is a dict like the ones in consts.EVENT. It is compiled once, at
+registration time, so that matching a message costs a key check plus one
+test per compared value:
+
+    "key": None                   the key must be present, any value
+    "key": "text"                 case-insensitive equality
+    "key": {"a", "b"}             one of the values (strings compared case-insensitively)
+    "key": Prefix("text")         case-insensitive prefix of a string value
+    "key": callable               callable(value) returns True
+    "key": any other value        equality
+'''
+
+
+class Prefix:
+    """Match string values which start with `prefix` (case-insensitive)"""
+
+    __slots__ = ("prefix",)
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix.lower()
+
+    def __repr__(self):
+        return f'Prefix({self.prefix!r})'
+
+
+def _lower(value):
+    return value.lower() if isinstance(value, str) else value
+
+
+def _compile_matcher(expected):
+    if isinstance(expected, str):
+        expected = expected.lower()
+        return lambda value: value.__class__ is str and value.lower() == expected
+    if isinstance(expected, Prefix):
+        prefix = expected.prefix
+        return lambda value: value.__class__ is str and value.lower().startswith(prefix)
+    if isinstance(expected, (set, frozenset, list, tuple)):
+        values = frozenset(_lower(v) for v in expected)
+
+        def one_of(value):
+            try:
+                return _lower(value) in values
+            except TypeError:  # unhashable value
+                return False
+        return one_of
+    if callable(expected):
+        return expected
+    return lambda value: value == expected
+
+
+def compile_filter(schema: dict):
+    """
+    Compile a handler filter into a predicate: predicate(message: dict) -> bool
+
+    Example::
+
+        is_call_event = compile_filter({"event": {"inviteReceived", "rejectReceived"}, "peerId": None})
+        is_call_event(response)
+    """
+    keys = frozenset(schema)
+    tests = tuple((k, _compile_matcher(v)) for k, v in schema.items() if v is not None)
+
+    if not keys:
+        def predicate(data: dict) -> bool:
+            return True
+    elif not tests:
+        def predicate(data: dict) -> bool:
+            return data.keys() >= keys
+    elif len(tests) == 1:
+        (key, test), = tests
+
+        def predicate(data: dict) -> bool:
+            return data.keys() >= keys and test(data[key])
+    else:
+        def predicate(data: dict) -> bool:
+            if not data.keys() >= keys:
+                return False
+            for key, test in tests:
+                if not test(data[key]):
+                    return False
+            return True
+
+    predicate.schema = schema
+    return predicate
@@ -0,0 +1,174 @@
+# coding=utf8
+'''''
+One command to many rooms.
+
+Fleet holds VideoSDK sessions by name. broadcast() sends the same command to
+all (or some) of them in parallel, keeping at most `concurrency` requests
+unanswered, and collects a per-room result table; a room that does not answer
+within `timeout` seconds is marked as timed out without delaying the others.
+
+Example::
+
+    fleet = pyVideoSDK.fleet.Fleet.open({"floor3-a": ("10.0.3.11", 80, "123"),
+                                         "floor3-b": ("10.0.3.12", 80, "123")})
+    table = fleet.broadcast({"method": "setDefaultBackground"}, timeout = 5).result()
+    for name, result in table.items():
+        print(name, result.status, result.latency, result.error)
+    print(table.failed())
+'''
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Condition, Thread
+
+DEFAULT_CONCURRENCY = 32
+# Seconds to wait for the response of one room
+ROOM_TIMEOUT = 10
+
+# Result statuses
+OK, FAILED, TIMEOUT, NOT_CONNECTED = "ok", "failed", "timeout", "not connected"
+
+
+class RoomResult:
+    __slots__ = ("name", "status", "response", "error", "latency")
+
+    def __init__(self, name: str, status: str, response: dict = None, error: str = None, latency: float = None):
+        self.name = name
+        self.status = status
+        self.response = response
+        self.error = error
+        self.latency = latency
+
+    def __repr__(self):
+        return f'RoomResult({self.name!r}, {self.status}, {self.error or ""})'
+
+
+class FleetResult(dict):
+    """{room name: RoomResult}"""
+
+    def succeeded(self) -> list:
+        return [name for name, result in self.items() if result.status == OK]
+
+    def failed(self) -> list:
+        return [name for name, result in self.items() if result.status != OK]
+
+    def summary(self) -> dict:
+        counts = {}
+        for result in self.values():
+            counts[result.status] = counts.get(result.status, 0) + 1
+        return counts
+
+
+class Fleet:
+    def __init__(self, rooms: dict = None, errors: dict = None):
+        """
+        rooms - {name: VideoSDK}
+        errors - {name: why the room could not be opened}; broadcast() reports them as not connected
+        """
+        self.rooms = dict(rooms or {})
+        self.errors = dict(errors or {})
+
+    @classmethod
+    def open(cls, addresses: dict, debug: bool = False, max_workers: int = 16) -> "Fleet":
+        """
+        Open the sessions in parallel. addresses - {name: (ip, port, pin)}
+
+        A room which cannot be opened does not fail the others: it goes to `errors`
+        """
+        from pyVideoSDK import open_session
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="Fleet") as executor:
+            futures = {name: executor.submit(open_session, *address, debug=debug) for name, address in addresses.items()}
+        rooms, errors = {}, {}
+        for name, future in futures.items():
+            if future.exception() is None:
+                rooms[name] = future.result()
+            else:
+                errors[name] = str(future.exception()) or future.exception().__class__.__name__
+        return cls(rooms, errors)
+
+    def __len__(self):
+        return len(self.rooms)
+
+    def add(self, name: str, videosdk):
+        self.rooms[name] = videosdk
+        self.errors.pop(name, None)
+
+    def remove(self, name: str):
+        return self.rooms.pop(name, None)
+
+    def close(self):
+        for room in self.rooms.values():
+            room.close_session()
+
+    def broadcast(self, command: dict, names: list = None, concurrency: int = DEFAULT_CONCURRENCY,
+                  timeout: float = ROOM_TIMEOUT) -> Future:
+        """
+        Send `command` to the rooms (all, including the ones which could not be opened, by default).
+        Returns a Future with the FleetResult
+
+        Example::
+
+            fleet.broadcast({"method": "setLogo", "fileId": 268535454, "mode": 1})
+        """
+        future = Future()
+        if names is None:
+            names = list(self.rooms) + [name for name in self.errors if name not in self.rooms]
+        names = list(names)
+        Thread(target=self.__broadcast, args=(command, names, concurrency, timeout, future),
+               name="Fleet", daemon=True).start()
+        return future
+
+    def __broadcast(self, command: dict, names: list, concurrency: int, timeout: float, future: Future):
+        results = FleetResult()
+        changed = Condition()
+        in_flight = {}  # name: start
+
+        def answered(name: str, start: float, response: Future):
+            with changed:
+                if name in results:  # timed out already
+                    return
+                latency = time.monotonic() - start
+                if response.cancelled():
+                    results[name] = RoomResult(name, FAILED, error="Cancelled", latency=latency)
+                elif response.exception() is not None:
+                    results[name] = RoomResult(name, FAILED, error=str(response.exception()), latency=latency)
+                elif response.result().get("result") is False:
+                    results[name] = RoomResult(name, FAILED, response.result(),
+                                               response.result().get("error") or f'{command.get("method")} failed', latency)
+                else:
+                    results[name] = RoomResult(name, OK, response.result(), latency=latency)
+                in_flight.pop(name, None)
+                changed.notify_all()
+
+        queue = list(names)
+        while True:
+            starting = []
+            with changed:
+                if not queue and not in_flight:
+                    break
+                now = time.monotonic()
+                for name, start in list(in_flight.items()):
+                    if now - start >= timeout:
+                        del in_flight[name]
+                        results[name] = RoomResult(name, TIMEOUT, error=f'No response within {timeout} s', latency=now - start)
+
+                while queue and len(in_flight) < concurrency:
+                    name = queue.pop(0)
+                    room = self.rooms.get(name)
+                    if room is None or not room.isConnected():
+                        results[name] = RoomResult(name, NOT_CONNECTED, error=self.errors.get(name, "Not connected"))
+                        continue
+                    in_flight[name] = time.monotonic()
+                    starting.append((name, room, in_flight[name]))
+
+                if not starting and in_flight:
+                    next_timeout = min(in_flight.values()) + timeout - time.monotonic()
+                    changed.wait(max(next_timeout, 0))
+
+            # Outside the condition: command() takes the room's lock, never nested in it
+            for name, room, start in starting:
+                response = room.command(dict(command))
+                # A response which is already there (the cache) calls back at once
+                response.add_done_callback(lambda f, name=name, start=start: answered(name, start, f))
+
+        future.set_result(FleetResult((name, results[name]) for name in names if name in results))
@@ -0,0 +1,383 @@
+# coding=utf8
+'''''
+Frames from the VideoSDK HTTP server.
+
+FrameGrabber polls the frames endpoint of one peer (the self view by default)
+over a keep-alive requests.Session. The newest complete frame is published by
+swapping double buffers, so readers get it without copying, and frames which
+did not change are skipped.
+
+For the self view the rate follows setBroadcastSelfie: the grabber polls
+only while the broadcast is enabled, at its fps. MultiFrameFetcher does the
+same for many peers at once.
+
+Example::
+
+    room.methods.setBroadcastSelfie(True, 5)
+    grabber = pyVideoSDK.frames.FrameGrabber(room)
+    grabber.start()
+    frame = grabber.wait(timeout = 2)
+    open("self.jpg", "wb").write(frame.data)
+'''
+import logging
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from threading import Condition, Event, Lock, Thread
+
+import requests
+import requests.adapters
+
+SELF_VIEW_PEER_ID = "#self:0"
+HTTP_TIMEOUT = 2
+# Wait between checks while there is nothing to poll, seconds
+IDLE_INTERVAL = 0.5
+
+logger = logging.getLogger('videosdk')
+
+
+def _notify(listeners: list, frame):
+    """Call every listener with the frame; a failing one is logged and does not stop the others or the thread"""
+    for function in listeners:
+        try:
+            function(frame)
+        except Exception:
+            logger.exception('Frame listener %r failed', function)
+
+
+def frame_url(videosdk, peerId: str = SELF_VIEW_PEER_ID) -> str:
+    """URL of the newest frame of the peer (TrueConf ID, callId or "#self:0")"""
+    return videosdk.getFrameURL(peerId)
+
+
+class Frame:
+    """Encoded frame (JPEG) as the HTTP server returned it"""
+
+    __slots__ = ("peerId", "seq", "data", "content_type", "timestamp", "crc")
+
+    def __init__(self, peerId: str, seq: int, data: bytes, content_type: str, timestamp: float, crc: int):
+        self.peerId = peerId
+        self.seq = seq
+        self.data = data
+        self.content_type = content_type
+        self.timestamp = timestamp
+        self.crc = crc
+
+    def __repr__(self):
+        return f'Frame({self.peerId!r}, seq={self.seq}, {len(self.data)} bytes)'
+
+
+class FrameBuffer:
+    """
+    Double buffer of the newest frame: the writer fills the back slot and
+    swaps, a reader takes the front slot. Waiters are woken on each new frame.
+    """
+
+    def __init__(self):
+        self.__slots = [None, None]
+        self.__front = 0
+        self.__changed = Condition()
+
+    def latest(self) -> Frame:
+        return self.__slots[self.__front]
+
+    def publish(self, frame: Frame):
+        back = 1 - self.__front
+        self.__slots[back] = frame
+        with self.__changed:
+            self.__front = back
+            self.__changed.notify_all()
+
+    def wait(self, after_seq: int = 0, timeout: float = None) -> Frame:
+        """Frame newer than `after_seq` or None on timeout"""
+        frame = self.latest()
+        if frame is not None and frame.seq > after_seq:
+            return frame
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.__changed:
+            while True:
+                frame = self.latest()
+                if frame is not None and frame.seq > after_seq:
+                    return frame
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self.__changed.wait(remaining)
+
+
+class PeerFeed:
+    """Frames of one peer: the buffer, the conditional request state and the counters"""
+
+    def __init__(self, peerId: str):
+        self.peerId = peerId
+        self.buffer = FrameBuffer()
+        self.frames = 0       # new frames
+        self.unchanged = 0    # polls which returned the same frame
+        self.errors = 0
+        self.etag = None
+
+    def poll(self, session: requests.Session, url: str, timeout: float = HTTP_TIMEOUT) -> Frame:
+        """Fetch the frame once. Returns the new frame or None (unchanged or error)"""
+        headers = {"If-None-Match": self.etag} if self.etag else None
+        try:
+            response = session.get(url, headers=headers, timeout=timeout)
+        except requests.RequestException:
+            self.errors += 1
+            return None
+        if response.status_code == 304:
+            self.unchanged += 1
+            return None
+        if response.status_code != 200 or not response.content:
+            self.errors += 1
+            return None
+
+        self.etag = response.headers.get("ETag")
+        data = response.content
+        crc = zlib.crc32(data)
+        latest = self.buffer.latest()
+        if latest is not None and latest.crc == crc and latest.data == data:
+            self.unchanged += 1
+            return None
+
+        self.frames += 1
+        frame = Frame(self.peerId, (latest.seq if latest else 0) + 1, data,
+                      response.headers.get("Content-Type", "image/jpeg"), time.time(), crc)
+        self.buffer.publish(frame)
+
+        return frame
+
+
+class FrameGrabber:
+    def __init__(self, videosdk, peerId: str = SELF_VIEW_PEER_ID, fps: float = None,
+                 session: requests.Session = None, timeout: float = HTTP_TIMEOUT):
+        """
+        fps - polling rate. None for the self view: follow setBroadcastSelfie
+        session - shared requests.Session (keep-alive connection pool)
+        """
+        self.videosdk = videosdk
+        self.peerId = peerId
+        self.fps = fps
+        self.follow_broadcast = fps is None and peerId == SELF_VIEW_PEER_ID
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.feed = PeerFeed(peerId)
+        self.buffer = self.feed.buffer
+        self.__listeners = []
+        self.__stop = Event()
+        self.__wake = Event()
+        self.__thread = None
+        self.__subscriptions = []
+
+    def add_listener(self, function: object):
+        """function(frame: Frame) is called by the grabber thread for every new frame"""
+        self.__listeners.append(function)
+
+    def latest(self) -> Frame:
+        return self.buffer.latest()
+
+    def wait(self, after_seq: int = 0, timeout: float = None) -> Frame:
+        return self.buffer.wait(after_seq, timeout)
+
+    def start(self):
+        if self.follow_broadcast:
+            add = self.videosdk.add_handler
+            self.__subscriptions = [
+                add({"event": "broadcastSelfieChanged", "enabled": None}, self.__on_broadcast),
+                add({"method": "getBroadcastSelfie", "enabled": None}, self.__on_broadcast),
+            ]
+            # A cache hit does not call the handlers
+            self.videosdk.command({"method": "getBroadcastSelfie"}).add_done_callback(self.__on_broadcast_answered)
+        self.__stop.clear()
+        self.__thread = Thread(target=self.__run, name=f'FrameGrabber {self.peerId}', daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        for subscription in self.__subscriptions:
+            subscription.cancel()
+        self.__subscriptions = []
+        self.__stop.set()
+        self.__wake.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+    def __on_broadcast(self, response: dict):
+        self.fps = response.get("fps") if response.get("enabled") else 0
+        self.__wake.set()
+
+    def __on_broadcast_answered(self, future):
+        if not future.cancelled() and future.exception() is None and "enabled" in future.result():
+            self.__on_broadcast(future.result())
+
+    def __run(self):
+        while not self.__stop.is_set():
+            fps = self.fps
+            if not fps or not self.videosdk.isReady():
+                self.__wake.wait(IDLE_INTERVAL)
+                self.__wake.clear()
+                continue
+
+            started = time.monotonic()
+            self.poll()
+            self.__stop.wait(max(1 / fps - (time.monotonic() - started), 0))
+
+    def poll(self) -> Frame:
+        """Fetch the frame once. Returns the new frame or None (unchanged or error)"""
+        frame = self.feed.poll(self.session, frame_url(self.videosdk, self.peerId), self.timeout)
+        if frame is not None:
+            _notify(self.__listeners, frame)
+
+        return frame
+
+
+class MultiFrameFetcher:
+    """
+    Frames of many peers (the conference roster by default) fetched concurrently
+    by a bounded pool of workers over one keep-alive session.
+
+    Every peer is polled at most `fps` times per second. When a peer is due while
+    its previous request is still in flight, the new request is not issued
+    (counted in `dropped`): there is never more than one request per peer.
+
+    Example::
+
+        wall = pyVideoSDK.frames.MultiFrameFetcher(room, fps = 2, max_workers = 16)
+        wall.start()
+        for peerId, frame in wall.snapshot().items():
+            ...
+    """
+
+    def __init__(self, videosdk, peers: list = None, fps: float = 1, max_workers: int = 8,
+                 timeout: float = HTTP_TIMEOUT):
+        """peers - peerIds or callIds; None - follow VideoSDK.roster"""
+        self.videosdk = videosdk
+        self.fps = fps
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.follow_roster = peers is None
+        self.session = pooled_session(max_workers)
+        self.dropped = 0
+        self.lock = Lock()
+        self.__feeds = {}     # peerId: PeerFeed
+        self.__due = {}       # peerId: monotonic time of the next poll
+        self.__in_flight = set()
+        self.__listeners = []
+        self.__executor = None
+        self.__stop = Event()
+        self.__wake = Event()
+        self.__thread = None
+        for peer_id in peers or ():
+            self.add_peer(peer_id)
+
+    def add_listener(self, function: object):
+        """function(frame: Frame) is called by a worker thread for every new frame"""
+        self.__listeners.append(function)
+
+    def add_peer(self, peerId: str):
+        with self.lock:
+            if peerId not in self.__feeds:
+                self.__feeds[peerId] = PeerFeed(peerId)
+                self.__due[peerId] = 0
+        self.__wake.set()
+
+    def remove_peer(self, peerId: str):
+        with self.lock:
+            self.__feeds.pop(peerId, None)
+            self.__due.pop(peerId, None)
+
+    def peers(self) -> list:
+        return list(self.__feeds)
+
+    def feed(self, peerId: str) -> PeerFeed:
+        return self.__feeds.get(peerId)
+
+    def latest(self, peerId: str) -> Frame:
+        feed = self.__feeds.get(peerId)
+        return feed.buffer.latest() if feed else None
+
+    def snapshot(self) -> dict:
+        """{peerId: newest Frame} of all the peers with a frame"""
+        frames = {}
+        for peer_id, feed in list(self.__feeds.items()):
+            frame = feed.buffer.latest()
+            if frame is not None:
+                frames[peer_id] = frame
+        return frames
+
+    def __on_roster(self, change: str, participant: dict):
+        if change == "joined":
+            self.add_peer(participant["peerId"])
+        elif change == "left":
+            self.remove_peer(participant["peerId"])
+        elif change in ("loaded", "cleared"):
+            current = set(self.videosdk.roster.peer_ids())
+            for peer_id in self.peers():
+                if peer_id not in current:
+                    self.remove_peer(peer_id)
+            for peer_id in current:
+                self.add_peer(peer_id)
+
+    def start(self):
+        if self.follow_roster:
+            self.videosdk.roster.add_listener(self.__on_roster)
+            self.__on_roster("loaded", None)
+        self.__executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="MultiFrameFetcher")
+        self.__stop.clear()
+        self.__thread = Thread(target=self.__run, name="MultiFrameFetcher", daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        if self.follow_roster:
+            self.videosdk.roster.remove_listener(self.__on_roster)
+        self.__stop.set()
+        self.__wake.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=True)
+            self.__executor = None
+
+    def __run(self):
+        while not self.__stop.is_set():
+            if not self.fps or not self.videosdk.isReady():
+                self.__wake.wait(IDLE_INTERVAL)
+                self.__wake.clear()
+                continue
+
+            now = time.monotonic()
+            interval = 1 / self.fps
+            next_due = now + interval
+            with self.lock:
+                for peer_id, due in self.__due.items():
+                    if due > now:
+                        next_due = min(next_due, due)
+                        continue
+                    self.__due[peer_id] = now + interval
+                    next_due = min(next_due, now + interval)
+                    if peer_id in self.__in_flight:
+                        self.dropped += 1
+                        continue
+                    self.__in_flight.add(peer_id)
+                    self.__executor.submit(self.__poll, self.__feeds[peer_id])
+
+            self.__wake.wait(max(next_due - time.monotonic(), 0))
+            self.__wake.clear()
+
+    def __poll(self, feed: PeerFeed):
+        try:
+            frame = feed.poll(self.session, frame_url(self.videosdk, feed.peerId), self.timeout)
+        finally:
+            with self.lock:
+                self.__in_flight.discard(feed.peerId)
+        if frame is not None:
+            _notify(self.__listeners, frame)
+
+
+def pooled_session(pool_size: int) -> requests.Session:
+    """requests.Session keeping up to `pool_size` connections to the HTTP server alive"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
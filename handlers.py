@@ -0,0 +1,104 @@
+# coding=utf8
+'''''
+Registry of the API handlers.
+
+Registration and removal are O(1) and take a lock; the dispatching thread
+works on an immutable snapshot (tuple) of the handlers and never locks.
+The snapshot is rebuilt on the first dispatch after a change.
+'''
+from threading import Lock
+from pyVideoSDK.filters import compile_filter
+
+
+class Subscription:
+    """
+    Handle of a registered handler, returned by VideoSDK.add_handler()
+
+    Example::
+
+        sub = room.add_handler({"event": "incomingChatMessage"}, on_message)
+        ...
+        sub.cancel()
+    """
+
+    __slots__ = ("filter", "function", "predicate", "active", "_registry")
+
+    def __init__(self, registry, filter: dict, function: object):
+        self.filter = filter
+        self.function = function
+        self.predicate = compile_filter(filter)
+        self.active = True
+        self._registry = registry
+
+    def __repr__(self):
+        return f'Subscription({self.filter!r}, {self.function!r}, active={self.active})'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.cancel()
+
+    def cancel(self):
+        """Unregister the handler. It is not called after cancel() returns (except a call already in progress)"""
+        self._registry.remove(self)
+
+
+class HandlerRegistry:
+    def __init__(self):
+        self.lock = Lock()
+        # Ordered sets: {Subscription: None} and {function: {Subscription: None}}
+        self.__subscriptions = {}
+        self.__by_function = {}
+        self.__version = 0
+        self.__snapshot = (0, ())
+
+    def __len__(self):
+        return len(self.__subscriptions)
+
+    def add(self, filter: dict, function: object) -> Subscription:
+        subscription = Subscription(self, filter, function)
+        with self.lock:
+            self.__subscriptions[subscription] = None
+            self.__by_function.setdefault(function, {})[subscription] = None
+            self.__version += 1
+
+        return subscription
+
+    def remove(self, subscription: Subscription):
+        with self.lock:
+            subscription.active = False
+            if self.__subscriptions.pop(subscription, False) is None:
+                same_function = self.__by_function.get(subscription.function)
+                if same_function is not None:
+                    same_function.pop(subscription, None)
+                    if not same_function:
+                        del self.__by_function[subscription.function]
+                self.__version += 1
+
+    def remove_function(self, function: object):
+        """Unregister all the subscriptions of the function"""
+        with self.lock:
+            subscriptions = self.__by_function.pop(function, {})
+            for subscription in subscriptions:
+                subscription.active = False
+                del self.__subscriptions[subscription]
+            if subscriptions:
+                self.__version += 1
+
+    def snapshot(self) -> tuple:
+        """Current handlers in the registration order. Lock-free"""
+        # The version is read before the copy: a concurrent change always
+        # leaves a newer version behind and the next call rebuilds the snapshot
+        version = self.__version
+        snapshot = self.__snapshot
+        if snapshot[0] != version:
+            snapshot = (version, tuple(self.__subscriptions.copy()))
+            self.__snapshot = snapshot
+
+        return snapshot[1]
+
+    def dispatch(self, response: dict):
+        for subscription in self.snapshot():
+            if subscription.active and subscription.predicate(response):
+                subscription.function(response)
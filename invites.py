@@ -0,0 +1,242 @@
+# coding=utf8
+'''''
+Bulk invitations to the current conference.
+
+The invitations are sent in batches (VideoSDK.commands) keeping at most
+`concurrency` of them unanswered. The outcome of each one is taken from the
+events: inviteSent (ringing), newParticipantInConference (joined) and
+rejectReceived (rejected, with the cause from consts.CAUSE). An invitation
+without an outcome within `timeout` seconds is counted as timed out.
+
+Example::
+
+    invite = pyVideoSDK.invites.invite_all(room, peer_ids, concurrency = 50)
+    report = invite.future.result()
+    print(report.summary())
+    if report.failed():
+        report = invite.retry_failed().result()
+'''
+import time
+from concurrent.futures import Future
+from threading import Condition, Thread
+
+from pyVideoSDK.consts import CAUSE
+from pyVideoSDK.roster import peer_key
+
+DEFAULT_CONCURRENCY = 20
+# Seconds to wait for the peer to join or reject
+INVITE_TIMEOUT = 60
+
+# Invitation statuses
+QUEUED, SENT, RINGING, JOINED, REJECTED, FAILED, TIMEOUT = \
+    "queued", "sent", "ringing", "joined", "rejected", "failed", "timeout"
+FINAL_STATUSES = (JOINED, REJECTED, FAILED, TIMEOUT)
+RETRY_STATUSES = (REJECTED, FAILED, TIMEOUT)
+
+
+class Invitation:
+    __slots__ = ("peerId", "status", "cause", "reason", "sent", "ringing", "answered", "attempts")
+
+    def __init__(self, peerId: str):
+        self.peerId = peerId
+        self.status = QUEUED
+        self.cause = None     # rejectReceived "cause"
+        self.reason = None    # its text, or the error
+        self.sent = None      # monotonic times
+        self.ringing = None
+        self.answered = None
+        self.attempts = 0
+
+    @property
+    def latency(self) -> float:
+        """Seconds from sending to the answer (joined or rejected), None if there is none"""
+        if self.sent is None or self.answered is None:
+            return None
+        return self.answered - self.sent
+
+    def __repr__(self):
+        return f'Invitation({self.peerId!r}, {self.status})'
+
+
+class InviteReport:
+    """Outcome of the invitations: {peerId: Invitation}"""
+
+    def __init__(self, invitations: dict, elapsed: float):
+        self.invitations = invitations
+        self.elapsed = elapsed
+
+    def __getitem__(self, peerId: str) -> Invitation:
+        return self.invitations[peerId]
+
+    def __iter__(self):
+        return iter(self.invitations.values())
+
+    def by_status(self, status: str) -> list:
+        return [i for i in self if i.status == status]
+
+    def failed(self) -> list:
+        """Invitations worth retrying: rejected, failed and timed out"""
+        return [i for i in self if i.status in RETRY_STATUSES]
+
+    def latencies(self) -> dict:
+        return {i.peerId: i.latency for i in self if i.latency is not None}
+
+    def summary(self) -> dict:
+        counts = {}
+        for invitation in self:
+            counts[invitation.status] = counts.get(invitation.status, 0) + 1
+        latencies = sorted(self.latencies().values())
+        summary = {"total": len(self.invitations), "elapsed": round(self.elapsed, 3), **counts}
+        if latencies:
+            summary["latency_median"] = round(latencies[len(latencies) // 2], 3)
+            summary["latency_max"] = round(latencies[-1], 3)
+        return summary
+
+
+class BulkInvite:
+    def __init__(self, videosdk, peers: list, concurrency: int = DEFAULT_CONCURRENCY, timeout: float = INVITE_TIMEOUT):
+        self.videosdk = videosdk
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.invitations = {}  # peerId: Invitation, in the order of `peers`
+        for peer_id in peers:
+            self.invitations.setdefault(peer_id, Invitation(peer_id))
+        self.future = None
+        self.__by_key = {peer_key(peer_id): invitation for peer_id, invitation in self.invitations.items()}
+        self.__changed = Condition()
+        self.__subscriptions = []
+        self.__listeners = []
+
+    def add_listener(self, function: object):
+        """function(invitation: Invitation) is called on every status change"""
+        self.__listeners.append(function)
+
+    def start(self, invitations: list = None) -> Future:
+        """Send the invitations (all the queued ones by default). Returns a Future with the InviteReport"""
+        if self.future is not None and not self.future.done():
+            raise RuntimeError('The invitations are being sent')
+        for invitation in invitations or ():
+            invitation.status = QUEUED
+            invitation.cause = invitation.reason = invitation.sent = invitation.ringing = invitation.answered = None
+        targets = invitations if invitations is not None else [i for i in self.invitations.values() if i.status == QUEUED]
+
+        add = self.videosdk.add_handler
+        self.__subscriptions = [
+            add({"event": "inviteSent", "peerId": None}, self.__on_ringing),
+            add({"event": "newParticipantInConference", "peerId": None}, self.__on_joined),
+            add({"event": "rejectReceived", "peerId": None}, self.__on_rejected),
+        ]
+        self.future = Future()
+        Thread(target=self.__run, args=(targets,), name="BulkInvite", daemon=True).start()
+        return self.future
+
+    def retry_failed(self) -> Future:
+        """Send again only the rejected, failed and timed out invitations"""
+        return self.start([i for i in self.invitations.values() if i.status in RETRY_STATUSES])
+
+    def report(self, elapsed: float = 0) -> InviteReport:
+        return InviteReport(dict(self.invitations), elapsed)
+
+    # =======================================
+    def __run(self, targets: list):
+        started = time.monotonic()
+        queue = list(targets)
+        waiting = []
+        try:
+            while True:
+                batch = None
+                with self.__changed:
+                    now = time.monotonic()
+                    for invitation in waiting:
+                        if invitation.status not in FINAL_STATUSES and now - invitation.sent >= self.timeout:
+                            self.__set_status(invitation, TIMEOUT, reason=f'No answer within {self.timeout} s')
+                    waiting = [i for i in waiting if i.status not in FINAL_STATUSES]
+                    if not queue and not waiting:
+                        break
+
+                    free = self.concurrency - len(waiting)
+                    if queue and free > 0:
+                        batch, queue = queue[:free], queue[free:]
+                        self.__mark_sent(batch)
+                        waiting.extend(batch)
+                    else:
+                        next_timeout = min(i.sent for i in waiting) + self.timeout - now
+                        self.__changed.wait(max(next_timeout, 0))
+                if batch:
+                    # Outside the condition: commands() takes VideoSDK.lock, never nested in it
+                    self.__send(batch)
+        finally:
+            for subscription in self.__subscriptions:
+                subscription.cancel()
+            self.__subscriptions = []
+        self.future.set_result(self.report(time.monotonic() - started))
+
+    @staticmethod
+    def __mark_sent(batch: list):
+        now = time.monotonic()
+        for invitation in batch:
+            invitation.status = SENT
+            invitation.sent = now
+            invitation.attempts += 1
+
+    def __send(self, batch: list):
+        futures = self.videosdk.commands([{"method": "inviteToConference", "peerId": i.peerId} for i in batch])
+        for invitation, future in zip(batch, futures):
+            future.add_done_callback(lambda f, invitation=invitation: self.__on_response(invitation, f))
+
+    def __set_status(self, invitation: Invitation, status: str, cause: int = None, reason: str = None):
+        """Called with self.__changed held"""
+        invitation.status = status
+        invitation.cause = cause
+        invitation.reason = reason
+        if status in (JOINED, REJECTED):
+            invitation.answered = time.monotonic()
+        self.__changed.notify_all()
+        for function in self.__listeners:
+            function(invitation)
+
+    def __find(self, response: dict) -> Invitation:
+        invitation = self.__by_key.get(peer_key(str(response["peerId"])))
+        if invitation is None or invitation.status in (QUEUED,) + FINAL_STATUSES:
+            return None
+        return invitation
+
+    def __on_response(self, invitation: Invitation, future: Future):
+        if future.cancelled():
+            error = "Cancelled"
+        elif future.exception() is not None:
+            error = str(future.exception())
+        elif future.result().get("result") is False:
+            error = future.result().get("error") or "inviteToConference failed"
+        else:
+            return
+        with self.__changed:
+            if invitation.status not in FINAL_STATUSES:
+                self.__set_status(invitation, FAILED, reason=error)
+
+    def __on_ringing(self, response: dict):
+        with self.__changed:
+            invitation = self.__find(response)
+            if invitation is not None and invitation.status == SENT:
+                invitation.ringing = time.monotonic()
+                self.__set_status(invitation, RINGING)
+
+    def __on_joined(self, response: dict):
+        with self.__changed:
+            invitation = self.__find(response)
+            if invitation is not None:
+                self.__set_status(invitation, JOINED)
+
+    def __on_rejected(self, response: dict):
+        with self.__changed:
+            invitation = self.__find(response)
+            if invitation is not None:
+                cause = response.get("cause")
+                self.__set_status(invitation, REJECTED, cause, CAUSE.get(cause, f'Cause {cause}'))
+
+
+def invite_all(videosdk, peers: list, concurrency: int = DEFAULT_CONCURRENCY, timeout: float = INVITE_TIMEOUT) -> BulkInvite:
+    """Invite the peers to the current conference. See BulkInvite"""
+    invite = BulkInvite(videosdk, peers, concurrency, timeout)
+    invite.start()
+    return invite
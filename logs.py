@@ -0,0 +1,170 @@
+# coding=utf8
+'''''
+Non-blocking logging for pyVideoSDK.
+
+Nothing is attached to the 'videosdk' logger until the application opts in with
+enable_logging(). Records are put on an in-process queue by the calling thread
+(websocket, command queue) and are formatted and written to disk by a
+QueueListener thread.
+'''
+import atexit
+import itertools
+import logging
+import queue
+from logging import Formatter
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOGGER_NAME = 'videosdk'
+LOG_FORMAT = "%(asctime)-15s [%(levelname)s] %(funcName)s: %(message)s"
+LOG_FILE = 'videosdk.log'
+LOG_MAX_BYTES = 1024 ** 2 * 10  # 10 MB
+LOG_BACKUP_COUNT = 3
+# Only every N-th websocket frame dump is kept in debug mode
+WEBSOCKET_TRACE_SAMPLE_RATE = 50
+
+logger = logging.getLogger(LOGGER_NAME)
+
+_queue = None
+_queue_handler = None
+_listener = None
+_websocket_traced = False
+_trace_handler = None
+_exit_hook = False
+# Arguments a later formatting gives the same text for
+FROZEN_ARG_TYPES = (str, bytes, int, float, bool, type(None))
+
+
+class SamplingFilter(logging.Filter):
+    """Pass every `rate`-th DEBUG record. Records above DEBUG always pass"""
+
+    def __init__(self, rate: int = 1):
+        super().__init__()
+        self.rate = max(int(rate), 1)
+        self._counter = itertools.count()
+
+    def filter(self, record) -> bool:
+        if record.levelno > logging.DEBUG or self.rate == 1:
+            return True
+        return next(self._counter) % self.rate == 0
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves the record untouched: message formatting is
+    done by the listener thread, not by the thread that logged it.
+    The queue never leaves the process, so the record does not need to be pickled.
+    Only a record with mutable arguments (a filter, a response, ...) is
+    formatted at once, so that the log shows them as they were.
+    """
+
+    def prepare(self, record):
+        args = record.args
+        if args:
+            values = args.values() if isinstance(args, dict) else args
+            if not all(isinstance(value, FROZEN_ARG_TYPES) for value in values):
+                record.msg = record.getMessage()
+                record.args = None
+        return record
+
+
+def _start(handlers: list, debug_sample_rate: int = 1) -> LazyQueueHandler:
+    global _queue, _queue_handler, _listener
+
+    _stop()
+
+    # The queue outlives restarts of the listener: the websocket trace handler keeps writing to it
+    if _queue is None:
+        _queue = queue.SimpleQueue()
+    _queue_handler = LazyQueueHandler(_queue)
+    _queue_handler.addFilter(SamplingFilter(debug_sample_rate))
+    _listener = QueueListener(_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    logger.addHandler(_queue_handler)
+
+    return _queue_handler
+
+
+def enable_logging(filename: str = LOG_FILE, level: int = logging.DEBUG, console: bool = False,
+                   debug_sample_rate: int = 1, max_bytes: int = LOG_MAX_BYTES,
+                   backup_count: int = LOG_BACKUP_COUNT) -> QueueListener:
+    """
+    Opt in to the SDK log
+
+    Parameters:
+
+        filename: str
+            Rotating log file. None - do not write a file
+        level: int
+            Level of the 'videosdk' logger
+        console: bool
+            Also write the log to the console
+        debug_sample_rate: int
+            Keep only every N-th DEBUG record
+
+    Example::
+
+        pyVideoSDK.enable_logging('videosdk.log', level = logging.INFO)
+    """
+    global _exit_hook
+
+    formatter = Formatter(LOG_FORMAT)
+    handlers = []
+    if filename:
+        handlers.append(RotatingFileHandler(filename=filename, maxBytes=max_bytes, backupCount=backup_count))
+    if console:
+        handlers.append(logging.StreamHandler())
+    for h in handlers:
+        h.setFormatter(formatter)
+
+    _start(handlers, debug_sample_rate)
+    logger.setLevel(level)
+    if not _exit_hook:
+        atexit.register(disable_logging)
+        _exit_hook = True
+
+    return _listener
+
+
+def disable_logging():
+    """Flush the pending records and detach the SDK log and the websocket trace"""
+    global _trace_handler, _websocket_traced
+
+    if _trace_handler is not None:
+        logging.getLogger('websocket').removeHandler(_trace_handler)
+        _trace_handler = None
+        _websocket_traced = False
+    _stop()
+
+
+def _stop():
+    global _queue_handler, _listener
+
+    if _listener is not None:
+        _listener.stop()
+        for h in _listener.handlers:
+            h.close()
+        _listener = None
+    if _queue_handler is not None:
+        logger.removeHandler(_queue_handler)
+        _queue_handler = None
+
+
+def trace_websocket(enabled: bool, sample_rate: int = WEBSOCKET_TRACE_SAMPLE_RATE):
+    """
+    Dump websocket frames (debug mode) through the same queue.
+    If the application did not call enable_logging() the frames go to the console.
+    """
+    global _websocket_traced, _trace_handler
+
+    if not enabled or _websocket_traced:
+        return
+
+    import websocket
+
+    if _queue_handler is None:
+        enable_logging(filename=None, console=True)
+
+    _trace_handler = LazyQueueHandler(_queue)
+    _trace_handler.addFilter(SamplingFilter(sample_rate))
+    websocket.enableTrace(True, handler=_trace_handler)
+    _websocket_traced = True
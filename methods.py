@@ -1,6 +1,11 @@
 ﻿# from pyVideoSDK import VideoSDK
 
 class Methods:
+    '''
+    VideoSDK API methods. Every method returns a concurrent.futures.Future
+    with the response to the command, see VideoSDK.command()
+    '''
+
     def __init__(self, videosdk):
         self.videosdk = videosdk
 
@@ -16,7 +21,7 @@ class Methods:
             A unique user ID (TrueConfID)
         """
         command = {"method": "call", "peerId": peerId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def accept(self):
         """Accept the call. The command is run immediately and the result of execution is received at once.
@@ -27,7 +32,7 @@ class Methods:
 
         """
         command = {"method": "accept"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def hangUp(self, forAll: bool = False):
         """End a call or a conference. The command is used when the conference has already been created. 
@@ -45,7 +50,7 @@ class Methods:
                 False - you leave the conference, but other participants remain in the conference.
         """
         command = {"method": "hangUp", "forAll": forAll}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def login(self, callId: str, password: str):
         """Login to TrueConf Server"""
@@ -53,12 +58,12 @@ class Methods:
             "login" : callId,
             "password" : password,
             "encryptPassword" : True}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def logout(self):
         """Log out the current user"""
         command = {"method": "logout"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def connectToServer(self, server: str, port: int = 4307):
         """Connect to TrueConf Server
@@ -71,11 +76,11 @@ class Methods:
                 Port. Default port is 4307.
         """
         command = {"method": "connectToServer", "server": server, "port": port}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def sendCommand(self, peerId: str, command: str):
         command = {"method": "sendCommand", "peerId": peerId, "command": command}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def showMainWindow(self, maximized: bool, stayOnTop: bool = True):
         # state:
@@ -83,14 +88,14 @@ class Methods:
         #   2 = full screen mode.        
         state = 1 if not maximized else 2
         command = {"method": "changeWindowState", "windowState": state, "stayOnTop": stayOnTop}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def reject(self):
         '''
         The command allows to reject incoming call or invitation to the conference
         '''
         command = {"method": "reject"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def rejectPeer(self, peerId: str):
         '''
@@ -102,7 +107,7 @@ class Methods:
                 unique user ID
         '''
         command = {"method": "rejectPeer", "peerId": peerId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def acceptPeer(self, peerId: str):
         '''
@@ -114,7 +119,7 @@ class Methods:
                 unique user ID
         '''
         command = {"method": "acceptPeer", "peerId": peerId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def createConference(self, title: str, confType: str, autoAccept: bool, inviteList: list = None):
         '''
@@ -147,14 +152,14 @@ class Methods:
         else:
             command = {"method": "createConference", "title": title, "confType": confType, "autoAccept": autoAccept}
 
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getHardware(self):
         '''
         Requesting the list of hardware.
         '''
         command = {"method" : "getHardware"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def acceptFile(self, id: int):
         '''
@@ -166,14 +171,14 @@ class Methods:
                 request ID
         '''
         command = {"method": "acceptFile", "id": id}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def acceptInvitationToPodium(self):
         '''
         Accept an incoming request to the podium
         '''
         command = {"method": "acceptInvitationToPodium"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def acceptRequestCameraControl(self, callId: str):
         '''
@@ -185,7 +190,7 @@ class Methods:
                 User ID (TrueConf ID)
         '''
         command = {"method": "acceptRequestCameraControl", "callId": callId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def acceptRequestToPodium(self, peerId: str):
         '''
@@ -197,7 +202,7 @@ class Methods:
                 User ID (TrueConf ID)
         '''
         command = {"method": "acceptRequestToPodium", "peerId": peerId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def activateLicense(self, key: str):
         '''
@@ -212,7 +217,7 @@ class Methods:
             sdk.activateLicense("G3K3-E929-837P-BHNQ-GKAV-GSLH-T5YU-3TJ8-ECWD-YBRV-J7A2")
         '''
         command = {"method": "activateLicense", "key": key}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def addSlide(self, fileId: int):
         '''
@@ -225,7 +230,7 @@ class Methods:
                 File ID in http-server
         '''
         command = {"method": "addSlide", "fileId": fileId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def addToAbook(self, peerId: str, peerDn: str):
         '''
@@ -240,7 +245,7 @@ class Methods:
                 Display name
         '''
         command = {"method": "addToAbook", "peerId" : peerId, "peerDn": peerDn}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def addToGroup(self, groupId: int, peerId: str):
         '''
@@ -255,7 +260,7 @@ class Methods:
                 User ID (TrueConf ID)
         '''
         command = {"method": "addToGroup", "groupId": groupId, "peerId": peerId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def allowRecord(self, peerId: str):
         '''
@@ -267,7 +272,7 @@ class Methods:
                 User ID (TrueConf ID)
         '''
         command = {"method": "allowRecord", "peerId": peerId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def block(self, peerId: str):
         '''
@@ -279,7 +284,7 @@ class Methods:
                 User ID (TrueConf ID)
         '''
         command = {"method": "block", "peerId": peerId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def changeCurrentMonitor(self, monitorIndex: int):
         '''
@@ -291,14 +296,14 @@ class Methods:
                 The specified monitor's index
         '''
         command = {"method": "changeCurrentMonitor", "monitorIndex": monitorIndex}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def changeVideoMatrixType(self, matrixType: int):
         '''
         Change the current matrix (layout) type.
         '''
         command = {"method": "changeVideoMatrixType", "matrixType": matrixType}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def changeWindowState(self, windowState: int, stayOnTop: bool):
         '''
@@ -313,7 +318,7 @@ class Methods:
 
         '''
         command = {"method": "changeWindowState", "windowState": windowState, "stayOnTop": stayOnTop}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def chatClear(self, id: str):
         '''
@@ -325,42 +330,42 @@ class Methods:
                 User ID (TrueConf ID)
         '''
         command = {"method": "chatClear", "id": id}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def clearCallHistory(self):
         '''
         Clear call history
         '''
         command = {"method": "clearCallHistory"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def clearFileTransfer(self):
         '''
         Clear file sharing history and delete files
         '''
         command = {"method": "clearFileTransfer"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def clearTokens(self):
         '''
         Clear all tokens
         '''
         command = {"method": "clearTokens"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def connectToService(self):
         '''
         Connect to trueconf.com service
         '''
         command = {"method": "connectToService"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def createGroup(self, name: str):
         '''
         Create a users group in address book
         '''
         command = {"method": "createGroup", "name": name}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def createNDIDevice(self, deviceId: str):
         '''
@@ -376,7 +381,7 @@ class Methods:
             sdk.createNDIDevice("user1@some.server")
         '''
         command = {"method": "createNDIDevice", "deviceId": deviceId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def deleteData(self, containerName: str):
         '''
@@ -388,7 +393,7 @@ class Methods:
                 Container name
         '''
         command = {"method": "deleteData", "containerName": containerName}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def deleteFileTransferFile(self, fileId: int):
         '''
@@ -400,7 +405,7 @@ class Methods:
                 File ID
         '''
         command = {"method": "deleteFileTransferFile", "fileId": fileId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def deleteNDIDevice(self, deviceId: str):
         '''
@@ -416,7 +421,7 @@ class Methods:
             sdk.deleteNDIDevice("user1@some.server")
         '''
         command = {"method": "deleteNDIDevice", "deviceId": deviceId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def denyRecord(self, peerId: str):
         '''
@@ -428,7 +433,7 @@ class Methods:
                 User ID (TrueConf ID)
         '''
         command = {"method": "denyRecord", "peerId": peerId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def enableAudioReceiving(self, peerId: str, enable: bool):
         '''
@@ -442,7 +447,7 @@ class Methods:
             enable: bool
         '''
         command = {"method": "enableAudioReceiving", "peerId": peerId, "enable": enable}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def enableVideoReceiving(self, peerId: str, enable: bool):
         '''
@@ -461,7 +466,7 @@ class Methods:
             sdk.enableVideoReceiving("user1@some.server", False)
         '''
         command = {"method": "enableVideoReceiving", "peerId": peerId, "enable": enable}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def expandCallToMulti(self, title: str, inviteList: list):
         '''
@@ -480,7 +485,7 @@ class Methods:
             sdk.expandCallToMulti(title="New group conference", inviteList=["user1@some.server", "user2@some.server", "user3@some.server"])
         '''
         command = {"method": "expandCallToMulti", "title": title, "inviteList": inviteList}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def fireMyEvent(self, data: str):
         '''
@@ -496,49 +501,49 @@ class Methods:
              sdk.fireMyEvent("power off")
         '''
         command = {"method": "fireMyEvent", "data": data}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getAbook(self):
         '''
         Request the address book
         '''
         command = {"method": "getAbook"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getAllUserContainersNames(self):
         '''
         Request names of all data containers
         '''
         command = {"method": "getAllUserContainersNames"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getAppSndDev(self):
         '''
         Request information about the current sound playback device
         '''
         command = {"method": "getAppSndDev"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getAppState(self):
         '''
         Request the application state
         '''
         command = {"method": "getAppState"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getAudioDelayDetectorInfo(self):
         '''
         Get an echo test information
         '''
         command = {"method": "getAudioDelayDetectorInfo"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getAudioMute(self):
         '''
         Get audio state
         '''
         command = {"method": "getAudioMute"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getAudioReceivingLevel(self, peerId: str):
         '''
@@ -550,43 +555,43 @@ class Methods:
                 User ID (TrueConf ID)
         '''
         command = {"method": "getAudioReceivingLevel", "peerId": peerId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getAuthInfo(self):
         '''
         Get information about the type of protection for the administrator and user accounts
         '''
         command = {"method": "getAuthInfo"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getAvailableServersList(self):
         command = {"method": "getAvailableServersList"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getBackground(self):
         command = {"method": "getBackground"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getBanList(self):
         '''
         Get the list of blocked users
         '''
         command = {"method": "getBanList"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getBroadcastPicture(self):
         '''
         Get the name of the file containing the picture that can be broadcasted instead of your own video
         '''
         command = {"method": "getBroadcastPicture"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getBroadcastSelfie(self):
         '''
         Get to know if you can view the video using current camera
         '''
         command = {"method": "getBroadcastSelfie"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getCallHistory(self, count: int):
         '''
@@ -602,26 +607,26 @@ class Methods:
             sdk.getCallHistory(10)
         '''
         command = {"method": "getCallHistory", "count": count}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getChatLastMessages(self, id: str, beginNumber: int, count: int):
         command = {"method": "getChatLastMessages", "id": id, "beginNumber": beginNumber, "count": count}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getConferenceParticipants(self):
         '''
         To view conference participants list
         '''
         command = {"method": "getConferenceParticipants"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getConferences(self):
         command = {"method": "getConferences"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getConnected(self):
         command = {"method": "getConnected"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getContactDetails(self, peerId: str):
         '''
@@ -637,19 +642,19 @@ class Methods:
             sdk.getContactDetails("user1@some.server")
         '''
         command = {"method": "getContactDetails", "peerId": peerId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getCreatedNDIDevices(self):
         command = {"method": "getCreatedNDIDevices"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getCrop(self):
         command = {"method": "getCrop"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getCurrentUserProfileUrl(self):
         command = {"method": "getCurrentUserProfileUrl"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getDisplayNameById(self, peerId: str):
         '''
@@ -665,236 +670,236 @@ class Methods:
             sdk.getDisplayNameById("user1@some.server")
         '''
         command = {"method": "getDisplayNameById", "peerId": peerId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getFileInfo(self, id: int):
         command = {"method": "getFileInfo", "id": id}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getFileList(self):
         '''
         Get the list of URLs of downloaded files
         '''
         command = {"method": "getFileList"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getFileRequests(self):
         '''
         Get the list of incoming files
         '''
         command = {"method": "getFileRequests"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getFileTransferAvailability(self):
         '''
         Get file transfer availability
         '''
         command = {"method": "getFileTransferAvailability"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getFileTransferInfo(self):
         '''
         Get file transfer information
         '''
         command = {"method": "getFileTransferInfo"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getFileUploads(self):
         '''
         Get the list of outgoing files
         '''
         command = {"method": "getFileUploads"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getGroups(self):
         '''
         Get information about groups
         '''
         command = {"method": "getGroups"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getHardwareKey(self):
         '''
         Get a unique hardware key to create a license
         '''
         command = {"method": "getHardwareKey"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getHttpServerSettings(self):
         '''
         Get http server settings
         '''
         command = {"method": "getHttpServerSettings"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getHttpServerState(self):
         '''
         Get http server status
         '''
         command = {"method": "getHttpServerState"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getIncomingCameraControlRequests(self):
         command = {"method": "getIncomingCameraControlRequests"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getInfoWidgetsState(self):
         command = {"method": "getInfoWidgetsState"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getLastCallsViewTime(self):
         command = {"method": "getLastCallsViewTime"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getLastSelectedConference(self):
         command = {"method": "getLastSelectedConference"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getLastUsedServersList(self, count: int):
         command = {"method": "getLastUsedServersList", "count": count}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getLicenseServerStatus(self):
         command = {"method": "getLicenseServerStatus"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getLicenseType(self):
         '''
         Get the information about pre-installed license
         '''
         command = {"method": "getLicenseType"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getListOfChats(self):
         '''
         Get the list of chats
         '''
         command = {"method": "getListOfChats"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getLogin(self):
         command = {"method": "getLogin"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getLogo(self):
         command = {"method": "getLogo"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getMaxConfTitleLength(self):
         '''
         Get maximum length of the conference title
         '''
         command = {"method": "getMaxConfTitleLength"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getMicMute(self):
         '''
         To get the information on the microphone state (turned on or turned off)
         '''
         command = {"method": "getMicMute"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getModes(self):
         '''
         Get the list of modes and pins for the specified capture board
         '''
         command = {"method": "getModes"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getMonitorsInfo(self):
         '''
         Get the information about monitors
         '''
         command = {"method": "getMonitorsInfo"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getNDIState(self):
         command = {"method": "getNDIState"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getOutgoingBitrate(self):
         command = {"method": "getOutgoingBitrate"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getOutgoingCameraControlRequests(self):
         command = {"method": "getOutgoingCameraControlRequests"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getOutputSelfVideoRotateAngle(self):
         command = {"method": "getOutputSelfVideoRotateAngle"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getProperties(self):
         command = {"method": "getProperties"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getPtzControls(self):
         command = {"method": "getPtzControls"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getRemotelyControlledCameras(self):
         command = {"method": "getRemotelyControlledCameras"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getRenderInfo(self):
         command = {"method": "getRenderInfo"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getScheduler(self):
         command = {"method": "getScheduler"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getServerDomain(self):
         command = {"method": "getServerDomain"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getSettings(self):
         '''
         Get the settings list
         '''
         command = {"method": "getSettings"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getSlideShowCache(self):
         command = {"method": "getSlideShowCache"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getSlideShowInfo(self):
         '''
         Get information about the slideshow
         '''
         command = {"method": "getSlideShowInfo"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getSystemInfo(self):
         command = {"method": "getSystemInfo"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getTariffRestrictions(self):
         command = {"method": "getTariffRestrictions"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getTokenForHttpServer(self):
         command = {"method": "getTokenForHttpServer"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getTrueConfRoomProKey(self):
         command = {"method": "getTrueConfRoomProKey"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getVideoMatrix(self):
         '''
         Get the information about current video matrix
         '''
         command = {"method": "getVideoMatrix"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def getVideoMute(self):
         '''
         Get current status of video streaming
         '''
         command = {"method": "getVideoMute"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def gotoPodium(self):
         '''
@@ -903,7 +908,7 @@ class Methods:
         You will be informed about taking the podium with a respective notification (when the onRoleEventOccurred notification is received).
         '''
         command = {"method": "gotoPodium"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def hideVideoSlot(self, callId: str):
         '''
@@ -920,7 +925,7 @@ class Methods:
 
         '''
         command = {"method": "hideVideoSlot", "callId": callId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def inviteToConference(self, peerId: str):
         '''
@@ -936,7 +941,7 @@ class Methods:
             sdk.inviteToConference("user1@some.server")
         '''
         command = {"method": "inviteToConference", "peerId": peerId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def inviteToPodium(self, peerId: str):
         '''
@@ -952,7 +957,7 @@ class Methods:
             sdk.inviteToPodium("user1@some.server")
         '''
         command = {"method": "inviteToPodium", "peerId": peerId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def kickFromPodium(self, peerId: str):
         '''
@@ -968,7 +973,7 @@ class Methods:
             sdk.kickFromPodium("user1@some.server")
         '''
         command = {"method": "kickFromPodium", "peerId": peerId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def kickPeer(self, peerId: str):
         '''
@@ -984,14 +989,14 @@ class Methods:
             sdk.kickPeer("user1@some.server")
         '''
         command = {"method": "kickPeer", "peerId": peerId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def leavePodium(self):
         '''
         Leave the podium
         '''
         command = {"method": "leavePodium"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def loadData(self, containerName: str):
         '''
@@ -1007,11 +1012,11 @@ class Methods:
             sdk.loadData("testContainer")
         '''
         command = {"method": "loadData", "containerName": containerName}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def moveVideoSlotToMonitor(self, callId: str, monitorIndex: int):
         command = {"method": "moveVideoSlotToMonitor", "callId": callId, "monitorIndex": monitorIndex}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def productRegistrationOffline(self, fileId: int):
         '''
@@ -1027,63 +1032,63 @@ class Methods:
             sdk.productRegistrationOffline(268535454)
         '''
         command = {"method": "productRegistrationOffline", "fileId": fileId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def ptzDown(self):
         '''
         Move camera down
         '''
         command = {"method": "ptzDown"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def ptzLeft(self):
         '''
         Move camera left
         '''
         command = {"method": "ptzLeft"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def ptzRight(self):
         '''
         Move camera right
         '''
         command = {"method": "ptzRight"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def ptzStop(self):
         '''
         Stops camera movement (pan/tilt/zoom)
         '''
         command = {"method": "ptzStop"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def ptzUp(self):
         '''
         Move camera up
         '''
         command = {"method": "ptzUp"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def ptzZoomDec(self):
         '''
         Reduce image
         '''
         command = {"method": "ptzZoomDec"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def ptzZoomInc(self):
         '''
         Enlarge image
         '''
         command = {"method": "ptzZoomInc"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def rebootSystem(self):
         '''
         Restart computer
         '''
         command = {"method": "rebootSystem"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def rejectFile(self, id: int):
         '''
@@ -1099,47 +1104,47 @@ class Methods:
             sdk.rejectFile(268535454)
         '''
         command = {"method": "rejectFile", "id": id}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def rejectInvitationToPodium(self):
         command = {"method": "rejectInvitationToPodium"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def rejectRequestCameraControl(self):
         command = {"method": "rejectRequestCameraControl"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def rejectRequestToPodium(self, peerId: str):
         command = {"method": "rejectRequestToPodium", "peerId": peerId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def remotelyControlledCameraPtzDown(self, cameraOwnerCallId: str):
         command = {"method": "remotelyControlledCameraPtzDown", "cameraOwnerCallId": cameraOwnerCallId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def remotelyControlledCameraPtzLeft(self, cameraOwnerCallId: str):
         command = {"method": "remotelyControlledCameraPtzLeft", "cameraOwnerCallId": cameraOwnerCallId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def remotelyControlledCameraPtzRight(self, cameraOwnerCallId: str):
         command = {"method": "remotelyControlledCameraPtzRight", "cameraOwnerCallId": cameraOwnerCallId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def remotelyControlledCameraPtzUp(self, cameraOwnerCallId: str):
         command = {"method": "remotelyControlledCameraPtzUp", "cameraOwnerCallId": cameraOwnerCallId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def remotelyControlledCameraPtzZoomDec(self, cameraOwnerCallId: str):
         command = {"method": "remotelyControlledCameraPtzZoomDec", "cameraOwnerCallId": cameraOwnerCallId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def remotelyControlledCameraPtzZoomInc(self, cameraOwnerCallId: str):
         command = {"method": "remotelyControlledCameraPtzZoomInc", "cameraOwnerCallId": cameraOwnerCallId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def removeAllSlides(self, removeFromServer: bool):
         command = {"method": "removeAllSlides", "removeFromServer": removeFromServer}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def removeFromAbook(self, peerId: str):
         '''
@@ -1155,7 +1160,7 @@ class Methods:
             sdk.removeFromAbook("user1@some.server")
         '''
         command = {"method": "removeFromAbook", "peerId": peerId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def removeFromGroup(self, groupId: int, peerId: str):
         '''
@@ -1173,11 +1178,11 @@ class Methods:
             sdk.removeFromAbook(268535454, "user1@some.server")
         '''
         command = {"method": "removeFromGroup", "groupId": groupId, "peerId": peerId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def removeFromServersList(self, serverName: str):
         command = {"method": "removeFromServersList", "serverName": serverName}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def removeGroup(self, groupId: int):
         '''
@@ -1193,19 +1198,19 @@ class Methods:
             sdk.removeGroup(268535454)
         '''
         command = {"method": "removeGroup", "groupId": groupId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def removeImageFromCachingQueue(self, fileId: int):
         command = {"method": "removeImageFromCachingQueue", "fileId": fileId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def removeSlide(self, idx: int, removeFromServer: bool):
         command = {"method": "removeSlide", "idx": idx, "removeFromServer": removeFromServer}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def removeVideoSlotFromMonitor(self, monitorIndex: int):
         command = {"method": "removeVideoSlotFromMonitor", "monitorIndex": monitorIndex}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def renameGroup(self, groupId: int, newName: str):
         '''
@@ -1223,7 +1228,7 @@ class Methods:
             sdk.renameGroup(268535454, "NewGroupName")
         '''
         command = {"method": "renameGroup", "groupId": groupId, "newName": newName}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def renameInAbook(self, peerId: str, peerDn: str):
         '''
@@ -1241,19 +1246,19 @@ class Methods:
             sdk.renameInAbook("user1@some.server", "NewUserName")
         '''
         command = {"method": "renameInAbook", "peerId": peerId, "peerDn": peerDn}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def requestParticipantCameraControl(self, callId: str):
         command = {"method": "requestParticipantCameraControl", "callId": callId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def restoreWindow(self):
         command = {"method": "restoreWindow"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def saveData(self, containerName: str, data: str, flags: str):
         command = {"method": "saveData", "containerName": containerName, "data": data, "flags": flags}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def sendConferenceFile(self, fileId: int):
         '''
@@ -1269,7 +1274,7 @@ class Methods:
             sdk.sendConferenceFile(268535454)
         '''
         command = {"method": "sendConferenceFile", "fileId": fileId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def sendFile(self, fileId: int, peerId: str):
         '''
@@ -1287,7 +1292,7 @@ class Methods:
             sdk.sendFile(268535454, "user1@some.server")
         '''
         command = {"method": "sendFile", "fileId": fileId, "peerId": peerId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def sendGroupMessage(self, message: str):
         '''
@@ -1302,7 +1307,7 @@ class Methods:
             sdk.sendGroupMessage("hello!")
         '''
         command = {"method": "sendGroupMessage", "message": message}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def sendMessage(self, peerId: str, message: str):
         '''
@@ -1319,15 +1324,15 @@ class Methods:
             sdk.sendMessage("user1@some.server", "hello!")
         '''
         command = {"method": "sendMessage", "peerId": peerId, "message": message}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setAppSndDev(self, name: str, description: str):
         command = {"method": "setAppSndDev", "name": name, "description": description}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setAudioCapturer(self, name: str, description: str):
         command = {"method": "setAudioCapturer", "name": name, "description": description}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setAudioMute(self, mute: bool):
         '''
@@ -1342,11 +1347,11 @@ class Methods:
             sdk.setAudioMute(true)
         '''
         command = {"method": "setAudioMute", "mute": mute}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setAudioReceivingLevel(self, peerId: str, level: int):
         command = {"method": "setAudioReceivingLevel", "peerId": peerId, "level": level}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setAudioRenderer(self, name: str, description: str):
         '''
@@ -1364,7 +1369,7 @@ class Methods:
             sdk.setAudioRenderer('none', 'none')
         '''
         command = {"method": "setAudioRenderer", "name": name, "description": description}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setAuthParams(self, userType: str, authType: str, secret: str = None):
         '''
@@ -1394,7 +1399,7 @@ class Methods:
             command = {"method": "setAuthParams", "userType": userType, "authType": authType, "newPin": secret}
         else:
             command = {"method": "setAuthParams", "userType": userType, "authType": authType}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setBackground(self, fileId: int):
         '''
@@ -1410,7 +1415,7 @@ class Methods:
             sdk.setBackground(268535454)
         '''
         command = {"method": "setBackground", "fileId": fileId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setBroadcastSelfie(self, enabled: bool, fps: int = 0):
         '''
@@ -1430,33 +1435,33 @@ class Methods:
             command = {"method": "setBroadcastSelfie", "enabled": enabled, "fps": fps}
         else:
             command = {"method": "setBroadcastSelfie", "enabled": enabled}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setCrop(self, enabled: bool):
         command = {"method": "setCrop", "enabled": enabled}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setDefaultBackground(self):
         '''
         Set default background
         '''
         command = {"method": "setDefaultBackground"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setDefaultLogo(self):
         '''
         Set default logo
         '''
         command = {"method": "setDefaultLogo"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setHttpServerSettings(self, settings: dict):
         command = {"method": "setHttpServerSettings", "settings": settings}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setLastCallsViewed(self):
         command = {"method": "setLastCallsViewed"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setLogo(self, fileId: int, mode: int):
         '''
@@ -1473,7 +1478,7 @@ class Methods:
             sdk.setLogo(268535454, 0)
         '''
         command = {"method": "setLogo", "fileId": fileId, "mode": mode}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setMicMute(self, mute: bool):
         '''
@@ -1488,7 +1493,7 @@ class Methods:
             sdk.setMicMute(true)
         '''
         command = {"method": "setMicMute", "mute": mute}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setModeratorRole(self, peerId: str, moderator: bool):
         '''
@@ -1505,27 +1510,27 @@ class Methods:
             sdk.setModeratorRole("user1@some.server")
         '''
         command = {"method": "setModeratorRole", "peerId": peerId, "moderator": moderator}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setModes(self, pin: str, mode: str):
         command = {"method": "setModes", "pin": pin, "mode": mode}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setNDIState(self, enabled: bool):
         command = {"method": "setNDIState", "enabled": enabled}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setOutputSelfVideoRotateAngle(self, rotateAngle: int):
         command = {"method": "setOutputSelfVideoRotateAngle", "rotateAngle": rotateAngle}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setPanPos(self):
         command = {"method": "setPanPos"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setPtzDefaults(self):
         command = {"method": "setPtzDefaults"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setSettings(self, settings: dict):
         '''
@@ -1540,7 +1545,7 @@ class Methods:
             sdk.setSettings({"settings": {"audioPlayLevel" : 0.55, "enableAutologin" : true}})
         '''
         command = {"method": "setSettings", "settings": settings}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setSlidePosition(self, fromIdx: int, toIdx: int):
         '''
@@ -1558,7 +1563,7 @@ class Methods:
             sdk.setSlidePosition(0, 3)
         '''
         command = {"method": "setSlidePosition", "fromIdx": fromIdx, "toIdx": toIdx}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setTiltPos(self, pos: int):
         '''
@@ -1573,11 +1578,11 @@ class Methods:
             sdk.setTiltPos(10)
         '''
         command = {"method": "setTiltPos", "pos": pos}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setUsedApiVersion(self, version: str):
         command = {"method": "setUsedApiVersion", "version": version}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setVideoCapturer(self, name: str, description: str):
         '''
@@ -1595,7 +1600,7 @@ class Methods:
             sdk.setVideoCapturer("none", "none")
         '''
         command = {"method": "setVideoCapturer", "name": name, "description": description}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setVideoMute(self, mute: bool):
         '''
@@ -1610,7 +1615,7 @@ class Methods:
             sdk.setVideoMute(true)
         '''
         command = {"method": "setVideoMute", "mute": mute}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def setZoomPos(self, pos: int):
         '''
@@ -1625,35 +1630,35 @@ class Methods:
             sdk.setZoomPos(10)
         '''
         command = {"method": "setZoomPos", "pos": pos}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def showFirstSlide(self):
         '''
         Show the first slide in the list
         '''
         command = {"method": "showFirstSlide"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def showLastSlide(self):
         '''
         Show the last slide in the list
         '''
         command = {"method": "showLastSlide"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def showNextSlide(self):
         '''
         Show next slide
         '''
         command = {"method": "showNextSlide"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def showPrevSlide(self):
         '''
         Show the previous slide in the list
         '''
         command = {"method": "showPrevSlide"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def showSlide(self, idx: int):
         '''
@@ -1667,11 +1672,11 @@ class Methods:
             sdk.showSlide(3)
         '''
         command = {"method": "showSlide", "idx": idx}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def showVideoSlot(self, callId: str):
         command = {"method": "showVideoSlot", "callId": callId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def shutdown(self, forAll: bool):
         '''
@@ -1686,7 +1691,7 @@ class Methods:
             sdk.shutdown(true)
         '''
         command = {"method": "shutdown", "forAll": forAll}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def shutdownSystem(self, forAll: bool):
         '''
@@ -1701,18 +1706,18 @@ class Methods:
             sdk.shutdownSystem(true)
         '''
         command = {"method": "shutdownSystem", "forAll": forAll}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def sortSlides(self):
         '''
         Sort slide list by filename
         '''
         command = {"method": "sortSlides"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def startAudioDelayDetectorTest(self):
         command = {"method": "startAudioDelayDetectorTest"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def startBroadcastPicture(self, fileId: int):
         '''
@@ -1728,22 +1733,22 @@ class Methods:
             sdk.startBroadcastPicture(268535454)
         '''
         command = {"method": "startBroadcastPicture", "fileId": fileId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def startCapture(self, captureId: int):
         command = {"method": "startCapture", "captureId": captureId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def startHttpServer(self):
         '''
         Start http server
         '''
         command = {"method": "startHttpServer"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def startRemark(self):
         command = {"method": "startRemark"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def startSlideShow(self, title: str = "", startingIdx: int = 0):
         '''
@@ -1761,46 +1766,46 @@ class Methods:
             sdk.startSlideShow("Some slideshow", 2)
         '''
         command = {"method": "startSlideShow", "title": title, "startingIdx": startingIdx}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def stopAudioDelayDetectorTest(self):
         command = {"method": "stopAudioDelayDetectorTest"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def stopBroadcastPicture(self):
         '''
         Stops broadcasting a picture instead of its own video
         '''
         command = {"method": "stopBroadcastPicture"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def stopCachingAllImages(self):
         '''
         Stop caching slideshow slides
         '''
         command = {"method": "stopCachingAllImages"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def stopCapture(self):
         '''
         Stop content showing
         '''
         command = {"method": "stopCapture"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def stopHttpServer(self):
         '''
         Stop http server
         '''
         command = {"method": "stopHttpServer"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def stopSlideShow(self):
         '''
         Stop slideshow
         '''
         command = {"method": "stopSlideShow"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def swapVideoSlots(self, callId1: str, callId2: str):
         '''
@@ -1820,32 +1825,32 @@ class Methods:
             sdk.swapVideoSlots("user1@some.server", "user2@some.server")
         '''
         command = {"method": "swapVideoSlots", "callId1": callId1, "callId2": callId2}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def switchVideoFlow(self, callId: str, mainCamera: bool):
         command = {"method": "switchVideoFlow", "callId": callId, "mainCamera": mainCamera}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def testAudioCapturerStart(self):
         '''
         Start testing the audio capture device. Launching is possible only not in a conference
         '''
         command = {"method": "testAudioCapturerStart"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def testAudioCapturerStop(self):
         '''
         Stop testing the audio capture device
         '''
         command = {"method": "testAudioCapturerStop"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def testAudioRenderer(self):
         '''
         Starts playback device test (single track). Launching is possible only not in a conference
         '''
         command = {"method": "testAudioRenderer"}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def toneDial(self, symbol: str, callId: str):
         '''
@@ -1863,7 +1868,7 @@ class Methods:
             sdk.toneDial('1', "user1@some.server")
         '''
         command = {"method": "toneDial", "symbol": symbol, "callId": callId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def turnRemoteCamera(self, peerId: str, on: bool):
         '''
@@ -1881,7 +1886,7 @@ class Methods:
             sdk.turnRemoteCamera("user1@some.server", true)
         '''
         command = {"method": "turnRemoteCamera", "peerId": peerId, "on": on}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def turnRemoteMic(self, peerId: str, on: bool):
         '''
@@ -1899,7 +1904,7 @@ class Methods:
             sdk.turnRemoteMic("user1@some.server", true)
         '''
         command = {"method": "turnRemoteMic", "peerId": peerId, "on": on}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def turnRemoteSpeaker(self, peerId: str, on: bool):
         '''
@@ -1917,7 +1922,7 @@ class Methods:
             sdk.turnRemoteSpeaker("user1@some.server", true)
         '''
         command = {"method": "turnRemoteSpeaker", "peerId": peerId, "on": on}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
 
     def unblock(self, peerId: str):
         '''
@@ -1933,4 +1938,4 @@ class Methods:
             sdk.unblock("user1@some.server")
         '''
         command = {"method": "unblock", "peerId": peerId}
-        self.videosdk.command(command)
+        return self.videosdk.command(command)
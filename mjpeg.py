@@ -0,0 +1,201 @@
+# coding=utf8
+'''''
+Local MJPEG fan-out of the VideoSDK frames.
+
+The frames are fetched once by a FrameGrabber or MultiFrameFetcher and served
+to any number of local HTTP clients as multipart/x-mixed-replace (MJPEG), so
+the load on the Room PC does not depend on the number of consumers.
+
+Every client has a one-frame mailbox: a new frame replaces the one the client
+has not taken yet (counted in `dropped`), so a slow reader gets fewer frames
+and never delays the others.
+
+    GET /                   - the peers with frames, one per line
+    GET /stream/<peerId>    - MJPEG stream (the peerId is URL-encoded)
+    GET /frame/<peerId>     - the newest frame as a single JPEG
+
+Example::
+
+    wall = pyVideoSDK.frames.MultiFrameFetcher(room, fps = 5)
+    server = pyVideoSDK.mjpeg.MJPEGServer(wall, port = 8090)
+    wall.start()
+    server.start()
+    print(server.url("user1@some.server"))
+'''
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Event, Lock, Thread
+from urllib.parse import quote, unquote
+
+BOUNDARY = "videosdkframe"
+# A client waits for a new frame this long before the server checks if it is stopped, seconds
+CLIENT_WAIT = 1
+
+logger = logging.getLogger('videosdk')
+
+
+class ClientSlot:
+    """Mailbox of one client: only the newest frame is kept"""
+
+    def __init__(self, peerId: str, address: str):
+        self.peerId = peerId
+        self.address = address
+        self.sent = 0
+        self.dropped = 0
+        self.closed = False
+        self.__frame = None
+        self.__pending = False
+        self.__lock = Lock()
+        self.__ready = Event()
+
+    def offer(self, frame):
+        with self.__lock:
+            if self.__pending:
+                self.dropped += 1
+            self.__frame = frame
+            self.__pending = True
+            self.__ready.set()
+
+    def take(self, timeout: float):
+        """The newest frame not taken yet, None on timeout or when closed"""
+        if not self.__ready.wait(timeout):
+            return None
+        with self.__lock:
+            frame, self.__frame = self.__frame, None
+            self.__pending = False
+            self.__ready.clear()
+        return frame
+
+    def close(self):
+        self.closed = True
+        self.__ready.set()
+
+
+class MJPEGServer:
+    def __init__(self, source, host: str = "127.0.0.1", port: int = 8090):
+        """source - FrameGrabber or MultiFrameFetcher"""
+        self.source = source
+        self.default_peer = getattr(source, "peerId", None)
+        self.__lock = Lock()
+        self.__latest = {}   # peerId: Frame
+        self.__clients = {}  # peerId: [ClientSlot]
+        self.__thread = None
+        self.httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self.httpd.daemon_threads = True
+        source.add_listener(self.publish)
+
+    @property
+    def address(self) -> tuple:
+        return self.httpd.server_address
+
+    def url(self, peerId: str = None, stream: bool = True) -> str:
+        host, port = self.address[:2]
+        path = f'/{"stream" if stream else "frame"}/{quote(peerId or self.default_peer or "", safe="")}'
+        return f'http://{host}:{port}{path}'
+
+    def peers(self) -> list:
+        return list(self.__latest)
+
+    def clients(self) -> list:
+        """ClientSlot of every connected client"""
+        with self.__lock:
+            return [slot for slots in self.__clients.values() for slot in slots]
+
+    def publish(self, frame):
+        """Source listener: hand the frame to every client of its peer"""
+        with self.__lock:
+            self.__latest[frame.peerId] = frame
+            slots = tuple(self.__clients.get(frame.peerId, ()))
+        for slot in slots:
+            slot.offer(frame)
+
+    def latest(self, peerId: str):
+        return self.__latest.get(peerId)
+
+    def connect(self, peerId: str, address: str = "") -> ClientSlot:
+        slot = ClientSlot(peerId, address)
+        with self.__lock:
+            self.__clients.setdefault(peerId, []).append(slot)
+            frame = self.__latest.get(peerId)
+        if frame is not None:
+            slot.offer(frame)
+        return slot
+
+    def disconnect(self, slot: ClientSlot):
+        with self.__lock:
+            slots = self.__clients.get(slot.peerId)
+            if slots and slot in slots:
+                slots.remove(slot)
+                if not slots:
+                    del self.__clients[slot.peerId]
+
+    def start(self):
+        self.__thread = Thread(target=self.httpd.serve_forever, name="MJPEGServer", daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        for slot in self.clients():
+            slot.close()
+        self.httpd.server_close()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+
+def _make_handler(server: MJPEGServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.0"
+
+        def log_message(self, format, *args):
+            # Formatted by the logging handler, only if DEBUG is on
+            logger.debug('MJPEG %s ' + format, self.address_string(), *args)
+
+        def do_GET(self):
+            kind, _, peer = self.path.lstrip("/").partition("/")
+            peer = unquote(peer) or server.default_peer
+            if kind == "":
+                body = "\n".join(server.peers()).encode("utf8")
+                self.__send_headers("text/plain; charset=utf-8", len(body))
+                self.wfile.write(body)
+            elif kind == "frame" and peer:
+                frame = server.latest(peer)
+                if frame is None:
+                    self.send_error(404, "No frame yet")
+                    return
+                self.__send_headers(frame.content_type, len(frame.data))
+                self.wfile.write(frame.data)
+            elif kind == "stream" and peer:
+                self.__stream(peer)
+            else:
+                self.send_error(404)
+
+        def __send_headers(self, content_type: str, length: int = None):
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Cache-Control", "no-cache, no-store")
+            if length is not None:
+                self.send_header("Content-Length", str(length))
+            self.end_headers()
+
+        def __stream(self, peer: str):
+            slot = server.connect(peer, self.address_string())
+            try:
+                self.__send_headers(f'multipart/x-mixed-replace; boundary={BOUNDARY}')
+                while not slot.closed:
+                    frame = slot.take(CLIENT_WAIT)
+                    if frame is None:
+                        continue
+                    # Blocks while the client is slow: the newer frames replace each other in the slot
+                    self.wfile.write(f'--{BOUNDARY}\r\nContent-Type: {frame.content_type}\r\n'
+                                     f'Content-Length: {len(frame.data)}\r\n\r\n'.encode("ascii"))
+                    self.wfile.write(frame.data)
+                    self.wfile.write(b"\r\n")
+                    self.wfile.flush()
+                    slot.sent += 1
+            except (ConnectionError, OSError):
+                pass
+            finally:
+                server.disconnect(slot)
+
+    return Handler
@@ -0,0 +1,122 @@
+# coding=utf8
+'''''
+Moderation of many conference participants at once.
+
+The targets are chosen from VideoSDK.roster: all the participants except
+some, the ones a predicate selects, or an explicit list. The commands for
+all of them are sent back-to-back in one batch (VideoSDK.commands), and the
+acknowledgements are collected into one result.
+
+The room itself (VideoSDK.TrueConfID()) is never a target of the roster
+selection.
+
+Example::
+
+    moderator = pyVideoSDK.moderation.Moderator(room)
+    result = moderator.mute_mics(exclude = ["speaker@some.server"])
+    print(result.wait(timeout = 5))     # {peerId: None or the error}
+
+    moderator.kick(where = lambda participant: participant.get("peerId", "").endswith("@guest"))
+'''
+from concurrent.futures import Future, wait
+from threading import Lock
+
+from pyVideoSDK.roster import peer_key
+
+
+class ModerationResult:
+    """Acknowledgements of one action: {peerId: Future of the response}"""
+
+    def __init__(self, method: str, futures: dict):
+        self.method = method
+        self.futures = futures
+        self.future = Future()  # {peerId: None if done or the error}, when all are acknowledged
+        lock = Lock()
+        remaining = [len(futures)]
+
+        def acknowledged(_):
+            with lock:
+                remaining[0] -= 1
+                if remaining[0] != 0:
+                    return
+            self.future.set_result(self.errors())
+
+        if not futures:
+            self.future.set_result({})
+        for future in futures.values():
+            future.add_done_callback(acknowledged)
+
+    def __len__(self):
+        return len(self.futures)
+
+    def errors(self, only_failed: bool = False) -> dict:
+        """{peerId: None if acknowledged, the error otherwise} of the answered commands"""
+        errors = {}
+        for peer_id, future in self.futures.items():
+            if not future.done():
+                continue
+            if future.cancelled():
+                error = "Cancelled"
+            elif future.exception() is not None:
+                error = str(future.exception())
+            elif future.result().get("result") is False:
+                error = future.result().get("error") or f'{self.method} failed'
+            else:
+                error = None
+            if error is not None or not only_failed:
+                errors[peer_id] = error
+        return errors
+
+    def failed(self) -> list:
+        return list(self.errors(only_failed=True))
+
+    def wait(self, timeout: float = None) -> dict:
+        """{peerId: None or the error}; the unanswered ones are "No response" """
+        wait(self.futures.values(), timeout)
+        errors = {peer_id: "No response" for peer_id in self.futures}
+        errors.update(self.errors())
+        return errors
+
+
+class Moderator:
+    def __init__(self, videosdk):
+        self.videosdk = videosdk
+
+    def targets(self, peers: list = None, exclude: list = (), where=None) -> list:
+        """
+        peers - explicit peerIds; None - all the participants of the roster except the room itself
+        exclude - peerIds to leave out
+        where - function(participant: dict) -> bool, over the roster
+        """
+        excluded = {peer_key(peer_id) for peer_id in exclude}
+        if peers is None:
+            own_id = self.videosdk.TrueConfID()
+            if own_id:
+                excluded.add(peer_key(own_id))
+            participants = self.videosdk.roster.participants()
+        else:
+            roster = self.videosdk.roster
+            participants = [roster.get(peer_id) or {"peerId": peer_id} for peer_id in peers]
+        return [p["peerId"] for p in participants
+                if peer_key(p["peerId"]) not in excluded and (where is None or where(p))]
+
+    def apply(self, method: str, peers: list = None, exclude: list = (), where=None, **params) -> ModerationResult:
+        """Send {"method": method, "peerId": ..., **params} to every target"""
+        targets = self.targets(peers, exclude, where)
+        futures = self.videosdk.commands([dict({"method": method, "peerId": peer_id}, **params) for peer_id in targets])
+        return ModerationResult(method, dict(zip(targets, futures)))
+
+    def mute_mics(self, peers: list = None, exclude: list = (), where=None, on: bool = False) -> ModerationResult:
+        return self.apply("turnRemoteMic", peers, exclude, where, on=on)
+
+    def mute_cameras(self, peers: list = None, exclude: list = (), where=None, on: bool = False) -> ModerationResult:
+        return self.apply("turnRemoteCamera", peers, exclude, where, on=on)
+
+    def mute_speakers(self, peers: list = None, exclude: list = (), where=None, on: bool = False) -> ModerationResult:
+        return self.apply("turnRemoteSpeaker", peers, exclude, where, on=on)
+
+    def kick(self, peers: list = None, exclude: list = (), where=None) -> ModerationResult:
+        return self.apply("kickPeer", peers, exclude, where)
+
+    def kick_from_podium(self, peers: list = None, exclude: list = (), where=None) -> ModerationResult:
+        return self.apply("kickFromPodium", peers, exclude, where)
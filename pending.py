@@ -0,0 +1,180 @@
+# coding=utf8
+'''''
+Commands waiting for their response.
+
+Every command gets a "requestId" which VideoSDK returns in the response.
+Identical read-only requests (getAbook, getSettings, ...) that are already
+in flight are not sent again: all the callers share the single response
+(single-flight).
+'''
+import itertools
+import json
+import time
+from concurrent.futures import Future, InvalidStateError
+from threading import Lock
+
+REQUEST_ID_PREFIX = 'pyVideoSDK-'
+# Forget a request if no response came within this time, seconds
+REQUEST_TIMEOUT = 30
+SWEEP_INTERVAL = 1
+# Read-only methods besides "get*"
+READ_ONLY_METHODS = ("loaddata", "searchcontact")
+
+
+def is_read_only(method: str) -> bool:
+    method = method.lower()
+    return method.startswith("get") or method in READ_ONLY_METHODS
+
+
+class RequestTimeoutError(TimeoutError):
+    pass
+
+
+class RequestFailedError(Exception):
+    """The response says the command failed ("result": false)"""
+
+    def __init__(self, message: str, response: dict = None):
+        super().__init__(message)
+        self.response = response
+
+
+class _Pending:
+    __slots__ = ("method", "key", "future", "deadline")
+
+    def __init__(self, method: str, key: str, future: Future, deadline: float):
+        self.method = method
+        self.key = key
+        self.future = future
+        self.deadline = deadline
+
+
+def _set_result(future: Future, result):
+    try:
+        future.set_result(result)
+    except InvalidStateError:  # cancelled by the caller
+        pass
+
+
+def _set_exception(future: Future, exception: Exception):
+    try:
+        future.set_exception(exception)
+    except InvalidStateError:
+        pass
+
+
+class PendingRequests:
+    def __init__(self, timeout: float = REQUEST_TIMEOUT):
+        self.lock = Lock()
+        self.timeout = timeout
+        self.__ids = itertools.count(1)
+        self.__by_id = {}      # requestId: _Pending
+        self.__by_method = {}  # method (lower case): {requestId: None}, oldest first
+        self.__in_flight = {}  # single-flight key: requestId
+        self.__next_sweep = 0
+
+    def __len__(self):
+        return len(self.__by_id)
+
+    def start(self, command: dict) -> tuple:
+        """
+        Register a new request
+
+        Returns (future, command): the command to send, with its "requestId",
+        or None when an identical request is already in flight and the future is shared
+        """
+        method = str(command.get("method", "")).lower()
+        # A caller's own requestId means it wants its own response
+        key = None
+        if "requestId" not in command and is_read_only(method):
+            key = json.dumps(command, sort_keys=True)
+
+        with self.lock:
+            if key is not None:
+                request_id = self.__in_flight.get(key)
+                if request_id is not None:
+                    return self.__by_id[request_id].future, None
+                self.__in_flight[key] = request_id = f'{REQUEST_ID_PREFIX}{next(self.__ids)}'
+                command = dict(command, requestId=request_id)
+            else:
+                request_id = command.get("requestId") or f'{REQUEST_ID_PREFIX}{next(self.__ids)}'
+                command = dict(command, requestId=request_id)
+
+            future = Future()
+            self.__by_id[request_id] = _Pending(method, key, future, time.monotonic() + self.timeout)
+            self.__by_method.setdefault(method, {})[request_id] = None
+
+        return future, command
+
+    def __forget(self, request_id: str) -> _Pending:
+        pending = self.__by_id.pop(request_id)
+        same_method = self.__by_method[pending.method]
+        del same_method[request_id]
+        if not same_method:
+            del self.__by_method[pending.method]
+        if pending.key is not None:
+            del self.__in_flight[pending.key]
+        return pending
+
+    def detach(self, method: str = None):
+        """
+        The data of the method (of all the methods by default) changed: the
+        requests already in flight keep their callers, but identical requests
+        made from now on are sent anew instead of sharing them
+        """
+        with self.lock:
+            if method is None:
+                request_ids = list(self.__in_flight.values())
+            else:
+                request_ids = list(self.__by_method.get(method.lower(), ()))
+            for request_id in request_ids:
+                pending = self.__by_id[request_id]
+                if pending.key is not None:
+                    del self.__in_flight[pending.key]
+                    pending.key = None
+
+    def resolve(self, response: dict) -> bool:
+        """Complete the request the response belongs to. Events are ignored"""
+        if "event" in response or "method" not in response:
+            return False
+
+        request_id = response.get("requestId")
+        with self.lock:
+            if not request_id:
+                # No requestId in the response: the oldest request of the method
+                same_method = self.__by_method.get(str(response["method"]).lower())
+                if not same_method:
+                    return False
+                request_id = next(iter(same_method))
+            elif request_id not in self.__by_id:
+                return False
+            pending = self.__forget(request_id)
+
+        _set_result(pending.future, response)
+        return True
+
+    def fail(self, command: dict, exception: Exception):
+        """The command could not be sent: fail its callers"""
+        with self.lock:
+            if command.get("requestId") not in self.__by_id:
+                return
+            pending = self.__forget(command["requestId"])
+        _set_exception(pending.future, exception)
+
+    def expire(self):
+        """Fail the requests without a response for too long. Cheap to call often"""
+        now = time.monotonic()
+        if now < self.__next_sweep:
+            return
+        self.__next_sweep = now + SWEEP_INTERVAL
+
+        with self.lock:
+            expired = [self.__forget(request_id) for request_id, pending in list(self.__by_id.items())
+                       if pending.deadline <= now]
+        for pending in expired:
+            _set_exception(pending.future, RequestTimeoutError(f'No response to "{pending.method}" within {self.timeout} s'))
+
+    def fail_all(self, exception: Exception):
+        with self.lock:
+            expired = [self.__forget(request_id) for request_id in list(self.__by_id)]
+        for pending in expired:
+            _set_exception(pending.future, exception)
@@ -0,0 +1,142 @@
+# coding=utf8
+'''''
+Continuous PTZ control from a joystick or any other velocity source.
+
+PTZController takes a velocity vector (pan, tilt, zoom in -1..1) and turns
+it into a rate-limited stream of ptzLeft / ptzRight / ptzUp / ptzDown /
+ptzZoomInc / ptzZoomDec commands (remotelyControlledCameraPtz* for the camera
+of a conference participant). Each axis steps at up to `rate` commands per
+second in proportion to its speed. Only the newest vector counts: an axis
+whose previous command is still unanswered skips its step, so stale
+directions never pile up in the queue. When the motion ends ptzStop is sent at
+once.
+
+Example::
+
+    ptz = pyVideoSDK.ptz.PTZController(room, rate = 10, idle_timeout = 0.5)
+    ptz.start()
+    while joystick.connected:
+        x, y, z = joystick.read()
+        ptz.move(pan = x, tilt = y, zoom = z)
+    ptz.close()
+'''
+import time
+from threading import Condition, Thread
+
+DEFAULT_RATE = 10
+DEADZONE = 0.1
+# axis: (direction of the negative speed, direction of the positive speed)
+AXES = {"pan": ("Left", "Right"), "tilt": ("Down", "Up"), "zoom": ("ZoomDec", "ZoomInc")}
+
+
+class PTZController:
+    def __init__(self, videosdk, cameraOwnerCallId: str = None, rate: float = DEFAULT_RATE,
+                 deadzone: float = DEADZONE, idle_timeout: float = None):
+        """
+        cameraOwnerCallId - control the camera of this participant; None - the own camera
+        rate - the most commands per second for one axis, at full speed
+        idle_timeout - stop if move() was not called for this long (a lost joystick), seconds
+        """
+        self.videosdk = videosdk
+        self.cameraOwnerCallId = cameraOwnerCallId
+        self.rate = rate
+        self.deadzone = deadzone
+        self.idle_timeout = idle_timeout
+        self.sent = 0
+        self.collapsed = 0  # steps skipped while the previous command of the axis was in flight
+        self.__velocity = dict.fromkeys(AXES, 0.0)
+        self.__updated = time.monotonic()
+        self.__version = 0
+        self.__changed = Condition()
+        self.__closed = False
+        self.__moving = False
+        self.__thread = None
+
+    def move(self, pan: float = 0, tilt: float = 0, zoom: float = 0):
+        """Set the velocity; the values are clamped to -1..1"""
+        velocity = {axis: max(-1.0, min(1.0, float(value))) for axis, value in zip(AXES, (pan, tilt, zoom))}
+        with self.__changed:
+            self.__velocity = velocity
+            self.__updated = time.monotonic()
+            self.__version += 1
+            self.__changed.notify_all()
+
+    def stop(self):
+        self.move()
+
+    def start(self):
+        self.__closed = False
+        self.__thread = Thread(target=self.__run, name="PTZController", daemon=True)
+        self.__thread.start()
+
+    def close(self):
+        """Stop the camera and the thread"""
+        with self.__changed:
+            self.__velocity = dict.fromkeys(AXES, 0.0)
+            self.__closed = True
+            self.__version += 1
+            self.__changed.notify_all()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+    def __command(self, direction: str) -> dict:
+        if self.cameraOwnerCallId is None:
+            return {"method": f'ptz{direction}'}
+        return {"method": f'remotelyControlledCameraPtz{direction}', "cameraOwnerCallId": self.cameraOwnerCallId}
+
+    def __send_stop(self):
+        # There is no stop for a remote camera: its steps just end
+        if self.cameraOwnerCallId is None:
+            self.videosdk.commands([{"method": "ptzStop"}])
+            self.sent += 1
+
+    def __run(self):
+        due = dict.fromkeys(AXES, 0.0)         # monotonic time of the next step
+        direction = dict.fromkeys(AXES, None)  # direction of the last step
+        in_flight = dict.fromkeys(AXES, None)  # Future of the last step
+        while True:
+            with self.__changed:
+                velocity = self.__velocity
+                version = self.__version
+                if self.idle_timeout is not None and time.monotonic() - self.__updated > self.idle_timeout:
+                    velocity = dict.fromkeys(AXES, 0.0)
+                active = {axis: speed for axis, speed in velocity.items() if abs(speed) > self.deadzone}
+                if not active:
+                    if self.__moving:
+                        self.__moving = False
+                        self.__send_stop()
+                        direction = dict.fromkeys(AXES, None)
+                    if self.__closed:
+                        return
+                    self.__changed.wait()
+                    continue
+
+            now = time.monotonic()
+            steps = []
+            for axis, speed in active.items():
+                step = AXES[axis][speed > 0]
+                if step != direction[axis]:
+                    due[axis] = now  # a new direction goes at once
+                if now < due[axis]:
+                    continue
+                due[axis] = now + 1 / (self.rate * abs(speed))
+                if in_flight[axis] is not None and not in_flight[axis].done() and step == direction[axis]:
+                    self.collapsed += 1
+                    continue
+                steps.append(axis)
+                direction[axis] = step
+            if steps:
+                futures = self.videosdk.commands([self.__command(direction[axis]) for axis in steps])
+                for axis, future in zip(steps, futures):
+                    in_flight[axis] = future
+                self.sent += len(steps)
+                self.__moving = True
+
+            timeout = max(min(due[axis] for axis in active) - time.monotonic(), 0.001)
+            if self.idle_timeout is not None:
+                timeout = min(timeout, self.idle_timeout)
+            with self.__changed:
+                # Woken by move() at once: a new vector replaces the old one
+                if self.__version == version:
+                    self.__changed.wait(timeout)
@@ -0,0 +1,229 @@
+# coding=utf8
+'''''
+Ring buffer of frames in shared memory for consumers in other processes.
+
+FrameRingWriter is attached to a FrameDecoder (decoded frames) or to a
+FrameGrabber / MultiFrameFetcher (JPEG frames) and copies every new frame into
+the next of `slots` fixed-size slots of a multiprocessing.shared_memory block.
+FrameRingReader maps the block in another process and returns the newest
+frame as a read-only view of the shared memory, without copying or pickling.
+
+Every slot is guarded by a sequence lock: the writer stores the new sequence
+number in "begin" before it overwrites the slot and in "end" when it is done.
+A view stays valid until `slots - 1` newer frames are written;
+FrameRingReader.valid() tells if it was overwritten meanwhile.
+
+Example::
+
+    # the process with the connection
+    decoder = pyVideoSDK.decode.FrameDecoder(grabber, min_size = (640, 360))
+    ring = pyVideoSDK.ring.FrameRingWriter(decoder, name = "room-frames")
+
+    # a worker process
+    reader = pyVideoSDK.ring.FrameRingReader("room-frames")
+    frame = reader.wait(timeout = 1)
+    faces = detect(frame.array)
+    if not reader.valid(frame):
+        ...  # the slot was overwritten while we were reading it
+'''
+import struct
+import time
+from multiprocessing import shared_memory
+from threading import Lock
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAGIC = b"VSFR"
+VERSION = 1
+DEFAULT_SLOTS = 4
+DEFAULT_SLOT_SIZE = 1920 * 1080 * 3
+# Reader polling interval while waiting for a new frame, seconds
+POLL_INTERVAL = 0.002
+
+# magic, version, slots, slot size, sequence number of the newest frame
+HEADER = struct.Struct("<4sHHQQ")
+HEADER_SIZE = 64
+# begin, end, timestamp, bytes, height, width, channels (0 - encoded), peerId
+SLOT_HEADER = struct.Struct("<QQdIIIH2x64s")
+SLOT_HEADER_SIZE = 128
+SEQ = struct.Struct("<Q")
+LATEST_OFFSET = 16
+
+# Blocks created by the writers of this process
+_created = set()
+
+
+class RingFrame:
+    __slots__ = ("seq", "peerId", "timestamp", "shape", "array")
+
+    def __init__(self, seq: int, peerId: str, timestamp: float, shape: tuple, array):
+        self.seq = seq
+        self.peerId = peerId
+        self.timestamp = timestamp
+        self.shape = shape
+        self.array = array  # numpy.ndarray (memoryview without numpy), read-only
+
+    def __repr__(self):
+        return f'RingFrame({self.peerId!r}, seq={self.seq}, shape={self.shape})'
+
+
+class _Ring:
+    def __init__(self, shm: shared_memory.SharedMemory):
+        self.shm = shm
+        self.buf = shm.buf
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def _slot_offset(self, index: int) -> int:
+        return HEADER_SIZE + index * SLOT_HEADER_SIZE
+
+    def _data_offset(self, index: int) -> int:
+        return HEADER_SIZE + self.slots * SLOT_HEADER_SIZE + index * self.slot_size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FrameRingWriter(_Ring):
+    def __init__(self, source=None, name: str = None, slots: int = DEFAULT_SLOTS, slot_size: int = DEFAULT_SLOT_SIZE):
+        """
+        source - FrameDecoder, FrameGrabber or MultiFrameFetcher. None - call write() yourself
+        name - name of the shared memory block; None - a random one (see `name`)
+        slot_size - the largest frame in bytes; larger frames are skipped (counted in `oversized`)
+        """
+        self.slots = slots
+        self.slot_size = slot_size
+        self.seq = 0
+        self.oversized = 0
+        # MultiFrameFetcher calls publish() from several workers at once
+        self.lock = Lock()
+        size = HEADER_SIZE + slots * (SLOT_HEADER_SIZE + slot_size)
+        super().__init__(shared_memory.SharedMemory(name=name, create=True, size=size))
+        HEADER.pack_into(self.buf, 0, MAGIC, VERSION, slots, slot_size, 0)
+        _created.add(self.shm._name)
+        if source is not None:
+            source.add_listener(self.publish)
+
+    def publish(self, frame):
+        """Source listener: DecodedFrame (its array) or Frame (its JPEG data)"""
+        array = getattr(frame, "array", None)
+        if array is not None:
+            shape = array.shape
+            self.write(frame.peerId, memoryview(array).cast("B"), shape[0], shape[1],
+                       shape[2] if len(shape) == 3 else 1, frame.timestamp)
+        else:
+            self.write(frame.peerId, frame.data, timestamp=frame.timestamp)
+
+    def write(self, peerId: str, data, height: int = 0, width: int = 0, channels: int = 0, timestamp: float = None) -> int:
+        """Copy the frame into the next slot. Returns its sequence number, None if it does not fit"""
+        size = len(data)
+        if size > self.slot_size:
+            self.oversized += 1
+            return None
+
+        with self.lock:
+            seq = self.seq + 1
+            index = (seq - 1) % self.slots
+            slot = self._slot_offset(index)
+            data_offset = self._data_offset(index)
+            SEQ.pack_into(self.buf, slot, seq)
+            self.buf[data_offset:data_offset + size] = data
+            SLOT_HEADER.pack_into(self.buf, slot, seq, seq, time.time() if timestamp is None else timestamp,
+                                  size, height, width, channels, peerId.encode("utf8")[:64])
+            SEQ.pack_into(self.buf, LATEST_OFFSET, seq)
+            self.seq = seq
+
+        return seq
+
+    def close(self):
+        """Close and remove the shared memory block"""
+        with self.lock:
+            self.buf = None
+            self.shm.close()
+        _created.discard(self.shm._name)
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class FrameRingReader(_Ring):
+    def __init__(self, name: str):
+        super().__init__(_attach(name))
+        magic, version, self.slots, self.slot_size, _ = HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            self.shm.close()
+            raise ValueError(f'{name} is not a frame ring')
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the newest frame, 0 if none"""
+        return SEQ.unpack_from(self.buf, LATEST_OFFSET)[0]
+
+    def latest(self) -> RingFrame:
+        """The newest frame, None if none was written"""
+        while True:
+            seq = self.seq
+            if seq == 0:
+                return None
+            frame = self.__read(seq)
+            if frame is not None:
+                return frame
+
+    def wait(self, after_seq: int = 0, timeout: float = None) -> RingFrame:
+        """Frame newer than `after_seq` or None on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.seq <= after_seq:
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(POLL_INTERVAL)
+        return self.latest()
+
+    def valid(self, frame: RingFrame) -> bool:
+        """The frame's slot was not overwritten since it was read"""
+        index = (frame.seq - 1) % self.slots
+        return SEQ.unpack_from(self.buf, self._slot_offset(index))[0] == frame.seq
+
+    def __read(self, seq: int) -> RingFrame:
+        index = (seq - 1) % self.slots
+        begin, end, timestamp, size, height, width, channels, peer = SLOT_HEADER.unpack_from(self.buf, self._slot_offset(index))
+        if begin != seq or end != seq:
+            return None  # being overwritten: take the newer one
+
+        offset = self._data_offset(index)
+        if channels:
+            shape = (height, width) if channels == 1 else (height, width, channels)
+        else:
+            shape = (size,)
+        if np is not None:
+            array = np.frombuffer(self.buf, dtype=np.uint8, count=size, offset=offset).reshape(shape)
+            array.flags.writeable = False
+        else:
+            array = self.buf[offset:offset + size].toreadonly()
+        return RingFrame(seq, peer.rstrip(b"\0").decode("utf8", "replace"), timestamp, shape, array)
+
+    def close(self):
+        """Drop the views of the frames first: the block can not be closed while they exist"""
+        self.buf = None
+        self.shm.close()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Map an existing block without registering it with the resource tracker,
+    which would remove it when the reader process exits"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        from multiprocessing import resource_tracker
+        shm = shared_memory.SharedMemory(name=name)
+        if shm._name not in _created:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
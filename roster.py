@@ -0,0 +1,195 @@
+# coding=utf8
+'''''
+Participants of the current conference.
+
+The roster is seeded once per conference by getConferenceParticipants and
+then follows the conference events, so that a participant is looked up
+by peerId or callId in O(1) without new requests.
+
+Example::
+
+    room.roster.add_listener(lambda change, participant: print(change, participant))
+    room.roster.get("user1@some.server")
+'''
+import logging
+from threading import Event, Lock
+
+logger = logging.getLogger('videosdk')
+
+# Events changing one field of a participant: event: (event field, participant field)
+FIELD_EVENTS = {
+    "enablevideoreceivingchanged": ("enable", "videoReceivingEnabled"),
+    "enableaudioreceivingchanged": ("enable", "audioReceivingEnabled"),
+    "userrecordingmestatuschanged": ("status", "recordingMe"),
+    "extravideoflownotify": ("extraVideo", "extraVideo"),
+}
+
+
+def peer_key(peerId: str) -> str:
+    """peerId to match the events by: lower case, without the instance ("user@server/ABC")"""
+    return peerId.split("/", 1)[0].lower()
+
+
+class Roster:
+    def __init__(self):
+        self.lock = Lock()
+        self.ready = Event()
+        self.confId = None
+        self.__by_peer = {}  # peer_key(peerId): participant dict
+        self.__by_call = {}  # callId (lower case): participant dict
+        self.__listeners = []
+        self.__handlers = {
+            "getconferenceparticipants": self.__on_participants,
+            "newparticipantinconference": self.__on_new_participant,
+            "participantleftconference": self.__on_participant_left,
+            "roleeventoccured": self.__on_role_event,
+            "devicestatusreceived": self.__on_device_status,
+        }
+
+    def __len__(self):
+        return len(self.__by_peer)
+
+    def __contains__(self, peerId: str):
+        return peer_key(peerId) in self.__by_peer
+
+    def __iter__(self):
+        return iter(list(self.__by_peer.values()))
+
+    def add_listener(self, function: object):
+        """function(change: str, participant: dict): "joined", "left", "changed", "loaded", "cleared" (participant is None)"""
+        self.__listeners.append(function)
+
+    def remove_listener(self, function: object):
+        self.__listeners.remove(function)
+
+    def __notify(self, change: str, participant: dict):
+        # Called from VideoSDK.process_message: a failing listener must not keep the message from the handlers
+        for function in self.__listeners:
+            try:
+                function(change, participant)
+            except Exception:
+                logger.exception('Roster listener %r failed on "%s"', function, change)
+
+    # =======================================
+    # Lookup
+    # =======================================
+    def wait(self, timeout: float = None) -> bool:
+        """Wait for the participants of the current conference"""
+        return self.ready.wait(timeout)
+
+    def get(self, peerId: str) -> dict:
+        return self.__by_peer.get(peer_key(peerId))
+
+    def by_call_id(self, callId: str) -> dict:
+        participant = self.__by_call.get(callId.lower())
+        return participant if participant is not None else self.__by_peer.get(peer_key(callId))
+
+    def participants(self) -> list:
+        return list(self.__by_peer.values())
+
+    def peer_ids(self) -> list:
+        return [p["peerId"] for p in list(self.__by_peer.values())]
+
+    # =======================================
+    # Changes
+    # =======================================
+    def clear(self):
+        """Out of the conference"""
+        with self.lock:
+            self.confId = None
+            self.__by_peer = {}
+            self.__by_call = {}
+            self.ready.clear()
+        self.__notify("cleared", None)
+
+    def process(self, response: dict):
+        """Apply a response or an event. Called by VideoSDK for every incoming message"""
+        name = response.get("event")
+        if name is None:
+            name = response.get("method")
+        if not isinstance(name, str):
+            return
+        name = name.lower()
+
+        handler = self.__handlers.get(name)
+        if handler is not None:
+            handler(response)
+        elif name in FIELD_EVENTS:
+            source, field = FIELD_EVENTS[name]
+            self.__set_field(response.get("peerId"), field, response.get(source))
+
+    def __index(self, participant: dict):
+        self.__by_peer[peer_key(participant["peerId"])] = participant
+        call_id = participant.get("callId")
+        if isinstance(call_id, str) and call_id:
+            self.__by_call[call_id.lower()] = participant
+
+    def __on_participants(self, response: dict):
+        if response.get("result") is False or not isinstance(response.get("participants"), list):
+            return
+        with self.lock:
+            self.confId = response.get("confId", self.confId)
+            self.__by_peer = {}
+            self.__by_call = {}
+            for item in response["participants"]:
+                if isinstance(item, dict) and item.get("peerId"):
+                    self.__index(dict(item))
+        self.ready.set()
+        self.__notify("loaded", None)
+
+    def __on_new_participant(self, response: dict):
+        peer_id = response.get("peerId")
+        if not peer_id:
+            return
+        with self.lock:
+            participant = self.__by_peer.get(peer_key(peer_id))
+            change = "changed" if participant is not None else "joined"
+            if participant is None:
+                participant = {"peerId": peer_id}
+            for key in ("peerDn", "callId"):
+                if key in response:
+                    participant[key] = response[key]
+            if "confId" in response:
+                self.confId = response["confId"]
+            self.__index(participant)
+        self.__notify(change, participant)
+
+    def __on_participant_left(self, response: dict):
+        peer_id = response.get("peerId")
+        if not peer_id:
+            return
+        with self.lock:
+            participant = self.__by_peer.pop(peer_key(peer_id), None)
+            if participant is not None:
+                call_id = participant.get("callId")
+                if isinstance(call_id, str):
+                    self.__by_call.pop(call_id.lower(), None)
+        if participant is not None:
+            self.__notify("left", participant)
+
+    def __on_role_event(self, response: dict):
+        if response.get("result") is False:
+            return
+        self.__set_field(response.get("peerId"), "role", response.get("role"))
+
+    def __on_device_status(self, response: dict):
+        peer_id = response.get("peerId")
+        if not isinstance(peer_id, str):
+            return
+        with self.lock:
+            participant = self.__by_peer.get(peer_key(peer_id))
+            if participant is None:
+                return
+            participant["mic"] = response.get("mic")
+            participant["video"] = response.get("video")
+        self.__notify("changed", participant)
+
+    def __set_field(self, peer_id, field: str, value):
+        if not isinstance(peer_id, str):
+            return
+        with self.lock:
+            participant = self.__by_peer.get(peer_key(peer_id))
+            if participant is None or participant.get(field) == value:
+                return
+            participant[field] = value
+        self.__notify("changed", participant)
@@ -0,0 +1,78 @@
+# coding=utf8
+'''''
+Mirror of the application settings for diff-based updates.
+
+The values come from getSettings and are kept fresh by settingsChanged.
+VideoSDK.apply_settings() sends only the keys which differ from them.
+'''
+from threading import Lock
+
+
+def settings_of(settings) -> dict:
+    """getSettings "settings": {name: value} or [{"name": ..., "value": ...}]"""
+    if isinstance(settings, dict):
+        return dict(settings)
+    if isinstance(settings, list):
+        return {item["name"]: item.get("value") for item in settings if isinstance(item, dict) and "name" in item}
+    return {}
+
+
+class SettingsMirror:
+    def __init__(self):
+        self.lock = Lock()
+        self.loaded = False
+        self.provisional = False  # the values are from a snapshot, not from getSettings
+        self.__values = {}
+        self.__sent = {}  # sent by setSettings, not confirmed yet
+
+    def __getitem__(self, name: str):
+        return self.__values[name]
+
+    def __contains__(self, name: str):
+        return name in self.__values
+
+    def get(self, name: str, default=None):
+        return self.__values.get(name, default)
+
+    def values(self) -> dict:
+        return dict(self.__values)
+
+    def load(self, settings, provisional: bool = False):
+        """
+        getSettings response. provisional - values which may be stale (a
+        snapshot): they are readable, but diff() sends every key until the
+        first getSettings
+        """
+        with self.lock:
+            if provisional and self.loaded:
+                return
+            self.__values = settings_of(settings)
+            self.loaded = not provisional
+            self.provisional = provisional
+
+    def changed(self, name: str, value):
+        """settingsChanged event"""
+        with self.lock:
+            self.__values[name] = value
+            if name in self.__sent and self.__sent[name] == value:
+                del self.__sent[name]
+
+    def diff(self, desired: dict) -> dict:
+        """The keys of `desired` which differ from the current (or already sent) values. Marks them as sent"""
+        with self.lock:
+            if not self.loaded:
+                changes = dict(desired)
+            else:
+                current = dict(self.__values, **self.__sent)
+                changes = {k: v for k, v in desired.items() if k not in current or current[k] != v}
+            self.__sent.update(changes)
+        return changes
+
+    def confirm(self, changes: dict, succeeded: bool):
+        """Response to setSettings"""
+        with self.lock:
+            for name, value in changes.items():
+                if self.__sent.get(name, value) == value:
+                    self.__sent.pop(name, None)
+                if succeeded:
+                    self.__values[name] = value
@@ -0,0 +1,259 @@
+# coding=utf8
+'''''
+Loading of a whole slide deck.
+
+The images are uploaded to the HTTP server in parallel, and every upload is
+added to the slide show (addSlide) as soon as it completes: the uploads that
+complete while an addSlide batch is in flight are added by the next batch.
+When all the slides are added they are put in order with one batch of
+setSlidePosition (or sortSlides), and the caching of the slides is followed by
+slideCachingStarted / slideCached and getSlideShowCache.
+
+Example::
+
+    deck = pyVideoSDK.slides.load_deck(room, sorted(glob.glob("deck/*.png")))
+    deck.future.result(timeout = 120)   # uploaded, added and in order
+    deck.wait_cached(timeout = 60)
+    room.methods.startSlideShow("Quarterly review")
+    deck.close()
+'''
+import os
+from concurrent.futures import Future
+from functools import partial
+from threading import Event, Lock
+
+from pyVideoSDK.transfers import FileTransfers
+
+# Slide statuses
+UPLOADING, UPLOADED, ADDED, CACHED, FAILED = "uploading", "uploaded", "added", "cached", "failed"
+
+
+class Slide:
+    __slots__ = ("path", "transfer", "fileId", "idx", "status", "error")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.transfer = None
+        self.fileId = None
+        self.idx = None
+        self.status = UPLOADING
+        self.error = None
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+    def __repr__(self):
+        return f'Slide({self.name!r}, {self.status}, fileId={self.fileId}, idx={self.idx})'
+
+
+def _file_ids(items) -> set:
+    """fileIds and names of the getSlideShowCache / getSlideShowInfo lists"""
+    found = set()
+    for item in items or ():
+        if isinstance(item, dict):
+            found.update(item[key] for key in ("fileId", "name") if key in item)
+        else:
+            found.add(item)
+    return found
+
+
+class DeckLoader:
+    def __init__(self, videosdk, paths: list, order: str = "paths", transfers: FileTransfers = None, max_uploads: int = 4):
+        """
+        order - "paths": the order of `paths` (setSlidePosition), "name": sortSlides, None: as added
+        transfers - FileTransfers to upload with; by default an own one with `max_uploads` workers
+        """
+        self.videosdk = videosdk
+        self.order = order
+        self.slides = [Slide(path) for path in paths]
+        self.future = Future()
+        self.lock = Lock()
+        self.__own_transfers = transfers is None
+        self.__transfers = transfers or FileTransfers(videosdk, max_workers=max_uploads)
+        self.__by_file = {}   # fileId: Slide
+        self.__ready = []     # uploaded, not added yet
+        self.__adding = False
+        self.__ordering = False
+        self.__cached = Event()
+        self.__listeners = []
+        add = videosdk.add_handler
+        self.__subscriptions = [
+            add({"event": "slideAdded", "fileId": None, "idx": None}, self.__on_added),
+            add({"event": "slideCached", "fileId": None}, self.__on_cached),
+        ]
+
+    def add_listener(self, function: object):
+        """function(slide: Slide) is called on every status change"""
+        self.__listeners.append(function)
+
+    def counts(self) -> dict:
+        """{status: number of slides}"""
+        counts = dict.fromkeys((UPLOADING, UPLOADED, ADDED, CACHED, FAILED), 0)
+        for slide in self.slides:
+            counts[slide.status] += 1
+        return counts
+
+    def start(self) -> "DeckLoader":
+        if not self.slides:
+            self.future.set_result([])
+            self.__cached.set()
+        for slide in self.slides:
+            slide.transfer = self.__transfers.upload(slide.path)
+            slide.transfer.future.add_done_callback(partial(self.__on_uploaded, slide))
+        return self
+
+    def wait_cached(self, timeout: float = None) -> bool:
+        """Wait until every slide is cached or failed"""
+        return self.__cached.wait(timeout)
+
+    def cache_state(self) -> Future:
+        """Ask getSlideShowCache; the slides it lists as cached are marked"""
+        future = self.videosdk.command({"method": "getSlideShowCache"})
+        future.add_done_callback(self.__on_cache_state)
+        return future
+
+    def close(self):
+        for subscription in self.__subscriptions:
+            subscription.cancel()
+        self.__subscriptions = []
+        if self.__own_transfers:
+            self.__transfers.close()
+
+    # =======================================
+    # Pipeline
+    # =======================================
+    def __set_status(self, slide: Slide, status: str, error: Exception = None):
+        slide.status = status
+        slide.error = error
+        for function in self.__listeners:
+            function(slide)
+        # A failure may be the last slide wait_cached() waits for
+        if status in (CACHED, FAILED) and all(s.status in (CACHED, FAILED) for s in self.slides):
+            self.__cached.set()
+
+    def __on_uploaded(self, slide: Slide, future: Future):
+        if future.cancelled() or future.exception() is not None:
+            self.__set_status(slide, FAILED, None if future.cancelled() else future.exception())
+            self.__check_done()
+            return
+
+        slide.fileId = future.result()
+        self.__set_status(slide, UPLOADED)
+        with self.lock:
+            self.__by_file[slide.fileId] = slide
+            self.__ready.append(slide)
+            if self.__adding:
+                return
+            self.__adding = True
+        self.__add_ready()
+
+    def __add_ready(self):
+        """Add the uploaded slides with one batch; the next batch goes when it is answered"""
+        with self.lock:
+            batch, self.__ready = self.__ready, []
+            if not batch:
+                self.__adding = False
+                return
+        futures = self.videosdk.commands([{"method": "addSlide", "fileId": slide.fileId} for slide in batch])
+        remaining = [len(futures)]
+
+        def added(slide: Slide, future: Future):
+            if future.cancelled() or future.exception() is not None or future.result().get("result") is False:
+                error = None if future.cancelled() else future.exception()
+                self.__set_status(slide, FAILED, error)
+            with self.lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                self.__add_ready()
+                if any(s.status == UPLOADED for s in batch):
+                    # No slideAdded for them: take the positions from getSlideShowInfo
+                    self.videosdk.command({"method": "getSlideShowInfo"}).add_done_callback(self.__on_show_info)
+                self.__check_done()
+
+        for slide, future in zip(batch, futures):
+            future.add_done_callback(partial(added, slide))
+
+    def __on_added(self, response: dict):
+        slide = self.__by_file.get(response["fileId"])
+        if slide is None:
+            return
+        slide.idx = response["idx"]
+        if slide.status not in (CACHED, FAILED):
+            self.__set_status(slide, ADDED)
+        self.__check_done()
+
+    def __on_cached(self, response: dict):
+        slide = self.__by_file.get(response["fileId"])
+        if slide is None or slide.status == FAILED:
+            return
+        self.__set_status(slide, CACHED)
+
+    def __on_show_info(self, future: Future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        for idx, item in enumerate(future.result().get("slides") or ()):
+            if isinstance(item, dict) and item.get("fileId") in self.__by_file:
+                slide = self.__by_file[item["fileId"]]
+                if slide.idx is None and slide.status == UPLOADED:
+                    self.__on_added({"fileId": slide.fileId, "idx": idx})
+
+    def __on_cache_state(self, future: Future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        cached = _file_ids(future.result().get("cachedSlides"))
+        for slide in self.slides:
+            if slide.status == ADDED and (slide.fileId in cached or slide.name in cached):
+                self.__on_cached({"fileId": slide.fileId})
+
+    def __check_done(self):
+        """All the slides are added (or failed): put them in order, once"""
+        with self.lock:
+            if self.__ordering or self.__adding or self.__ready:
+                return
+            if any(s.status in (UPLOADING, UPLOADED) or (s.status != FAILED and s.idx is None) for s in self.slides):
+                return
+            self.__ordering = True
+
+        ordering = self.__put_in_order()
+        ordering.append(self.cache_state())
+        remaining = [len(ordering)]
+
+        def ordered(_):
+            with self.lock:
+                remaining[0] -= 1
+                if remaining[0] != 0:
+                    return
+            if not self.future.cancelled():
+                self.future.set_result(self.slides)
+
+        for future in ordering:
+            future.add_done_callback(ordered)
+
+    def __put_in_order(self) -> list:
+        """The commands putting the added slides in order, sent in one batch. Returns their futures"""
+        if self.order == "name":
+            return [self.videosdk.command({"method": "sortSlides"})]
+        added = [slide for slide in self.slides if slide.status != FAILED]
+        if self.order != "paths" or not added:
+            return []
+
+        # The slides are appended in the order the uploads completed, one after another
+        current = sorted(added, key=lambda slide: slide.idx)
+        base = current[0].idx
+        moves = []
+        for position, slide in enumerate(added):
+            index = current.index(slide)
+            if index != position:
+                moves.append({"method": "setSlidePosition", "fromIdx": base + index, "toIdx": base + position})
+                current.insert(position, current.pop(index))
+        for position, slide in enumerate(current):
+            slide.idx = base + position
+
+        return self.videosdk.commands(moves) if moves else []
+
+
+def load_deck(videosdk, paths: list, order: str = "paths", transfers: FileTransfers = None, max_uploads: int = 4) -> DeckLoader:
+    """Upload the images and add them as slides, in the order of `paths`. See DeckLoader"""
+    return DeckLoader(videosdk, paths, order, transfers, max_uploads).start()
@@ -0,0 +1,132 @@
+# coding=utf8
+'''''
+Warm-start snapshot of the cached state.
+
+Settings, system information, monitors and (optionally) the address book and
+groups are saved to a local JSON file keyed by the TrueConf ID and the server.
+On the next start the snapshot is loaded before the connection is ready, so
+reads are answered at once, and then revalidated in the background.
+
+Example::
+
+    snapshot = pyVideoSDK.snapshot.StateSnapshot("user1@some.server", directory = "/var/cache/room")
+    room = pyVideoSDK.VideoSDK(debug = False)
+    abook = pyVideoSDK.abook.AddressBook()
+    snapshot.load(room, abook)
+
+    room.open_session(ip = "127.0.0.1", port = 80, pin = "123")
+    abook.attach(room)
+    snapshot.revalidate(room, abook)   # saves the fresh state when all the responses came
+'''
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from threading import Lock, Thread
+
+SNAPSHOT_VERSION = 1
+# Saved attributes of VideoSDK: snapshot key
+STATE_ATTRIBUTES = {"settings": "settings", "systemInfo": "systemInfo", "monitors_info": "monitorsInfo"}
+REVALIDATE_METHODS = ("getSettings", "getSystemInfo", "getMonitorsInfo")
+
+logger = logging.getLogger('videosdk')
+
+
+class StateSnapshot:
+    def __init__(self, trueconf_id: str, server: str = None, directory: str = "."):
+        """server - TrueConf Server; by default the domain of the TrueConf ID"""
+        if server is None:
+            server = trueconf_id.partition("@")[2]
+        self.trueconf_id = trueconf_id
+        self.server = server
+        self.directory = directory
+        self.saved = None
+
+    @property
+    def key(self) -> str:
+        return f'{self.trueconf_id.lower()}|{self.server.lower()}'
+
+    @property
+    def path(self) -> str:
+        digest = hashlib.sha1(self.key.encode("utf8")).hexdigest()[:16]
+        return os.path.join(self.directory, f'videosdk-state-{digest}.json')
+
+    def save(self, videosdk, abook=None):
+        """Write the snapshot atomically"""
+        data = {"version": SNAPSHOT_VERSION, "key": self.key, "saved": time.time()}
+        for attribute, name in STATE_ATTRIBUTES.items():
+            data[name] = getattr(videosdk, attribute)
+        if abook is not None and abook.ready.is_set():
+            data["abook"] = list(abook)
+            data["groups"] = abook.groups()
+
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self.saved = data["saved"]
+
+    def load(self, videosdk, abook=None) -> bool:
+        """Fill the state from the snapshot. False if there is no usable snapshot"""
+        try:
+            with open(self.path, encoding="utf8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != SNAPSHOT_VERSION or data.get("key") != self.key:
+            return False
+
+        for attribute, name in STATE_ATTRIBUTES.items():
+            if data.get(name):
+                setattr(videosdk, attribute, data[name])
+        if isinstance(data.get("settings"), dict):
+            # Not a base for apply_settings() until getSettings confirms it
+            videosdk.settings_mirror.load(data["settings"].get("settings"), provisional=True)
+        if abook is not None and "abook" in data:
+            abook.load(data["abook"])
+            abook.load_groups(data.get("groups"))
+        self.saved = data.get("saved")
+
+        return True
+
+    def age(self) -> float:
+        """Seconds since the snapshot was saved, None if not loaded or saved"""
+        return None if self.saved is None else time.time() - self.saved
+
+    def revalidate(self, videosdk, abook=None) -> list:
+        """
+        Request fresh values; the responses replace the snapshot data as they come and
+        the snapshot is saved again when all of them came. Returns the futures
+        """
+        methods = REVALIDATE_METHODS + (("getAbook", "getGroups") if abook is not None else ())
+        futures = [videosdk.command({"method": method}) for method in methods]
+        lock = Lock()
+        remaining = [len(futures)]
+
+        def done(future):
+            with lock:
+                remaining[0] -= 1
+                if remaining[0] != 0:
+                    return
+            if all(not f.cancelled() and f.exception() is None for f in futures):
+                # The last response completes on the websocket thread: no disk I/O there
+                Thread(target=self.__save_in_background, args=(videosdk, abook),
+                       name="StateSnapshot", daemon=True).start()
+
+        for future in futures:
+            future.add_done_callback(done)
+
+        return futures
+
+    def __save_in_background(self, videosdk, abook):
+        try:
+            self.save(videosdk, abook)
+        except Exception:
+            logger.exception('Cannot save the state snapshot to %s', self.path)
@@ -0,0 +1,69 @@
+# coding=utf8
+'''''
+Import-time regression check.
+
+`import pyVideoSDK` must not load websocket, requests or the large generated
+modules (methods, consts): they are imported on first use. The import runs in
+a fresh interpreter, several times, and the check fails (exit code 1) if any
+of those modules is loaded or the fastest import is over the budget.
+
+Example::
+
+    python tools/check_import.py
+    python tools/check_import.py --budget 0.05 --runs 10
+'''
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Seconds; generous, so that only a real regression (an eager heavy import) fails it
+DEFAULT_BUDGET = 0.1
+DEFAULT_RUNS = 5
+LAZY = ("websocket", "requests", "pyVideoSDK.methods", "pyVideoSDK.consts")
+
+# Imports the checkout as "pyVideoSDK" whatever the name of its directory
+CHILD = '''
+import importlib.util, json, sys, time
+spec = importlib.util.spec_from_file_location("pyVideoSDK", sys.argv[1] + "/__init__.py",
+                                              submodule_search_locations=[sys.argv[1]])
+module = importlib.util.module_from_spec(spec)
+sys.modules["pyVideoSDK"] = module
+started = time.perf_counter()
+spec.loader.exec_module(module)
+elapsed = time.perf_counter() - started
+print(json.dumps({"elapsed": elapsed, "loaded": [name for name in json.loads(sys.argv[2]) if name in sys.modules]}))
+'''
+
+
+def measure() -> dict:
+    output = subprocess.run([sys.executable, "-c", CHILD, PACKAGE_DIR, json.dumps(LAZY)],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip("'\n"), formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="seconds for the fastest import")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    args = parser.parse_args()
+
+    runs = [measure() for _ in range(max(args.runs, 1))]
+    fastest = min(run["elapsed"] for run in runs)
+    loaded = sorted(set().union(*(run["loaded"] for run in runs)))
+    print(f'import pyVideoSDK: {fastest * 1000:.1f} ms (budget {args.budget * 1000:.0f} ms)')
+
+    failed = False
+    if loaded:
+        print(f'FAIL: loaded eagerly: {", ".join(loaded)}')
+        failed = True
+    if fastest > args.budget:
+        print('FAIL: over the budget')
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,353 @@
+# coding=utf8
+'''''
+Streaming file transfers to and from the VideoSDK HTTP server.
+
+Files are moved in chunks between the disk and the network, so the memory
+stays flat for any file size. Downloads go to "<path>.part" first and an
+interrupted download continues from its size with an HTTP Range request.
+Several transfers run in parallel over one keep-alive connection pool.
+
+A Transfer is also updated by the fileDownloadingProgress and
+fileUploadingProgress events of the same file (its fileId or request id),
+so the progress of sending the uploaded file to a peer is seen in one place.
+
+Example::
+
+    files = pyVideoSDK.transfers.FileTransfers(room, max_workers = 4)
+    files.add_listener(lambda t: print(t.name, t.progress))
+
+    upload = files.send("/recordings/meeting.mp4", "user1@some.server")
+    upload.future.result()
+
+    for url in room.methods.getFileList().result()["fileList"]:
+        files.download(url, "/downloads")
+'''
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Event, Lock
+
+from pyVideoSDK.frames import pooled_session
+
+CHUNK_SIZE = 1 << 20
+HTTP_TIMEOUT = 30
+PART_SUFFIX = ".part"
+# Next to the .part: the ETag or Last-Modified of the file it is a part of
+VALIDATOR_SUFFIX = ".validator"
+PROGRESS_EVENTS = ("fileDownloadingProgress", "fileUploadingProgress")
+# Finished transfers still followed by the progress events (sending of an uploaded file) and listed by transfers()
+KEEP_FINISHED = 64
+
+logger = logging.getLogger('videosdk')
+
+
+class TransferCancelled(Exception):
+    pass
+
+
+class TransferFailed(Exception):
+    """The HTTP server answered, but not as expected"""
+
+
+class Transfer:
+    """State of one transfer. `future` gives the path (download) or the fileId (upload)"""
+
+    def __init__(self, kind: str, path: str, fileId=None, url: str = None):
+        self.kind = kind  # "download" or "upload"
+        self.path = path
+        self.url = url
+        self.fileId = fileId
+        self.id = None          # file transfer request id (receivedFileRequest, getFileInfo)
+        self.status = "queued"  # running, done, failed, cancelled
+        self.size = None
+        self.done = 0
+        self.resumed_from = 0
+        self.started = None
+        self.finished = None
+        self.event = None       # the newest progress event of the file
+        self.future = Future()
+        self._cancel = Event()
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def progress(self) -> float:
+        """0..1, None while the size is unknown"""
+        return self.done / self.size if self.size else None
+
+    @property
+    def speed(self) -> float:
+        """Bytes per second"""
+        if self.started is None:
+            return 0
+        elapsed = (self.finished or time.monotonic()) - self.started
+        return (self.done - self.resumed_from) / elapsed if elapsed > 0 else 0
+
+    def cancel(self):
+        self._cancel.set()
+
+    def __repr__(self):
+        return f'Transfer({self.kind}, {self.name!r}, {self.status}, {self.done}/{self.size})'
+
+
+class _MultipartBody:
+    """multipart/form-data body read from the file chunk by chunk"""
+
+    def __init__(self, transfer: Transfer, field: str, on_read):
+        self.boundary = uuid.uuid4().hex
+        self.transfer = transfer
+        self.on_read = on_read
+        self.__head = (f'--{self.boundary}\r\nContent-Disposition: form-data; name="{field}"; '
+                       f'filename="{transfer.name}"\r\nContent-Type: application/octet-stream\r\n\r\n').encode("utf8")
+        self.__tail = f'\r\n--{self.boundary}--\r\n'.encode("ascii")
+        self.__file = open(transfer.path, "rb")
+        self.__parts = [self.__head, None, self.__tail]
+        self.__length = len(self.__head) + transfer.size + len(self.__tail)
+
+    @property
+    def content_type(self) -> str:
+        return f'multipart/form-data; boundary={self.boundary}'
+
+    def __len__(self):
+        return self.__length
+
+    def read(self, size: int = -1) -> bytes:
+        if self.transfer._cancel.is_set():
+            raise TransferCancelled()
+        while self.__parts:
+            part = self.__parts[0]
+            if part is None:
+                data = self.__file.read(size if size and size > 0 else CHUNK_SIZE)
+                if data:
+                    self.on_read(len(data))
+                    return data
+                self.__parts.pop(0)
+                continue
+            self.__parts.pop(0)
+            return part
+        return b""
+
+    def close(self):
+        self.__file.close()
+
+
+def _read_validator(path: str) -> str:
+    try:
+        with open(path, encoding="utf8") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def _write_validator(path: str, headers):
+    """A strong ETag or Last-Modified (what If-Range accepts); none - the download cannot be resumed"""
+    etag = headers.get("ETag")
+    validator = etag if etag and not etag.startswith("W/") else headers.get("Last-Modified")
+    if validator:
+        with open(path, "w", encoding="utf8") as f:
+            f.write(validator)
+    else:
+        _remove(path)
+
+
+def _remove(*paths):
+    for path in paths:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+class FileTransfers:
+    def __init__(self, videosdk, max_workers: int = 4, chunk_size: int = CHUNK_SIZE, timeout: float = HTTP_TIMEOUT):
+        self.videosdk = videosdk
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.session = pooled_session(max_workers)
+        self.lock = Lock()
+        self.__transfers = []
+        self.__listeners = []
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="FileTransfers")
+        self.__subscriptions = [videosdk.add_handler({"event": event}, self.__on_progress) for event in PROGRESS_EVENTS]
+
+    def add_listener(self, function: object):
+        """function(transfer: Transfer) is called on every chunk, progress event and status change"""
+        self.__listeners.append(function)
+
+    def transfers(self) -> list:
+        """The running and queued transfers and up to KEEP_FINISHED of the last finished ones"""
+        with self.lock:
+            return list(self.__transfers)
+
+    def close(self):
+        """Stop following the events; wait for the running transfers"""
+        for subscription in self.__subscriptions:
+            subscription.cancel()
+        self.__subscriptions = []
+        self.__executor.shutdown(wait=True)
+
+    # =======================================
+    # Downloads
+    # =======================================
+    def download(self, file, path: str, resume: bool = True) -> Transfer:
+        """
+        file - fileId or URL (as getFileList returns it, relative or absolute)
+        path - file or directory to save to
+        resume - continue from "<path>.part" if it is there
+        """
+        url = self.__url(file)
+        if os.path.isdir(path):
+            path = os.path.join(path, os.path.basename(url.split("?")[0].rstrip("/")) or str(file))
+        transfer = Transfer("download", path, None if isinstance(file, str) else file, url)
+        return self.__submit(transfer, self.__download, resume)
+
+    def __download(self, transfer: Transfer, resume: bool) -> str:
+        part = transfer.path + PART_SUFFIX
+        validator_path = part + VALIDATOR_SUFFIX
+        validator = _read_validator(validator_path) if resume else None
+        # A part without a validator may be of another version of the file: start over
+        offset = os.path.getsize(part) if validator and os.path.exists(part) else 0
+        headers = {"Range": f'bytes={offset}-', "If-Range": validator} if offset else None
+
+        with self.session.get(transfer.url, headers=headers, stream=True, timeout=self.timeout) as response:
+            if response.status_code == 416 and offset:
+                # Nothing left, if the part has the size of the file
+                total = response.headers.get("Content-Range", "").rpartition("/")[2]
+                if not total.isdigit() or int(total) != offset:
+                    _remove(part, validator_path)
+                    return self.__download(transfer, False)
+                transfer.size = transfer.done = offset
+            else:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    offset = 0  # the server ignored the range or the file changed: start over
+                    _write_validator(validator_path, response.headers)
+                length = response.headers.get("Content-Length")
+                transfer.size = offset + int(length) if length is not None else None
+                transfer.done = transfer.resumed_from = offset
+                with open(part, "ab" if offset else "wb") as f:
+                    for chunk in response.iter_content(self.chunk_size):
+                        if transfer._cancel.is_set():
+                            raise TransferCancelled()
+                        f.write(chunk)
+                        transfer.done += len(chunk)
+                        self.__notify(transfer)
+
+        os.replace(part, transfer.path)
+        _remove(validator_path)
+        return transfer.path
+
+    # =======================================
+    # Uploads
+    # =======================================
+    def upload(self, path: str, field: str = "file") -> Transfer:
+        """Upload a file; the future gives its fileId on the HTTP server"""
+        transfer = Transfer("upload", path, url=self.videosdk.getUploadURL())
+        return self.__submit(transfer, self.__upload, field)
+
+    def send(self, path: str, peerId: str = None) -> Transfer:
+        """Upload a file and send it to the peer (sendFile) or to the conference (sendConferenceFile)"""
+        transfer = self.upload(path)
+
+        def uploaded(future: Future):
+            if future.cancelled() or future.exception() is not None:
+                return
+            if peerId is None:
+                self.videosdk.command({"method": "sendConferenceFile", "fileId": transfer.fileId})
+            else:
+                self.videosdk.command({"method": "sendFile", "fileId": transfer.fileId, "peerId": peerId})
+
+        transfer.future.add_done_callback(uploaded)
+        return transfer
+
+    def __upload(self, transfer: Transfer, field: str):
+        transfer.size = os.path.getsize(transfer.path)
+
+        def on_read(size: int):
+            transfer.done += size
+            self.__notify(transfer)
+
+        body = _MultipartBody(transfer, field, on_read)
+        try:
+            response = self.session.post(transfer.url, data=body, headers={"Content-Type": body.content_type},
+                                         timeout=self.timeout)
+        finally:
+            body.close()
+        response.raise_for_status()
+        try:
+            reply = response.json()
+        except ValueError:
+            reply = None
+        if not isinstance(reply, dict) or reply.get("fileId") is None:
+            raise TransferFailed(f'No fileId in the upload response: {response.text[:200]!r}')
+        transfer.fileId = reply["fileId"]
+
+        return transfer.fileId
+
+    # =======================================
+    def __url(self, file) -> str:
+        if not isinstance(file, str):
+            return self.videosdk.getFileURL(file)
+        if file.startswith(("http://", "https://")):
+            return file
+        url = self.videosdk.getUploadURL()
+        base = url[:url.index("/", len("http://"))]
+        token = url[url.index("?"):]
+        return f'{base}/{file.lstrip("/")}{token if "?" not in file else ""}'
+
+    def __submit(self, transfer: Transfer, function, *args) -> Transfer:
+        with self.lock:
+            self.__transfers.append(transfer)
+        self.__executor.submit(self.__run, transfer, function, *args)
+        return transfer
+
+    def __run(self, transfer: Transfer, function, *args):
+        transfer.status = "running"
+        transfer.started = time.monotonic()
+        self.__notify(transfer)
+        try:
+            result = function(transfer, *args)
+        except TransferCancelled as e:
+            transfer.status = "cancelled"
+            transfer.future.set_exception(e)
+        except Exception as e:
+            # Not only the network and the disk: a bad Content-Length, an unexpected upload response, ...
+            transfer.status = "failed"
+            transfer.future.set_exception(e)
+        else:
+            transfer.status = "done"
+            transfer.future.set_result(result)
+        finally:
+            transfer.finished = time.monotonic()
+            self.__prune()
+            self.__notify(transfer)
+
+    def __prune(self):
+        with self.lock:
+            finished = [t for t in self.__transfers if t.finished is not None]
+            if len(finished) > KEEP_FINISHED:
+                dropped = set(map(id, finished[:len(finished) - KEEP_FINISHED]))
+                self.__transfers = [t for t in self.__transfers if id(t) not in dropped]
+
+    def __on_progress(self, response: dict):
+        with self.lock:
+            matching = [t for t in self.__transfers
+                        if (t.fileId is not None and t.fileId == response.get("fileId"))
+                        or (t.id is not None and t.id == response.get("id"))]
+        for transfer in matching:
+            transfer.event = response
+            if transfer.id is None:
+                transfer.id = response.get("id")
+            self.__notify(transfer)
+
+    def __notify(self, transfer: Transfer):
+        # A failing listener must not fail the transfer
+        for function in self.__listeners:
+            try:
+                function(transfer)
+            except Exception:
+                logger.exception('Transfer listener %r failed', function)
@@ -1,5 +1,4 @@
-﻿import requests
-import logging
+﻿import logging
 from logging import Logger
 
 CONFIG_JSON_URL = "http://{}:{}/public/default/config.json"
@@ -8,6 +7,8 @@ DEFAULT_HTTP_PORT = 8766
 
 def getHttpPort(ip: str, room_port: int, logger: Logger) -> int:
     """Get the current HTTP TrueConf Room or VideoSDK port. The TrueConf Room or VideoSDK application must be launched"""
+    import requests
+
     try:
         json_file = requests.get(url=CONFIG_JSON_URL.format(ip, room_port))
         data = json_file.json()
@@ -23,6 +24,8 @@ def getHttpPort(ip: str, room_port: int, logger: Logger) -> int:
 
 def getWebsocketPort(ip: str, room_port: int, logger: Logger) -> int:
     """Get the current websocket TrueConf Room or VideoSDK port. The TrueConf Room or VideoSDK application must be launched"""
+    import requests
+
     try:
         json_file = requests.get(url=CONFIG_JSON_URL.format(ip, room_port))
         data = json_file.json()